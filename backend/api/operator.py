@@ -253,7 +253,8 @@ async def flag_rec(rec_id: str, request: FlagRequest):
 @router.get("/traces/{user_id}")
 async def get_user_traces(
     user_id: str,
-    recommendation_id: Optional[str] = Query(None, description="Filter by recommendation ID")
+    recommendation_id: Optional[str] = Query(None, description="Filter by recommendation ID"),
+    trace_type: Optional[str] = Query(None, description="Filter by trace type (persona_assignment, content_selection)")
 ):
     """
     Get decision traces for a user
@@ -262,6 +263,7 @@ async def get_user_traces(
     
     Query Parameters:
     - recommendation_id: Optional filter by specific recommendation
+    - trace_type: Optional filter by trace type
     
     Returns 403 if user has not consented
     """
@@ -270,7 +272,7 @@ async def get_user_traces(
         check_consent(user_id, DB_PATH)
         
         # Get traces
-        traces = get_traces(user_id, DB_PATH, recommendation_id)
+        traces = get_traces(user_id, DB_PATH, recommendation_id, trace_type)
         
         # Also get latest persona traces for convenience
         persona_traces = get_latest_persona_traces(user_id, DB_PATH)
@@ -4,11 +4,16 @@ Generates checking, savings, credit card, and other account types based on arche
 """
 
 import sqlite3
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from faker import Faker
 from datetime import datetime
 from .archetypes import Archetype
 
+try:
+    from ...storage.schemas import INSERT_ACCOUNT_SQL
+except ImportError:
+    from storage.schemas import INSERT_ACCOUNT_SQL
+
 
 fake = Faker()
 Faker.seed(42)  # For reproducibility
@@ -35,18 +40,12 @@ def generate_user_accounts(
     Returns:
         List of account IDs created
     """
-    cursor = conn.cursor()
     account_ids = []
+    account_rows = []
     
     # Always create a checking account
     checking_id = generate_account_id()
-    cursor.execute("""
-        INSERT INTO accounts (
-            account_id, user_id, account_type, account_subtype,
-            balance_available, balance_current, balance_limit,
-            iso_currency_code, holder_category
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    account_rows.append((
         checking_id,
         user_id,
         "depository",
@@ -73,13 +72,7 @@ def generate_user_accounts(
         else:
             starting_savings = 100
         
-        cursor.execute("""
-            INSERT INTO accounts (
-                account_id, user_id, account_type, account_subtype,
-                balance_available, balance_current, balance_limit,
-                iso_currency_code, holder_category
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        account_rows.append((
             savings_id,
             user_id,
             "depository",
@@ -104,13 +97,7 @@ def generate_user_accounts(
         current_balance = credit_limit * archetype.credit_utilization_target
         available = credit_limit - current_balance
         
-        cursor.execute("""
-            INSERT INTO accounts (
-                account_id, user_id, account_type, account_subtype,
-                balance_available, balance_current, balance_limit,
-                iso_currency_code, holder_category
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        account_rows.append((
             credit_id,
             user_id,
             "credit",
@@ -123,10 +110,46 @@ def generate_user_accounts(
         ))
         account_ids.append(credit_id)
     
-    conn.commit()
+    conn.executemany(INSERT_ACCOUNT_SQL, account_rows)
+    
     return account_ids
 
 
+def get_user_account_ids(
+    user_id: str,
+    conn: sqlite3.Connection
+) -> Tuple[Optional[str], Optional[str], List[str]]:
+    """
+    Get a user's checking, savings and credit card account IDs in one query
+    
+    Args:
+        user_id: User ID
+        conn: Database connection
+        
+    Returns:
+        Tuple of (checking ID or None, savings ID or None, credit card IDs)
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT account_id, account_type, account_subtype FROM accounts
+        WHERE user_id = ?
+        ORDER BY rowid
+    """, (user_id,))
+    
+    checking_id = None
+    savings_id = None
+    credit_ids = []
+    for account_id, account_type, account_subtype in cursor.fetchall():
+        if account_type == 'credit':
+            credit_ids.append(account_id)
+        elif account_subtype == 'checking' and checking_id is None:
+            checking_id = account_id
+        elif account_subtype == 'savings' and savings_id is None:
+            savings_id = account_id
+    
+    return checking_id, savings_id, credit_ids
+
+
 def get_checking_account(user_id: str, conn: sqlite3.Connection) -> str:
     """
     Get the checking account ID for a user
@@ -226,8 +249,6 @@ def update_account_balance(
             SET balance_current = ?, balance_available = ?
             WHERE account_id = ?
         """, (new_balance, new_balance, account_id))
-    
-    conn.commit()
 
 
 def get_account_balance(account_id: str, conn: sqlite3.Connection) -> float:
@@ -7,7 +7,7 @@ from typing import Dict, List, Any
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(frozen=True)
 class Archetype:
     """Defines a user archetype with expected financial behaviors"""
     name: str
@@ -19,6 +19,15 @@ from .accounts import generate_user_accounts
 from .transactions import generate_user_transactions
 from .liabilities import generate_user_liabilities
 
+try:
+    from ...storage.schemas import (
+        INSERT_USER_SQL, create_base_tables, create_indexes, drop_indexes
+    )
+except ImportError:
+    from storage.schemas import (
+        INSERT_USER_SQL, create_base_tables, create_indexes, drop_indexes
+    )
+
 
 # Initialize Faker with seed for reproducibility
 fake = Faker()
@@ -49,8 +58,8 @@ def generate_users(
     Returns:
         Dictionary mapping user_id to user metadata
     """
-    cursor = conn.cursor()
     users = {}
+    user_rows = []
     
     # Shuffle archetype list for random assignment
     archetype_list = []
@@ -73,10 +82,7 @@ def generate_users(
         name = fake.name()
         has_consent = i in consented_indices
         
-        cursor.execute("""
-            INSERT INTO users (user_id, name, created_at, consent_status, consent_updated_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
+        user_rows.append((
             user_id,
             name,
             created_at,
@@ -94,7 +100,8 @@ def generate_users(
             "created_at": created_at
         }
     
-    conn.commit()
+    conn.executemany(INSERT_USER_SQL, user_rows)
+    
     print(f"✓ Generated {count} users ({consent_count} with consent, {count - consent_count} without)")
     
     return users
@@ -136,57 +143,69 @@ def generate_synthetic_data(
     for name, count in archetype_dist.items():
         print(f"  {name}: {count}")
     
-    # Generate users
-    print("\n[1/4] Generating users...")
-    users = generate_users(user_count, consent_ratio, archetype_dist, conn)
-    
-    # Generate accounts
-    print("[2/4] Generating accounts...")
-    account_count = 0
-    for user_id, user_data in users.items():
-        account_ids = generate_user_accounts(
-            user_id,
-            user_data["archetype"],
-            conn
-        )
-        user_data["account_ids"] = account_ids
-        account_count += len(account_ids)
-    print(f"✓ Generated {account_count} accounts")
-    
-    # Generate transactions (chronologically with balance tracking)
-    print("[3/4] Generating transactions...")
-    end_date = datetime.now().date()
-    start_date = end_date - timedelta(days=date_range_months * 30)
-    
-    total_transactions = 0
-    for user_id, user_data in users.items():
-        transaction_count = generate_user_transactions(
-            user_id,
-            user_data["archetype"],
-            user_data["account_ids"],
-            start_date,
-            end_date,
-            conn
-        )
-        user_data["transaction_count"] = transaction_count
-        total_transactions += transaction_count
-    
-    print(f"✓ Generated {total_transactions} transactions")
-    
-    # Generate liabilities (for credit accounts)
-    print("[4/4] Generating liabilities...")
-    liability_count = 0
-    for user_id, user_data in users.items():
-        liabilities = generate_user_liabilities(
-            user_id,
-            user_data["archetype"],
-            user_data["account_ids"],
-            conn
-        )
-        user_data["liabilities"] = liabilities
-        liability_count += len(liabilities)
-    
-    print(f"✓ Generated {liability_count} liabilities")
+    # Secondary indexes are built once after the load instead of being
+    # maintained row by row
+    create_base_tables(conn)
+    drop_indexes(conn)
+    
+    # Rebuild the indexes even if generation fails part-way
+    try:
+        # All inserts run in one transaction, committed once at the end (the
+        # per-table helpers never commit themselves)
+        with conn:
+            # Generate users
+            print("\n[1/4] Generating users...")
+            users = generate_users(user_count, consent_ratio, archetype_dist, conn)
+            
+            # Generate accounts
+            print("[2/4] Generating accounts...")
+            account_count = 0
+            for user_id, user_data in users.items():
+                account_ids = generate_user_accounts(
+                    user_id,
+                    user_data["archetype"],
+                    conn
+                )
+                user_data["account_ids"] = account_ids
+                account_count += len(account_ids)
+            print(f"✓ Generated {account_count} accounts")
+            
+            # Generate transactions (chronologically with balance tracking)
+            print("[3/4] Generating transactions...")
+            end_date = datetime.now().date()
+            start_date = end_date - timedelta(days=date_range_months * 30)
+            
+            total_transactions = 0
+            for user_id, user_data in users.items():
+                transaction_count = generate_user_transactions(
+                    user_id,
+                    user_data["archetype"],
+                    user_data["account_ids"],
+                    start_date,
+                    end_date,
+                    conn
+                )
+                user_data["transaction_count"] = transaction_count
+                total_transactions += transaction_count
+            
+            print(f"✓ Generated {total_transactions} transactions")
+            
+            # Generate liabilities (for credit accounts)
+            print("[4/4] Generating liabilities...")
+            liability_count = 0
+            for user_id, user_data in users.items():
+                liabilities = generate_user_liabilities(
+                    user_id,
+                    user_data["archetype"],
+                    user_data["account_ids"],
+                    conn
+                )
+                user_data["liabilities"] = liabilities
+                liability_count += len(liabilities)
+            
+            print(f"✓ Generated {liability_count} liabilities")
+    finally:
+        create_indexes(conn)
     
     # Generate summary report
     end_time = datetime.now()
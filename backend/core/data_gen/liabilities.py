@@ -12,6 +12,11 @@ from faker import Faker
 from .archetypes import Archetype
 from .accounts import get_credit_accounts, get_account_balance
 
+try:
+    from ...storage.schemas import INSERT_LIABILITY_SQL
+except ImportError:
+    from storage.schemas import INSERT_LIABILITY_SQL
+
 
 fake = Faker()
 Faker.seed(42)
@@ -26,7 +31,8 @@ def generate_credit_card_liability(
     account_id: str,
     user_id: str,
     archetype: Archetype,
-    conn: sqlite3.Connection
+    conn: sqlite3.Connection,
+    rows: List[tuple]
 ) -> str:
     """
     Generate liability details for a credit card
@@ -35,7 +41,8 @@ def generate_credit_card_liability(
         account_id: Credit card account ID
         user_id: User ID
         archetype: User's archetype
-        conn: Database connection
+        conn: Database connection (used for balance lookups)
+        rows: Buffer the liability row is appended to
         
     Returns:
         Liability ID
@@ -87,13 +94,7 @@ def generate_credit_card_liability(
     
     liability_id = generate_liability_id()
     
-    cursor.execute("""
-        INSERT INTO liabilities (
-            liability_id, account_id, user_id, liability_type,
-            apr_percentage, apr_type, minimum_payment_amount, last_payment_amount,
-            is_overdue, next_payment_due_date, last_statement_balance
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    rows.append((
         liability_id,
         account_id,
         user_id,
@@ -107,7 +108,6 @@ def generate_credit_card_liability(
         last_statement_balance
     ))
     
-    conn.commit()
     return liability_id
 
 
@@ -130,6 +130,7 @@ def generate_user_liabilities(
         List of liability IDs created
     """
     liability_ids = []
+    liability_rows = []
     
     # Get credit card accounts
     credit_accounts = get_credit_accounts(user_id, conn)
@@ -140,10 +141,13 @@ def generate_user_liabilities(
             credit_account_id,
             user_id,
             archetype,
-            conn
+            conn,
+            liability_rows
         )
         liability_ids.append(liability_id)
     
+    conn.executemany(INSERT_LIABILITY_SQL, liability_rows)
+    
     return liability_ids
 
 
@@ -11,13 +11,16 @@ from faker import Faker
 
 from .archetypes import Archetype
 from .accounts import (
-    get_checking_account,
-    get_savings_account,
-    get_credit_accounts,
+    get_user_account_ids,
     update_account_balance,
     get_account_balance
 )
 
+try:
+    from ...storage.schemas import TRANSACTION_COLUMNS, bulk_insert
+except ImportError:
+    from storage.schemas import TRANSACTION_COLUMNS, bulk_insert
+
 
 fake = Faker()
 Faker.seed(42)
@@ -69,10 +72,20 @@ EXPENSE_MERCHANTS = [
     ("Rent Payment", None, "LOAN_PAYMENTS", "Rent"),  # Will be calculated
 ]
 
+# Scheduled (non-random-day) merchants and the day-to-day pool left after removing them
+SCHEDULED_MERCHANTS = {"Rent Payment", "Electric Company", "Internet Provider", "Water Utility"}
+DISCRETIONARY_MERCHANTS = [m for m in EXPENSE_MERCHANTS if m[0] not in SCHEDULED_MERCHANTS]
+EXPENSE_MERCHANTS_BY_NAME = {m[0]: m for m in EXPENSE_MERCHANTS}
+
+
+# Bound once: resolving fake.uuid4 through the Faker proxy costs more than
+# the UUID itself in the transaction hot loop
+_fake_uuid4 = fake.uuid4
+
 
 def generate_transaction_id() -> str:
     """Generate a Plaid-style transaction ID"""
-    return f"txn_{fake.uuid4()[:12]}"
+    return f"txn_{_fake_uuid4()[:12]}"
 
 
 def generate_payroll_transaction(
@@ -80,17 +93,10 @@ def generate_payroll_transaction(
     user_id: str,
     trans_date: date,
     amount: float,
-    conn: sqlite3.Connection
+    rows: List[Tuple]
 ) -> None:
-    """Generate a payroll deposit transaction"""
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO transactions (
-            transaction_id, account_id, user_id, date, amount,
-            merchant_name, payment_channel, category_primary, category_detailed, pending
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    """Buffer a payroll deposit transaction row"""
+    rows.append((
         generate_transaction_id(),
         account_id,
         user_id,
@@ -112,17 +118,10 @@ def generate_expense_transaction(
     amount: float,
     category_primary: str,
     category_detailed: str,
-    conn: sqlite3.Connection
+    rows: List[Tuple]
 ) -> None:
-    """Generate an expense transaction"""
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO transactions (
-            transaction_id, account_id, user_id, date, amount,
-            merchant_name, payment_channel, category_primary, category_detailed, pending
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    """Buffer an expense transaction row"""
+    rows.append((
         generate_transaction_id(),
         account_id,
         user_id,
@@ -142,17 +141,10 @@ def generate_transfer_transaction(
     trans_date: date,
     amount: float,
     is_deposit: bool,
-    conn: sqlite3.Connection
+    rows: List[Tuple]
 ) -> None:
-    """Generate a transfer transaction (e.g., savings transfer)"""
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO transactions (
-            transaction_id, account_id, user_id, date, amount,
-            merchant_name, payment_channel, category_primary, category_detailed, pending
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    """Buffer a transfer transaction row (e.g., savings transfer)"""
+    rows.append((
         generate_transaction_id(),
         account_id,
         user_id,
@@ -233,11 +225,12 @@ def generate_user_transactions(
         Number of transactions generated
     """
     transaction_count = 0
+    # Rows are buffered in TRANSACTION_COLUMNS order and bulk-inserted once the
+    # user's history is complete
+    txn_rows: List[Tuple] = []
     
     # Get account IDs
-    checking_id = get_checking_account(user_id, conn)
-    savings_id = get_savings_account(user_id, conn)
-    credit_ids = get_credit_accounts(user_id, conn)
+    checking_id, savings_id, credit_ids = get_user_account_ids(user_id, conn)
     
     if not checking_id:
         return 0
@@ -293,6 +286,12 @@ def generate_user_transactions(
     utility_frequency = random.choice(['monthly', 'bimonthly', 'quarterly'])  # Not always monthly
     last_utility_month = None
     
+    # Cash flow stressed users have more frequent, smaller transactions
+    if archetype.target_low_balance_days_pct > 0.25:
+        expense_probability = 0.75  # 75% chance (more frequent for cash stressed)
+    else:
+        expense_probability = 0.6  # 60% chance (normal)
+    
     while current_date <= end_date:
         # Check if it's a payroll date
         if payroll_index < len(payroll_dates) and current_date == payroll_dates[payroll_index]:
@@ -304,7 +303,7 @@ def generate_user_transactions(
                 # Stable income: normal ±5% variance
                 payroll_amount = avg_income * random.uniform(0.95, 1.05)
             
-            generate_payroll_transaction(checking_id, user_id, current_date, payroll_amount, conn)
+            generate_payroll_transaction(checking_id, user_id, current_date, payroll_amount, txn_rows)
             current_balance += payroll_amount
             transaction_count += 1
             payroll_index += 1
@@ -316,13 +315,13 @@ def generate_user_transactions(
         if current_date.day == effective_rent_day and last_rent_month != current_date.month:
             if use_rent_as_transfer:
                 # Direct debit / ACH transfer (not a merchant transaction)
-                generate_transfer_transaction(checking_id, user_id, current_date, monthly_rent, False, conn)
+                generate_transfer_transaction(checking_id, user_id, current_date, monthly_rent, False, txn_rows)
             else:
                 # Traditional rent payment to merchant
                 generate_expense_transaction(
                     checking_id, user_id, current_date,
                     "Rent Payment", monthly_rent,
-                    "LOAN_PAYMENTS", "Rent", conn
+                    "LOAN_PAYMENTS", "Rent", txn_rows
                 )
             current_balance -= monthly_rent
             transaction_count += 1
@@ -337,7 +336,7 @@ def generate_user_transactions(
             for merchant, amount, category_primary, category_detailed in user_subscriptions:
                 generate_expense_transaction(
                     checking_id, user_id, current_date,
-                    merchant, amount, category_primary, category_detailed, conn
+                    merchant, amount, category_primary, category_detailed, txn_rows
                 )
                 current_balance -= amount
                 transaction_count += 1
@@ -346,14 +345,8 @@ def generate_user_transactions(
             subscription_day_variance = random.randint(-2, 2)
         
         # Regular expenses (groceries, dining, gas, etc.) - random days
-        # Cash flow stressed users have more frequent, smaller transactions
-        if archetype.target_low_balance_days_pct > 0.25:
-            expense_probability = 0.75  # 75% chance (more frequent for cash stressed)
-        else:
-            expense_probability = 0.6  # 60% chance (normal)
-        
         if random.random() < expense_probability:
-            merchant_data = random.choice([m for m in EXPENSE_MERCHANTS if m[0] not in ["Rent Payment", "Electric Company", "Internet Provider", "Water Utility"]])
+            merchant_data = random.choice(DISCRETIONARY_MERCHANTS)
             merchant, amount_range, category_primary, category_detailed = merchant_data
             
             if isinstance(amount_range, tuple):
@@ -369,7 +362,7 @@ def generate_user_transactions(
             
             generate_expense_transaction(
                 account_for_transaction, user_id, current_date,
-                merchant, amount, category_primary, category_detailed, conn
+                merchant, amount, category_primary, category_detailed, txn_rows
             )
             
             if account_for_transaction == checking_id:
@@ -403,13 +396,13 @@ def generate_user_transactions(
                     utilities_to_process.append("Water Utility")
                 
                 for utility in utilities_to_process:
-                    merchant_data = next(m for m in EXPENSE_MERCHANTS if m[0] == utility)
+                    merchant_data = EXPENSE_MERCHANTS_BY_NAME[utility]
                     _, amount_range, category_primary, category_detailed = merchant_data
                     amount = random.uniform(*amount_range)
                     
                     generate_expense_transaction(
                         checking_id, user_id, current_date,
-                        utility, amount, category_primary, category_detailed, conn
+                        utility, amount, category_primary, category_detailed, txn_rows
                     )
                     current_balance -= amount
                     transaction_count += 1
@@ -428,12 +421,12 @@ def generate_user_transactions(
                     transfer_amount = avg_income * 0.10  # 10% of income
                 
                 # Transfer from checking
-                generate_transfer_transaction(checking_id, user_id, current_date, transfer_amount, False, conn)
+                generate_transfer_transaction(checking_id, user_id, current_date, transfer_amount, False, txn_rows)
                 current_balance -= transfer_amount
                 transaction_count += 1
                 
                 # Transfer to savings
-                generate_transfer_transaction(savings_id, user_id, current_date, transfer_amount, True, conn)
+                generate_transfer_transaction(savings_id, user_id, current_date, transfer_amount, True, txn_rows)
                 transaction_count += 1
         
         # Aggressive balance management for Cash Flow Stressed users
@@ -445,7 +438,7 @@ def generate_user_transactions(
                 merchant = random.choice(["Auto Repair", "Medical Bill", "Emergency Expense"])
                 generate_expense_transaction(
                     checking_id, user_id, current_date,
-                    merchant, amount, "GENERAL_SERVICES", "Other", conn
+                    merchant, amount, "GENERAL_SERVICES", "Other", txn_rows
                 )
                 current_balance -= amount
                 transaction_count += 1
@@ -455,7 +448,7 @@ def generate_user_transactions(
                 merchant = random.choice(["Car Maintenance", "Home Repair", "Healthcare"])
                 generate_expense_transaction(
                     checking_id, user_id, current_date,
-                    merchant, amount, "GENERAL_SERVICES", "Other", conn
+                    merchant, amount, "GENERAL_SERVICES", "Other", txn_rows
                 )
                 current_balance -= amount
                 transaction_count += 1
@@ -466,7 +459,7 @@ def generate_user_transactions(
                     merchant = random.choice(["Coffee Shop", "Fast Food", "Local Restaurant"])
                     generate_expense_transaction(
                         checking_id, user_id, current_date,
-                        merchant, amount, "FOOD_AND_DRINK", "Restaurants", conn
+                        merchant, amount, "FOOD_AND_DRINK", "Restaurants", txn_rows
                     )
                     current_balance -= amount
                     transaction_count += 1
@@ -480,6 +473,8 @@ def generate_user_transactions(
         
         current_date += timedelta(days=1)
     
+    bulk_insert(conn, "transactions", TRANSACTION_COLUMNS, txn_rows)
+    
     # Update final checking account balance
     update_account_balance(checking_id, current_balance, conn)
     
@@ -498,6 +493,5 @@ def generate_user_transactions(
         target_balance = limit * archetype.credit_utilization_target
         update_account_balance(credit_id, target_balance, conn)
     
-    conn.commit()
     return transaction_count
 
@@ -182,6 +182,36 @@ def validate_data_quality(conn: sqlite3.Connection) -> Dict[str, Any]:
     }
 
 
+# All archetype checks in one statement: accounts and transactions are each
+# aggregated per user once, and every count is read off those aggregates
+_ARCHETYPE_COUNTS_SQL = """
+    WITH account_users AS (
+        SELECT
+            user_id,
+            MAX(account_type = 'credit' AND balance_current / balance_limit >= 0.5) AS high_utilization,
+            MAX(account_subtype = 'savings') AS has_savings
+        FROM accounts
+        GROUP BY user_id
+    ),
+    transaction_users AS (
+        SELECT
+            user_id,
+            COUNT(DISTINCT CASE
+                WHEN merchant_name IN ('Netflix', 'Spotify', 'Amazon Prime', 'Gym Membership', 'NYT Subscription', 'iCloud Storage', 'Disney+')
+                THEN merchant_name
+            END) AS subscription_merchants,
+            MAX(merchant_name = 'PAYROLL DEPOSIT') AS has_payroll
+        FROM transactions
+        GROUP BY user_id
+    )
+    SELECT
+        (SELECT COUNT(*) FROM account_users WHERE high_utilization) AS high_utilization_users,
+        (SELECT COUNT(*) FROM transaction_users WHERE subscription_merchants >= 3) AS subscription_heavy_users,
+        (SELECT COUNT(*) FROM account_users WHERE has_savings) AS savings_account_users,
+        (SELECT COUNT(*) FROM transaction_users WHERE has_payroll) AS payroll_users
+"""
+
+
 def validate_archetype_specific(conn: sqlite3.Connection) -> Dict[str, Any]:
     """
     Validate archetype-specific patterns
@@ -194,62 +224,35 @@ def validate_archetype_specific(conn: sqlite3.Connection) -> Dict[str, Any]:
         Validation results
     """
     cursor = conn.cursor()
-    validations = {}
-    
-    # Check 1: High utilization users exist (credit cards with high balance)
-    cursor.execute("""
-        SELECT COUNT(DISTINCT a.user_id)
-        FROM accounts a
-        WHERE a.account_type = 'credit'
-        AND a.balance_current / a.balance_limit >= 0.5
-    """)
-    high_util_users = cursor.fetchone()[0]
-    validations["high_utilization_users"] = {
-        "count": high_util_users,
-        "passed": high_util_users >= 5,
-        "target": "≥5 users"
-    }
-    
-    # Check 2: Subscription patterns (users with recurring merchants)
-    cursor.execute("""
-        SELECT COUNT(DISTINCT t.user_id)
-        FROM transactions t
-        WHERE t.merchant_name IN ('Netflix', 'Spotify', 'Amazon Prime', 'Gym Membership', 'NYT Subscription', 'iCloud Storage', 'Disney+')
-        GROUP BY t.user_id
-        HAVING COUNT(DISTINCT t.merchant_name) >= 3
-    """)
-    subscription_users = cursor.fetchone()[0] if cursor.fetchone() else 0
-    validations["subscription_heavy_users"] = {
-        "count": subscription_users,
-        "note": "Users with ≥3 subscription merchants",
-        "passed": subscription_users >= 5,
-        "target": "≥5 users"
-    }
-    
-    # Check 3: Savings accounts exist
-    cursor.execute("""
-        SELECT COUNT(DISTINCT user_id)
-        FROM accounts
-        WHERE account_subtype = 'savings'
-    """)
-    savings_users = cursor.fetchone()[0]
-    validations["savings_account_users"] = {
-        "count": savings_users,
-        "passed": savings_users >= 10,
-        "target": "≥10 users"
-    }
-    
-    # Check 4: Payroll deposits exist
-    cursor.execute("""
-        SELECT COUNT(DISTINCT user_id)
-        FROM transactions
-        WHERE merchant_name = 'PAYROLL DEPOSIT'
-    """)
-    payroll_users = cursor.fetchone()[0]
-    validations["payroll_users"] = {
-        "count": payroll_users,
-        "passed": payroll_users >= 50,
-        "target": "≥50 users (most users)"
+    cursor.execute(_ARCHETYPE_COUNTS_SQL)
+    counts = dict(zip([col[0] for col in cursor.description], cursor.fetchone()))
+    
+    validations = {
+        # Check 1: High utilization users exist (credit cards with high balance)
+        "high_utilization_users": {
+            "count": counts["high_utilization_users"],
+            "passed": counts["high_utilization_users"] >= 5,
+            "target": "≥5 users"
+        },
+        # Check 2: Subscription patterns (users with recurring merchants)
+        "subscription_heavy_users": {
+            "count": counts["subscription_heavy_users"],
+            "note": "Users with ≥3 subscription merchants",
+            "passed": counts["subscription_heavy_users"] >= 5,
+            "target": "≥5 users"
+        },
+        # Check 3: Savings accounts exist
+        "savings_account_users": {
+            "count": counts["savings_account_users"],
+            "passed": counts["savings_account_users"] >= 10,
+            "target": "≥10 users"
+        },
+        # Check 4: Payroll deposits exist
+        "payroll_users": {
+            "count": counts["payroll_users"],
+            "passed": counts["payroll_users"] >= 50,
+            "target": "≥50 users (most users)"
+        },
     }
     
     all_passed = all(v.get("passed", False) for v in validations.values())
@@ -3,8 +3,9 @@ Cash flow analysis with daily balance reconstruction
 Detects low balance frequency and balance volatility
 """
 
-from datetime import date, timedelta
+from datetime import date
 from typing import Dict, List
+import numpy as np
 import pandas as pd
 import statistics
 from .utils import calculate_window_dates, get_primary_checking_account
@@ -31,41 +32,35 @@ def reconstruct_daily_balances(
         List of daily balances for each day in window
     """
     # Get transactions for this account in window (and beyond for calculation)
-    account_txns = transactions_df[
-        (transactions_df['account_id'] == account_id) &
-        (transactions_df['date'] <= end_date)
-    ].sort_values('date')
+    account_txns = transactions_df[transactions_df['account_id'] == account_id]
+    account_txns = account_txns[account_txns['date'] <= end_date].sort_values('date')
     
     # Work backwards from current balance to calculate start balance
     # Sum all transactions from start_date (exclusive) to end_date (inclusive)
-    window_txns = account_txns[
-        (account_txns['date'] > start_date) &
-        (account_txns['date'] <= end_date)
-    ]
+    window_txns = account_txns[account_txns['date'] > start_date]
     
     net_change = window_txns['amount'].sum() if not window_txns.empty else 0.0
     start_balance = current_balance - net_change
     
-    # Build daily balances array
-    daily_balances = []
-    running_balance = start_balance
+    num_days = (end_date - start_date).days
+    if num_days <= 0:
+        return []
     
-    # Create date range for all days in window
-    current_date = start_date + timedelta(days=1)  # Start day after start_date
-    
-    while current_date <= end_date:
-        # Get transactions for this specific date
-        day_txns = window_txns[window_txns['date'] == current_date]
-        
-        # Apply transactions
-        if not day_txns.empty:
-            day_change = day_txns['amount'].sum()
-            running_balance += day_change
-        
-        daily_balances.append(running_balance)
-        current_date += timedelta(days=1)
+    # Bucket each transaction by day offset (0 = day after start_date) and
+    # replay the per-day net changes as one cumulative sum
+    day_offsets = np.fromiter(
+        ((txn_date - start_date).days - 1 for txn_date in window_txns['date']),
+        dtype=np.int64,
+        count=len(window_txns)
+    )
+    day_changes = np.bincount(
+        day_offsets,
+        weights=window_txns['amount'].to_numpy(dtype=np.float64),
+        minlength=num_days
+    )
+    day_changes[0] += start_balance
     
-    return daily_balances
+    return np.cumsum(day_changes).tolist()
 
 
 def compute_cash_flow_features(
@@ -3,8 +3,9 @@ Feature computation orchestrator
 Coordinates computation of all feature types across time windows
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 import pandas as pd
 import sqlite3
 from pathlib import Path
@@ -43,20 +44,133 @@ def load_data_from_db(db_path: str) -> tuple:
     return users_df, accounts_df, transactions_df, liabilities_df
 
 
+FEATURE_TYPES = ['subscriptions', 'savings', 'credit', 'income', 'cash_flow']
+
+# Below this many users, process start-up costs more than it saves
+PARALLEL_MIN_USERS = 16
+
+# Data shared with worker processes, set once per worker by _init_worker
+_worker_data: tuple = ()
+
+
+def _compute_user_features(
+    user_id: str,
+    accounts_df: pd.DataFrame,
+    transactions_df: pd.DataFrame,
+    liabilities_df: pd.DataFrame,
+    as_of_date: date,
+    windows: List[int]
+) -> Dict[str, List[dict]]:
+    """
+    Compute every feature type for one user across all windows
+    
+    Returns:
+        Dictionary mapping feature type to one feature dict per window
+    """
+    features = {feature_type: [] for feature_type in FEATURE_TYPES}
+    
+    for window_days in windows:
+        # Subscriptions (use 90-day window for detection)
+        sub_features = compute_subscription_features(
+            transactions_df,
+            user_id,
+            as_of_date,
+            window_days=90  # Always use 90 days for subscription detection
+        )
+        # But report with the target window
+        sub_features['window_days'] = window_days
+        features['subscriptions'].append(sub_features)
+        
+        # Savings
+        features['savings'].append(
+            compute_savings_features(
+                accounts_df,
+                transactions_df,
+                user_id,
+                as_of_date,
+                window_days
+            )
+        )
+        
+        # Credit
+        features['credit'].append(
+            compute_credit_features(
+                accounts_df,
+                liabilities_df,
+                transactions_df,
+                user_id,
+                as_of_date,
+                window_days
+            )
+        )
+        
+        # Income
+        features['income'].append(
+            compute_income_features(
+                accounts_df,
+                transactions_df,
+                user_id,
+                as_of_date,
+                window_days
+            )
+        )
+        
+        # Cash Flow
+        features['cash_flow'].append(
+            compute_cash_flow_features(
+                accounts_df,
+                transactions_df,
+                user_id,
+                as_of_date,
+                window_days
+            )
+        )
+    
+    return features
+
+
+def _init_worker(
+    accounts_df: pd.DataFrame,
+    transactions_df: pd.DataFrame,
+    liabilities_df: pd.DataFrame,
+    as_of_date: date,
+    windows: List[int]
+) -> None:
+    """Keep the loaded data in each worker process so tasks only carry a user_id"""
+    global _worker_data
+    _worker_data = (accounts_df, transactions_df, liabilities_df, as_of_date, windows)
+
+
+def _compute_user_features_in_worker(user_id: str) -> Dict[str, List[dict]]:
+    """Worker-process entry point for _compute_user_features"""
+    accounts_df, transactions_df, liabilities_df, as_of_date, windows = _worker_data
+    return _compute_user_features(
+        user_id, accounts_df, transactions_df, liabilities_df, as_of_date, windows
+    )
+
+
 def compute_all_features(
     db_path: str = "data/spendsense.db",
     output_dir: str = "data/features",
     as_of_date: Optional[date] = None,
-    windows: List[int] = [30, 180]
+    windows: List[int] = [30, 180],
+    max_workers: int = 1
 ) -> dict:
     """
     Compute all features for all users across specified time windows
     
+    With max_workers > 1, users are spread across worker processes when
+    there are at least PARALLEL_MIN_USERS of them. The loaded DataFrames
+    are pickled to each worker, and under the spawn start method (macOS,
+    Windows) the calling script needs an if __name__ == '__main__' guard.
+    
     Args:
         db_path: Path to SQLite database
         output_dir: Output directory for Parquet files
         as_of_date: End date for windows (defaults to today)
         windows: List of window sizes in days (default [30, 180])
+        max_workers: Worker processes to use (default 1 computes serially
+            in this process)
         
     Returns:
         Dictionary with computation summary
@@ -75,81 +189,41 @@ def compute_all_features(
     print(f"Computing features for {len(users_df)} users as of {as_of_date}")
     print(f"Windows: {windows} days")
     
-    # Initialize feature DataFrames
-    subscription_features = []
-    savings_features = []
-    credit_features = []
-    income_features = []
-    cash_flow_features = []
-    
     # Compute features for each user and each window
-    for _, user in users_df.iterrows():
-        user_id = user['user_id']
-        
-        for window_days in windows:
-            # Subscriptions (use 90-day window for detection)
-            sub_features = compute_subscription_features(
-                transactions_df,
-                user_id,
-                as_of_date,
-                window_days=90  # Always use 90 days for subscription detection
-            )
-            # But report with the target window
-            sub_features['window_days'] = window_days
-            subscription_features.append(sub_features)
-            
-            # Savings
-            savings_features.append(
-                compute_savings_features(
-                    accounts_df,
-                    transactions_df,
-                    user_id,
-                    as_of_date,
-                    window_days
-                )
-            )
-            
-            # Credit
-            credit_features.append(
-                compute_credit_features(
-                    accounts_df,
-                    liabilities_df,
-                    transactions_df,
-                    user_id,
-                    as_of_date,
-                    window_days
-                )
-            )
-            
-            # Income
-            income_features.append(
-                compute_income_features(
-                    accounts_df,
-                    transactions_df,
-                    user_id,
-                    as_of_date,
-                    window_days
-                )
-            )
-            
-            # Cash Flow
-            cash_flow_features.append(
-                compute_cash_flow_features(
-                    accounts_df,
-                    transactions_df,
-                    user_id,
-                    as_of_date,
-                    window_days
-                )
+    user_ids = users_df['user_id'].tolist()
+    workers = min(max_workers, len(user_ids))
+    
+    if workers > 1 and len(user_ids) >= PARALLEL_MIN_USERS:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(accounts_df, transactions_df, liabilities_df, as_of_date, windows)
+        ) as executor:
+            chunksize = max(1, len(user_ids) // (workers * 4))
+            user_features = list(executor.map(
+                _compute_user_features_in_worker, user_ids, chunksize=chunksize
+            ))
+    else:
+        user_features = [
+            _compute_user_features(
+                user_id, accounts_df, transactions_df, liabilities_df, as_of_date, windows
             )
+            for user_id in user_ids
+        ]
+    
+    # Flatten per-user results (in user order) into one list per feature type
+    feature_rows = {
+        feature_type: [row for features in user_features for row in features[feature_type]]
+        for feature_type in FEATURE_TYPES
+    }
     
     # Convert to DataFrames
     print("\nCreating feature DataFrames...")
-    subscriptions_df = pd.DataFrame(subscription_features)
-    savings_df = pd.DataFrame(savings_features)
-    credit_df = pd.DataFrame(credit_features)
-    income_df = pd.DataFrame(income_features)
-    cash_flow_df = pd.DataFrame(cash_flow_features)
+    subscriptions_df = pd.DataFrame(feature_rows['subscriptions'])
+    savings_df = pd.DataFrame(feature_rows['savings'])
+    credit_df = pd.DataFrame(feature_rows['credit'])
+    income_df = pd.DataFrame(feature_rows['income'])
+    cash_flow_df = pd.DataFrame(feature_rows['cash_flow'])
     
     # Save to Parquet
     print(f"\nSaving features to {output_dir}...")
@@ -5,8 +5,18 @@ Handles reading and writing feature DataFrames to Parquet files
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import pandas as pd
+import pyarrow.parquet as pq
+
+
+# Row groups carry min/max statistics, so filtered reads can skip whole
+# groups once a feature file grows beyond one group
+PARQUET_ROW_GROUP_SIZE = 8_192
+
+# Feature files are written sorted on these columns (when present) so each
+# user's rows land in one contiguous run of row groups
+FEATURE_SORT_COLUMNS = ['user_id', 'as_of_date']
 
 
 def save_features_to_parquet(
@@ -15,7 +25,7 @@ def save_features_to_parquet(
     output_dir: str = "data/features"
 ) -> Path:
     """
-    Save feature DataFrame to Parquet file
+    Save feature DataFrame to Parquet file, sorted by user and as-of date
     
     Args:
         df: Feature DataFrame
@@ -29,23 +39,44 @@ def save_features_to_parquet(
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Save to Parquet
+    # Stable sort keeps each user's windows in computation order
+    sort_columns = [col for col in FEATURE_SORT_COLUMNS if col in df.columns]
+    if sort_columns:
+        df = df.sort_values(sort_columns, kind='stable').reset_index(drop=True)
+    
+    # Save to Parquet, recording the sort order in the file metadata
     file_path = output_path / f"{feature_type}.parquet"
-    df.to_parquet(file_path, index=False, engine='pyarrow')
+    df.to_parquet(
+        file_path,
+        index=False,
+        engine='pyarrow',
+        compression='zstd',
+        row_group_size=PARQUET_ROW_GROUP_SIZE,
+        sorting_columns=[
+            pq.SortingColumn(df.columns.get_loc(col)) for col in sort_columns
+        ] or None
+    )
     
     return file_path
 
 
 def load_features_from_parquet(
     feature_type: str,
-    output_dir: str = "data/features"
+    output_dir: str = "data/features",
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[tuple]] = None
 ) -> Optional[pd.DataFrame]:
     """
     Load feature DataFrame from Parquet file
     
+    Column selection and filters are pushed down to PyArrow, so only the
+    requested columns are decoded and non-matching row groups are skipped.
+    
     Args:
         feature_type: Type of features (subscriptions, savings, credit, income, cash_flow)
         output_dir: Output directory path
+        columns: Optional list of columns to read (default: all)
+        filters: Optional PyArrow filters, e.g. [('user_id', '==', 'user_001')]
         
     Returns:
         Feature DataFrame or None if file doesn't exist
@@ -55,7 +86,7 @@ def load_features_from_parquet(
     if not file_path.exists():
         return None
     
-    return pd.read_parquet(file_path, engine='pyarrow')
+    return pd.read_parquet(file_path, engine='pyarrow', columns=columns, filters=filters)
 
 
 def ensure_features_directory(output_dir: str = "data/features") -> Path:
@@ -87,33 +87,44 @@ def compute_subscription_features(
         }
     
     # Calculate total spend (all outflows - POSITIVE amounts in Epic 1 data)
-    total_spend = abs(user_txns[user_txns['amount'] > 0]['amount'].sum())
-    
-    # Group by merchant and count occurrences
-    merchant_groups = user_txns[user_txns['amount'] > 0].groupby('merchant_name')
+    spend_txns = user_txns[user_txns['amount'] > 0]
+    total_spend = abs(spend_txns['amount'].sum())
+    
+    # Group outflow row positions by merchant in plain Python; slicing a
+    # DataFrame per merchant (groupby iteration) dominated this function.
+    # Outflows without a merchant name can't recur (groupby skipped them too)
+    merchant_txns = spend_txns[spend_txns['merchant_name'].notna()]
+    merchant_rows: Dict[str, List[int]] = {}
+    for row, merchant_name in enumerate(merchant_txns['merchant_name'].tolist()):
+        merchant_rows.setdefault(merchant_name, []).append(row)
+    dates = merchant_txns['date'].tolist()
+    amounts = merchant_txns['amount'].to_numpy()
     
     recurring_merchants = []
     total_recurring_spend = 0.0
     
-    for merchant_name, merchant_txns in merchant_groups:
+    for merchant_name in sorted(merchant_rows):
+        rows = merchant_rows[merchant_name]
+        
         # Need at least 3 occurrences
-        if len(merchant_txns) < 3:
+        if len(rows) < 3:
             continue
         
         # Get sorted transaction dates
-        txn_dates = sorted(merchant_txns['date'].tolist())
+        txn_dates = sorted(dates[row] for row in rows)
         
         # Check if it follows a subscription cadence
         is_subscription, cadence_type = detect_subscription_cadence(txn_dates)
         
         if is_subscription:
+            merchant_total = abs(amounts[rows].sum())
             recurring_merchants.append({
                 'merchant': merchant_name,
                 'cadence': cadence_type,
-                'count': len(merchant_txns),
-                'total_amount': abs(merchant_txns['amount'].sum())
+                'count': len(rows),
+                'total_amount': merchant_total
             })
-            total_recurring_spend += abs(merchant_txns['amount'].sum())
+            total_recurring_spend += merchant_total
     
     # Calculate subscription share
     subscription_share = 0.0
@@ -4,11 +4,12 @@ Guardrails Module
 Epic 5: Consent enforcement, metrics computation, and operator controls
 """
 
-from .consent import check_consent, get_consented_users, ConsentError
+from .consent import check_consent, check_consent_cached, get_consented_users, ConsentError
 from .metrics import compute_operator_metrics, get_user_metrics
 
 __all__ = [
     'check_consent',
+    'check_consent_cached',
     'get_consented_users',
     'ConsentError',
     'compute_operator_metrics',
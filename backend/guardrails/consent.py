@@ -6,11 +6,17 @@ and that non-consented users are filtered from operator views.
 """
 
 import sqlite3
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Cache of positive consent checks, keyed by (user_id, db_path)
+_consent_cache: Dict[Tuple[str, str], datetime] = {}
+CONSENT_CACHE_TTL_SECONDS = 60
+CONSENT_CACHE_MAX_SIZE = 10_000
+
 
 class ConsentError(Exception):
     """Raised when attempting to access data for non-consented user"""
@@ -59,6 +65,57 @@ def check_consent(user_id: str, db_path: str) -> bool:
         conn.close()
 
 
+def check_consent_cached(user_id: str, db_path: str) -> bool:
+    """
+    Verify consent, reusing a recent positive check when available
+    
+    Only successful checks are cached (for 60 seconds), so a user who has
+    not consented is re-checked against the database every time. Consent
+    changes made through update_consent, grant_consent or revoke_consent
+    invalidate the cached entry immediately.
+    
+    Args:
+        user_id: User identifier
+        db_path: Path to SQLite database
+        
+    Returns:
+        True if user has consented
+        
+    Raises:
+        ConsentError: If user has not consented or does not exist
+    """
+    key = (user_id, db_path)
+    cached_at = _consent_cache.get(key)
+    if cached_at is not None:
+        age = (datetime.now() - cached_at).total_seconds()
+        if age < CONSENT_CACHE_TTL_SECONDS:
+            return True
+        _consent_cache.pop(key, None)
+    
+    check_consent(user_id, db_path)
+    
+    if len(_consent_cache) >= CONSENT_CACHE_MAX_SIZE:
+        # Evict the oldest entry (dicts preserve insertion order)
+        _consent_cache.pop(next(iter(_consent_cache)), None)
+    _consent_cache[key] = datetime.now()
+    return True
+
+
+def invalidate_consent_cache(user_id: Optional[str] = None) -> None:
+    """
+    Drop cached consent checks
+    
+    Args:
+        user_id: User whose entries should be dropped, or None to clear all
+    """
+    if user_id is None:
+        _consent_cache.clear()
+        return
+    
+    for key in [k for k in _consent_cache if k[0] == user_id]:
+        _consent_cache.pop(key, None)
+
+
 def get_consented_users(db_path: str) -> List[Dict]:
     """
     Get list of all users who have consented to data processing
@@ -151,6 +208,7 @@ def update_consent(user_id: str, consent: bool, db_path: str) -> None:
         """, (1 if consent else 0, user_id))
         
         conn.commit()
+        invalidate_consent_cache(user_id)
         
         status_text = "granted" if consent else "revoked"
         logger.info(f"Consent {status_text} for user {user_id}")
@@ -194,6 +252,7 @@ def grant_consent(user_id: str, db_path: str) -> bool:
         """, (user_id,))
         
         conn.commit()
+        invalidate_consent_cache(user_id)
         logger.info(f"Consent granted for user {user_id}")
         return True
         
@@ -251,6 +310,7 @@ def revoke_consent(user_id: str, db_path: str) -> bool:
         deleted_count = cursor.rowcount
         
         conn.commit()
+        invalidate_consent_cache(user_id)
         logger.info(f"Consent revoked for user {user_id}, soft deleted {deleted_count} recommendations")
         return True
         
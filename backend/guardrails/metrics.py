@@ -4,25 +4,56 @@ Metrics Computation
 Compute aggregate and per-user metrics for operator dashboard
 """
 
+import os
 import sqlite3
+import threading
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Cache for aggregate metrics
-_metrics_cache = {}
-_cache_timestamp = None
-CACHE_TTL_SECONDS = 60
+# Cache for aggregate metrics, keyed by database path -> (data version, metrics)
+_metrics_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+# Read-only sentinel connections, one per database path, used only for
+# PRAGMA data_version. Its value changes whenever *another* connection
+# commits, so these connections must never write.
+_data_version_connections: Dict[str, Tuple[sqlite3.Connection, int]] = {}
+_data_version_lock = threading.Lock()
+
+
+def _get_data_version(db_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Return an (inode, PRAGMA data_version) sentinel for the database
+    
+    The sentinel changes after any committed write and when the database
+    file is replaced. Returns None if the file does not exist.
+    """
+    try:
+        inode = os.stat(db_path).st_ino
+    except OSError:
+        return None
+    
+    with _data_version_lock:
+        cached = _data_version_connections.get(db_path)
+        if cached is None or cached[1] != inode:
+            if cached is not None:
+                cached[0].close()
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            _data_version_connections[db_path] = (conn, inode)
+        else:
+            conn = cached[0]
+        
+        return inode, conn.execute("PRAGMA data_version").fetchone()[0]
 
 
 def compute_operator_metrics(db_path: str, force_refresh: bool = False) -> Dict[str, Any]:
     """
     Compute aggregate metrics for operator dashboard main page
     
-    Cached for 60 seconds to improve performance.
+    Cached until the database changes (tracked via PRAGMA data_version).
     
     Args:
         db_path: Path to SQLite database
@@ -31,14 +62,15 @@ def compute_operator_metrics(db_path: str, force_refresh: bool = False) -> Dict[
     Returns:
         Dictionary with aggregate metrics
     """
-    global _metrics_cache, _cache_timestamp
-    
-    # Check cache
-    if not force_refresh and _cache_timestamp is not None:
-        age = (datetime.now() - _cache_timestamp).total_seconds()
-        if age < CACHE_TTL_SECONDS:
-            logger.debug(f"Returning cached metrics (age: {age:.1f}s)")
-            return _metrics_cache
+    # Check cache (read the sentinel before querying, so a write that lands
+    # mid-computation invalidates the entry on the next call)
+    data_version = _get_data_version(db_path)
+    cached = _metrics_cache.get(db_path)
+    if not force_refresh and data_version is not None and cached is not None:
+        cached_version, cached_metrics = cached
+        if cached_version == data_version:
+            logger.debug("Returning cached metrics (database unchanged)")
+            return cached_metrics
     
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
@@ -107,8 +139,8 @@ def compute_operator_metrics(db_path: str, force_refresh: bool = False) -> Dict[
         }
         
         # Update cache
-        _metrics_cache = metrics
-        _cache_timestamp = datetime.now()
+        if data_version is not None:
+            _metrics_cache[db_path] = (data_version, metrics)
         
         logger.info(f"Computed operator metrics: {metrics}")
         return metrics
@@ -143,37 +175,38 @@ def get_user_metrics(user_id: str, db_path: str) -> Dict[str, Any]:
         user_row = cursor.fetchone()
         full_name = user_row['name'] if user_row else None
         
-        # Get persona assignments (30d and 180d)
-        personas = {}
-        for window_days in [30, 180]:
-            cursor.execute("""
+        # Get persona assignments (30d and 180d): latest per window in one query
+        cursor.execute("""
+            SELECT * FROM (
                 SELECT 
+                    window_days,
                     primary_persona_id,
                     primary_persona_name,
                     primary_priority,
                     secondary_persona_id,
                     secondary_persona_name,
                     status,
-                    computed_at
+                    computed_at,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY window_days ORDER BY computed_at DESC
+                    ) AS rn
                 FROM persona_assignments
-                WHERE user_id = ? AND window_days = ?
-                ORDER BY computed_at DESC
-                LIMIT 1
-            """, (user_id, window_days))
-            
-            row = cursor.fetchone()
-            if row:
-                personas[f'window_{window_days}d'] = {
-                    'primary_persona_id': row['primary_persona_id'],
-                    'primary_persona_name': row['primary_persona_name'],
-                    'primary_priority': row['primary_priority'],
-                    'secondary_persona_id': row['secondary_persona_id'],
-                    'secondary_persona_name': row['secondary_persona_name'],
-                    'status': row['status'],
-                    'computed_at': row['computed_at']
-                }
-            else:
-                personas[f'window_{window_days}d'] = None
+                WHERE user_id = ? AND window_days IN (30, 180)
+            )
+            WHERE rn = 1
+        """, (user_id,))
+        
+        personas = {'window_30d': None, 'window_180d': None}
+        for row in cursor.fetchall():
+            personas[f"window_{row['window_days']}d"] = {
+                'primary_persona_id': row['primary_persona_id'],
+                'primary_persona_name': row['primary_persona_name'],
+                'primary_priority': row['primary_priority'],
+                'secondary_persona_id': row['secondary_persona_id'],
+                'secondary_persona_name': row['secondary_persona_name'],
+                'status': row['status'],
+                'computed_at': row['computed_at']
+            }
         
         # Get account counts
         cursor.execute("""
@@ -255,8 +288,10 @@ def _get_user_features_placeholder(user_id: str, db_path: str) -> Dict[str, Any]
         # Load credit features
         credit_path = features_dir / "credit.parquet"
         if credit_path.exists():
-            df_credit = pd.read_parquet(credit_path)
-            user_credit = df_credit[df_credit['user_id'] == user_id]
+            user_credit = pd.read_parquet(
+                credit_path,
+                filters=[('user_id', '==', user_id)]
+            )
             if not user_credit.empty:
                 latest = user_credit.iloc[0]
                 features['credit_utilization'] = round(latest.get('max_utilization', 0), 3)
@@ -265,8 +300,10 @@ def _get_user_features_placeholder(user_id: str, db_path: str) -> Dict[str, Any]
         # Load savings features
         savings_path = features_dir / "savings.parquet"
         if savings_path.exists():
-            df_savings = pd.read_parquet(savings_path)
-            user_savings = df_savings[df_savings['user_id'] == user_id]
+            user_savings = pd.read_parquet(
+                savings_path,
+                filters=[('user_id', '==', user_id)]
+            )
             if not user_savings.empty:
                 latest = user_savings.iloc[0]
                 features['savings_growth_rate'] = round(latest.get('growth_rate', 0), 3)
@@ -275,8 +312,10 @@ def _get_user_features_placeholder(user_id: str, db_path: str) -> Dict[str, Any]
         # Load cash flow features
         cash_flow_path = features_dir / "cash_flow.parquet"
         if cash_flow_path.exists():
-            df_cash = pd.read_parquet(cash_flow_path)
-            user_cash = df_cash[df_cash['user_id'] == user_id]
+            user_cash = pd.read_parquet(
+                cash_flow_path,
+                filters=[('user_id', '==', user_id)]
+            )
             if not user_cash.empty:
                 latest = user_cash.iloc[0]
                 features['pct_days_below_100'] = round(latest.get('pct_days_below_100', 0), 3)
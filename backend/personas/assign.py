@@ -53,14 +53,12 @@ def load_features_for_user(
             continue
         
         try:
-            df = pd.read_parquet(parquet_path)
-            
-            # Filter for this user/window
-            user_features = df[
-                (df['user_id'] == user_id) & 
-                (df['window_days'] == window_days) &
-                (df['as_of_date'] == date_obj)
-            ]
+            # Filter for this user/window while reading
+            user_features = pd.read_parquet(parquet_path, filters=[
+                ('user_id', '==', user_id),
+                ('window_days', '==', window_days),
+                ('as_of_date', '==', date_obj)
+            ])
             
             if len(user_features) > 0:
                 features[feature_type] = user_features.iloc[0].to_dict()
@@ -56,11 +56,15 @@ def create_persona_assignments_table(db_path: str):
     ''')
     
     # Create indexes
+    # (user_id, window_days, computed_at DESC) serves latest-assignment lookups
+    # without a sort and supersedes the old (user_id, window_days) index
     cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_persona_user_window 
-        ON persona_assignments(user_id, window_days)
+        CREATE INDEX IF NOT EXISTS idx_persona_user_window_time 
+        ON persona_assignments(user_id, window_days, computed_at DESC)
     ''')
     
+    cursor.execute('DROP INDEX IF EXISTS idx_persona_user_window')
+    
     cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_persona_primary 
         ON persona_assignments(primary_persona_id)
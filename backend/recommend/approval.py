@@ -12,68 +12,109 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def approve_recommendation(
-    rec_id: str,
+# Maximum ids bound into one IN (...) list (SQLite's conservative default
+# variable limit is 999)
+APPROVAL_BATCH_SIZE = 500
+
+
+def _select_recommendations(
+    cursor: sqlite3.Cursor,
+    columns: str,
+    rec_ids: List[str]
+) -> Dict[str, sqlite3.Row]:
+    """Fetch recommendations by id in IN (...) batches, keyed by recommendation_id"""
+    rows = {}
+    for start in range(0, len(rec_ids), APPROVAL_BATCH_SIZE):
+        batch = rec_ids[start:start + APPROVAL_BATCH_SIZE]
+        placeholders = ', '.join('?' * len(batch))
+        cursor.execute(
+            f"SELECT {columns} FROM recommendations WHERE recommendation_id IN ({placeholders})",
+            batch
+        )
+        rows.update((row['recommendation_id'], row) for row in cursor.fetchall())
+    return rows
+
+
+def approve_recommendations(
+    rec_ids: List[str],
     db_path: str,
     reviewer_notes: Optional[str] = None
-) -> Dict[str, Any]:
+) -> List[Dict[str, Any]]:
     """
-    Approve a recommendation for delivery to user
+    Approve several recommendations in one transaction
     
     Args:
-        rec_id: Recommendation identifier
+        rec_ids: Recommendation identifiers
         db_path: Path to SQLite database
-        reviewer_notes: Optional notes from operator
+        reviewer_notes: Optional notes from operator (applied to all)
         
     Returns:
-        Updated recommendation dictionary
+        Updated recommendation dictionaries, in the order of rec_ids
         
     Raises:
-        ValueError: If recommendation does not exist
+        ValueError: If any recommendation does not exist (nothing is updated)
     """
+    rec_ids = list(dict.fromkeys(rec_ids))
+    
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
     try:
-        # Check if recommendation exists
-        cursor.execute(
-            "SELECT recommendation_id, user_id, status FROM recommendations WHERE recommendation_id = ?",
-            (rec_id,)
-        )
-        row = cursor.fetchone()
-        
-        if row is None:
-            raise ValueError(f"Recommendation {rec_id} not found")
-        
-        old_status = row['status']
+        # Check that every recommendation exists
+        existing = _select_recommendations(cursor, "recommendation_id, user_id, status", rec_ids)
+        missing = [rec_id for rec_id in rec_ids if rec_id not in existing]
+        if missing:
+            raise ValueError(f"Recommendation {', '.join(missing)} not found")
         
         # Update status
-        cursor.execute("""
-            UPDATE recommendations
-            SET status = 'APPROVED',
-                reviewed_at = CURRENT_TIMESTAMP,
-                reviewer_notes = ?
-            WHERE recommendation_id = ?
-        """, (reviewer_notes, rec_id))
+        for start in range(0, len(rec_ids), APPROVAL_BATCH_SIZE):
+            batch = rec_ids[start:start + APPROVAL_BATCH_SIZE]
+            placeholders = ', '.join('?' * len(batch))
+            cursor.execute(f"""
+                UPDATE recommendations
+                SET status = 'APPROVED',
+                    reviewed_at = CURRENT_TIMESTAMP,
+                    reviewer_notes = ?
+                WHERE recommendation_id IN ({placeholders})
+            """, (reviewer_notes, *batch))
         
         conn.commit()
         
-        logger.info(f"Recommendation {rec_id} approved (was {old_status})")
+        for rec_id in rec_ids:
+            logger.info(f"Recommendation {rec_id} approved (was {existing[rec_id]['status']})")
         
-        # Return updated recommendation
-        cursor.execute(
-            "SELECT * FROM recommendations WHERE recommendation_id = ?",
-            (rec_id,)
-        )
-        updated_row = cursor.fetchone()
+        # Return updated recommendations
+        updated = _select_recommendations(cursor, "*", rec_ids)
         
-        return dict(updated_row)
+        return [dict(updated[rec_id]) for rec_id in rec_ids]
         
     finally:
         conn.close()
 
 
+def approve_recommendation(
+    rec_id: str,
+    db_path: str,
+    reviewer_notes: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Approve a recommendation for delivery to user
+    
+    Args:
+        rec_id: Recommendation identifier
+        db_path: Path to SQLite database
+        reviewer_notes: Optional notes from operator
+        
+    Returns:
+        Updated recommendation dictionary
+        
+    Raises:
+        ValueError: If recommendation does not exist
+    """
+    return approve_recommendations([rec_id], db_path, reviewer_notes)[0]
+
+
 def flag_recommendation(
     rec_id: str,
     db_path: str,
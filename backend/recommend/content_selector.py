@@ -8,6 +8,8 @@ Handles single-persona and cross-window (multi-persona) selection strategies.
 import random
 from typing import List, Dict, Any, Optional
 
+from .storage import load_content_catalog
+
 
 def select_educational_content(
     db_path: str,
@@ -27,26 +29,26 @@ def select_educational_content(
     Returns:
         List of content items (dicts with content_id, title, snippet, etc.)
     """
-    from .storage import load_content_catalog
-    
     # Load all content
     catalog = load_content_catalog(db_path)
     
     if not target_personas:
         # Fallback: stable user or error case
-        return _select_stable_content(catalog, count)
-    
-    if len(target_personas) == 1:
+        selected = _select_stable_content(catalog, count)
+    elif len(target_personas) == 1:
         # Single persona - straightforward selection
-        return _select_single_persona_content(catalog, target_personas[0], count)
+        selected = _select_single_persona_content(catalog, target_personas[0], count)
     else:
         # Cross-window: multiple personas
-        return _select_cross_window_content(
+        selected = _select_cross_window_content(
             catalog, 
             target_personas, 
             count,
             prioritize_primary
         )
+    
+    # Catalog entries are shared and read-only; callers attach rationales
+    return [dict(item) for item in selected]
 
 
 def _select_single_persona_content(
@@ -231,10 +233,8 @@ def get_content_by_id(db_path: str, content_id: str) -> Optional[Dict[str, Any]]
         content_id: Content identifier
     
     Returns:
-        Content item dict or None if not found
+        Read-only content item mapping or None if not found
     """
-    from .storage import load_content_catalog
-    
     catalog = load_content_catalog(db_path)
     for item in catalog:
         if item['content_id'] == content_id:
@@ -256,10 +256,8 @@ def get_content_by_persona(
         include_secondary: Include items where persona is in secondary_tags
     
     Returns:
-        List of relevant content items
+        List of relevant content items (read-only mappings)
     """
-    from .storage import load_content_catalog
-    
     catalog = load_content_catalog(db_path)
     
     relevant = []
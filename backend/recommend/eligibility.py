@@ -7,6 +7,8 @@ Rules-based eligibility checking for partner offers with credit score estimation
 from typing import Dict, Any, Tuple, List, Optional
 import sqlite3
 
+from .storage import load_partner_offers
+
 
 def estimate_credit_score(credit_features: Dict[str, Any]) -> int:
     """
@@ -270,8 +272,6 @@ def select_eligible_offers(
     Returns:
         List of eligible offers with eligibility details
     """
-    from .storage import load_partner_offers
-    
     # Load all offers
     all_offers = load_partner_offers(db_path)
     
@@ -312,8 +312,6 @@ def get_eligibility_summary(
     Returns:
         Summary dict with estimated score, eligible offer count, etc.
     """
-    from .storage import load_partner_offers
-    
     # Estimate credit score
     credit_features = features.get('credit', {})
     estimated_score = estimate_credit_score(credit_features)
@@ -7,11 +7,15 @@ Coordinates content selection, LLM generation, eligibility checking, and package
 
 import time
 import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
 
-from .persona_handler import get_persona_context, format_persona_summary
+import pandas as pd
+
+from .persona_handler import get_persona_context, get_persona_context_bulk, format_persona_summary
 from .content_selector import select_educational_content
 from .eligibility import select_eligible_offers
 from .llm_client import LLMClient
@@ -20,7 +24,9 @@ from .prompts import (
     build_actionable_items_prompt,
     build_offer_relevance_prompt,
     extract_persona_specific_metrics,
-    build_cross_window_context
+    extract_all_persona_metrics,
+    build_cross_window_context,
+    format_user_metrics
 )
 from .storage import insert_recommendation
 from .traces import generate_and_store_traces
@@ -48,8 +54,6 @@ def load_user_features(user_id: str, db_path: str) -> Dict[str, Dict[str, Any]]:
     Returns:
         Dictionary with feature types as keys (credit, income, savings, etc.)
     """
-    import pandas as pd
-    
     features = {}
     feature_dir = Path('data/features')
     
@@ -57,9 +61,11 @@ def load_user_features(user_id: str, db_path: str) -> Dict[str, Dict[str, Any]]:
     for feature_type in ['credit', 'income', 'savings', 'subscriptions', 'cash_flow']:
         parquet_path = feature_dir / f'{feature_type}.parquet'
         if parquet_path.exists():
-            df = pd.read_parquet(parquet_path)
             # Get 30-day window features for this user
-            user_df = df[(df['user_id'] == user_id) & (df['window_days'] == 30)]
+            user_df = pd.read_parquet(
+                parquet_path,
+                filters=[('user_id', '==', user_id), ('window_days', '==', 30)]
+            )
             if not user_df.empty:
                 features[feature_type] = user_df.iloc[0].to_dict()
     
@@ -309,14 +315,16 @@ def generate_recommendation(
     action_count = rec_config.get('content_selection', {}).get('actionable_items_max', 3)
     max_offers = rec_config.get('content_selection', {}).get('partner_offers_max', 2)
     
-    from concurrent.futures import ThreadPoolExecutor
+    # Extract prompt metrics once and share them across both LLM calls
+    persona_metrics = extract_all_persona_metrics(features)
     
     def generate_actionable():
         return generate_actionable_items_for_user(
             persona_context,
             features,
             count=action_count,
-            llm_config=llm_config
+            llm_config=llm_config,
+            persona_metrics=persona_metrics
         )
     
     def generate_offers():
@@ -327,7 +335,8 @@ def generate_recommendation(
             persona_context,
             db_path,
             max_offers,
-            llm_config
+            llm_config,
+            persona_metrics=persona_metrics
         )
     
     # Execute both LLM operations in parallel
@@ -393,10 +402,11 @@ def generate_recommendation(
             recommendation=recommendation,
             educational_items=educational_items,
             partner_offers=partner_offers,
-            db_path=db_path
+            db_path=db_path,
+            background=True
         )
         trace_time = time.time() - trace_start
-        print(f"   ✓ Stored {len(trace_ids)} decision traces ({trace_time:.2f}s)")
+        print(f"   ✓ Queued {len(trace_ids)} decision traces ({trace_time:.2f}s)")
     except Exception as e:
         print(f"   ⚠ Trace generation failed: {e}")
     
@@ -455,11 +465,23 @@ def generate_educational_rationales(
     return educational_items
 
 
+def _get_persona_metrics(
+    features: Dict[str, Any],
+    persona_id: int,
+    persona_metrics: Optional[Dict[int, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Look up precomputed persona metrics, extracting them if not available."""
+    if persona_metrics is not None and persona_id in persona_metrics:
+        return persona_metrics[persona_id]
+    return extract_persona_specific_metrics(features, persona_id)
+
+
 def generate_actionable_items_for_user(
     persona_context: Dict[str, Any],
     features: Dict[str, Any],
     count: int,
-    llm_config: Dict[str, Any]
+    llm_config: Dict[str, Any],
+    persona_metrics: Optional[Dict[int, Dict[str, Any]]] = None
 ) -> List[Dict[str, Any]]:
     """
     Generate actionable items using LLM.
@@ -469,6 +491,7 @@ def generate_actionable_items_for_user(
         features: User features
         count: Number of items to generate
         llm_config: LLM configuration
+        persona_metrics: Optional precomputed extract_all_persona_metrics(features)
     
     Returns:
         List of actionable items with text and rationales
@@ -478,7 +501,7 @@ def generate_actionable_items_for_user(
     
     # Extract metrics
     primary_persona_id = persona_context['target_personas'][0]
-    user_context = extract_persona_specific_metrics(features, primary_persona_id)
+    user_context = _get_persona_metrics(features, primary_persona_id, persona_metrics)
     
     # Build prompt
     system_msg, user_prompt = build_actionable_items_prompt(
@@ -515,7 +538,8 @@ def select_and_explain_offers(
     persona_context: Dict[str, Any],
     db_path: str,
     max_offers: int,
-    llm_config: Dict[str, Any]
+    llm_config: Dict[str, Any],
+    persona_metrics: Optional[Dict[int, Dict[str, Any]]] = None
 ) -> List[Dict[str, Any]]:
     """
     Select eligible offers and generate relevance explanations.
@@ -528,6 +552,7 @@ def select_and_explain_offers(
         db_path: Database path
         max_offers: Maximum number of offers
         llm_config: LLM configuration
+        persona_metrics: Optional precomputed extract_all_persona_metrics(features)
     
     Returns:
         List of offers with eligibility details and relevance explanations
@@ -549,7 +574,7 @@ def select_and_explain_offers(
         # Single offer - use original approach
         llm_client = LLMClient(llm_config)
         primary_persona_id = target_personas[0]
-        user_context = extract_persona_specific_metrics(features, primary_persona_id)
+        user_context = _get_persona_metrics(features, primary_persona_id, persona_metrics)
         
         offer = eligible_offers[0]
         system_msg, user_prompt = build_offer_relevance_prompt(
@@ -570,7 +595,7 @@ def select_and_explain_offers(
         # Multiple offers - batch into single call for speed
         llm_client = LLMClient(llm_config)
         primary_persona_id = target_personas[0]
-        user_context = extract_persona_specific_metrics(features, primary_persona_id)
+        user_context = _get_persona_metrics(features, primary_persona_id, persona_metrics)
         
         # Build batch prompt
         offers_text = "\n\n".join([
@@ -583,7 +608,7 @@ def select_and_explain_offers(
         batch_prompt = f"""For each product offer below, write a brief (2-3 sentences) explanation of why it's relevant to this user.
 
 User Profile: {persona_context['primary_persona_name']}
-User Metrics: {json.dumps(user_context, indent=2)}
+User Metrics: {format_user_metrics(user_context)}
 
 Product Offers:
 {offers_text}
@@ -727,8 +752,6 @@ def generate_batch_recommendations(
     Returns:
         Summary dictionary with generation stats
     """
-    import sqlite3
-    
     # Load configuration
     if config is None:
         config = load_config()
@@ -746,6 +769,9 @@ def generate_batch_recommendations(
         user_ids = [row[0] for row in cursor.fetchall()]
         conn.close()
     
+    # Load all persona contexts up front; per-user lookups then hit the cache
+    get_persona_context_bulk(user_ids, db_path)
+    
     print(f"\n{'='*70}")
     print(f"BATCH RECOMMENDATION GENERATION")
     print(f"{'='*70}")
@@ -38,11 +38,11 @@ def generate_recommendation_for_user(
     """
     import json
     from .generator import generate_recommendation
-    from ..guardrails.consent import check_consent, ConsentError
+    from ..guardrails.consent import check_consent_cached, ConsentError
     
     try:
         # Verify user has consented
-        check_consent(user_id, db_path)
+        check_consent_cached(user_id, db_path)
         
         # Load config from file
         with open(config_path, 'r') as f:
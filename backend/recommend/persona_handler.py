@@ -4,14 +4,90 @@ Cross-Window Persona Handler
 Determines target personas when user has different personas across 30d and 180d windows.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
 import sqlite3
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, Sequence, Mapping
+from datetime import datetime
+
+try:
+    from ..storage.database import get_thread_connection
+    from ..personas.metadata import PERSONA_METADATA
+except ImportError:
+    from storage.database import get_thread_connection
+    from personas.metadata import PERSONA_METADATA
+
+
+# Assignment statuses written by the persona assignment step
+STATUS_STABLE = 'STABLE'
+STATUS_ASSIGNED = 'ASSIGNED'
+
+# Target personas are immutable tuples so cached contexts can be shared safely
+STABLE_TARGETS = (0,)  # Pseudo-persona 0 = stable user
+NO_TARGETS = ()
+
+_NO_WEIGHTS: Mapping[int, float] = MappingProxyType({})
+
+# (status_30d, status_180d) -> which window decides the target persona.
+# Pairs not listed (e.g. both ASSIGNED) compare the two personas instead.
+_USE_STABLE, _USE_30D, _USE_180D = 'stable', '30d', '180d'
+_TARGET_RULE_BY_STATUS = {
+    (STATUS_STABLE, STATUS_STABLE): _USE_STABLE,
+    (STATUS_STABLE, STATUS_ASSIGNED): _USE_180D,
+    (STATUS_ASSIGNED, STATUS_STABLE): _USE_30D,
+}
+
+# Persona ID -> display name, including the pseudo-persona 0 for stable users
+_PERSONA_NAME_BY_ID = {
+    0: 'Stable',
+    **{pid: metadata['name'] for pid, metadata in PERSONA_METADATA.items()}
+}
+
+
+# Cache of persona contexts, keyed by (user_id, db_path). Assignments are
+# written by a separate process (scripts/assign_personas.py), so the short
+# TTL is what bounds staleness; in-process writers can call
+# invalidate_persona_cache().
+_context_cache: Dict[Tuple[str, str], Tuple[datetime, Dict[str, Any]]] = {}
+_context_cache_lock = threading.Lock()
+CONTEXT_CACHE_TTL_SECONDS = 60
+CONTEXT_CACHE_MAX_SIZE = 4096
+
+
+# Latest assignment for each window in a single query. Only the columns
+# needed to derive target personas are selected.
+_LATEST_ASSIGNMENTS_SQL = '''
+    SELECT window_days, status, primary_persona_id FROM (
+        SELECT window_days, status, primary_persona_id, ROW_NUMBER() OVER (
+            PARTITION BY window_days ORDER BY computed_at DESC
+        ) AS rn
+        FROM persona_assignments
+        WHERE user_id = ? AND window_days IN (30, 180)
+    )
+    WHERE rn = 1
+'''
+
+# Latest assignment for each (user, window) across a batch of users
+_LATEST_ASSIGNMENTS_BULK_SQL = '''
+    SELECT user_id, window_days, status, primary_persona_id FROM (
+        SELECT user_id, window_days, status, primary_persona_id, ROW_NUMBER() OVER (
+            PARTITION BY user_id, window_days ORDER BY computed_at DESC
+        ) AS rn
+        FROM persona_assignments
+        WHERE user_id IN ({placeholders}) AND window_days IN (30, 180)
+    )
+    WHERE rn = 1
+'''
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds
+BULK_LOAD_CHUNK_SIZE = 500
 
 
 def load_persona_assignments(
     user_id: str,
     db_path: str
-) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+) -> Tuple[Optional[sqlite3.Row], Optional[sqlite3.Row]]:
     """
     Load persona assignments for both 30d and 180d windows.
     
@@ -21,41 +97,65 @@ def load_persona_assignments(
     
     Returns:
         Tuple of (assignments_30d, assignments_180d)
-        Each is a dict or None if not found
+        Each is a read-only sqlite3.Row with window_days, status and
+        primary_persona_id, or None if not found
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    # Load 30d assignment
-    cursor.execute('''
-        SELECT * FROM persona_assignments
-        WHERE user_id = ? AND window_days = 30
-        ORDER BY computed_at DESC
-        LIMIT 1
-    ''', (user_id,))
-    row_30d = cursor.fetchone()
-    assignments_30d = dict(row_30d) if row_30d else None
-    
-    # Load 180d assignment
-    cursor.execute('''
-        SELECT * FROM persona_assignments
-        WHERE user_id = ? AND window_days = 180
-        ORDER BY computed_at DESC
-        LIMIT 1
-    ''', (user_id,))
-    row_180d = cursor.fetchone()
-    assignments_180d = dict(row_180d) if row_180d else None
-    
-    conn.close()
+    # Persistent per-thread connection: the statement is prepared once and
+    # reused from the connection's statement cache
+    conn = get_thread_connection(db_path)
+    rows = conn.execute(_LATEST_ASSIGNMENTS_SQL, (user_id,)).fetchall()
+    
+    assignments_30d = None
+    assignments_180d = None
+    for row in rows:
+        if row['window_days'] == 30:
+            assignments_30d = row
+        else:
+            assignments_180d = row
     
     return assignments_30d, assignments_180d
 
 
+def load_persona_assignments_bulk(
+    user_ids: Sequence[str],
+    db_path: str
+) -> Dict[str, Tuple[Optional[sqlite3.Row], Optional[sqlite3.Row]]]:
+    """
+    Load 30d and 180d persona assignments for many users at once.
+    
+    Issues one query per chunk of 500 users instead of one per user.
+    
+    Args:
+        user_ids: User identifiers
+        db_path: Path to SQLite database
+    
+    Returns:
+        Dict mapping every requested user_id to (assignments_30d, assignments_180d)
+    """
+    results = {user_id: (None, None) for user_id in user_ids}
+    unique_ids = list(results)
+    conn = get_thread_connection(db_path)
+    
+    for start in range(0, len(unique_ids), BULK_LOAD_CHUNK_SIZE):
+        chunk = unique_ids[start:start + BULK_LOAD_CHUNK_SIZE]
+        query = _LATEST_ASSIGNMENTS_BULK_SQL.format(placeholders=','.join('?' * len(chunk)))
+        
+        for row in conn.execute(query, chunk).fetchall():
+            user_id = row['user_id']
+            assignments_30d, assignments_180d = results[user_id]
+            if row['window_days'] == 30:
+                assignments_30d = row
+            else:
+                assignments_180d = row
+            results[user_id] = (assignments_30d, assignments_180d)
+    
+    return results
+
+
 def determine_target_personas(
-    assignments_30d: Optional[Dict[str, Any]],
-    assignments_180d: Optional[Dict[str, Any]]
-) -> List[int]:
+    assignments_30d: Optional[sqlite3.Row],
+    assignments_180d: Optional[sqlite3.Row]
+) -> Tuple[int, ...]:
     """
     Determine which persona(s) to target for recommendations.
     
@@ -63,65 +163,57 @@ def determine_target_personas(
     - If same persona both windows: target single persona
     - If different personas: target both, prioritize 30d (recent behavior)
     - If one STABLE and one ASSIGNED: use the assigned persona
-    - If both STABLE: return [0] for stable content
-    - If missing data: return empty list
+    - If both STABLE: return (0,) for stable content
+    - If missing data: return empty tuple
     
     Args:
-        assignments_30d: 30-day persona assignment dict
-        assignments_180d: 180-day persona assignment dict
+        assignments_30d: 30-day persona assignment (sqlite3.Row or dict)
+        assignments_180d: 180-day persona assignment (sqlite3.Row or dict)
     
     Returns:
-        List of persona IDs ordered by priority [primary, secondary]
+        Tuple of persona IDs ordered by priority (primary, secondary)
     """
-    # Handle missing data
-    if not assignments_30d or not assignments_180d:
-        if assignments_30d:
-            return _extract_personas(assignments_30d)
-        elif assignments_180d:
-            return _extract_personas(assignments_180d)
+    # Read each field exactly once
+    if assignments_30d is not None:
+        status_30d = assignments_30d['status']
+        persona_30d = assignments_30d['primary_persona_id']
+    if assignments_180d is not None:
+        status_180d = assignments_180d['status']
+        persona_180d = assignments_180d['primary_persona_id']
+    
+    # Handle missing data - use whichever window is available
+    if assignments_30d is None or assignments_180d is None:
+        if assignments_30d is not None:
+            status, persona_id = status_30d, persona_30d
+        elif assignments_180d is not None:
+            status, persona_id = status_180d, persona_180d
         else:
-            return []  # No persona data
-    
-    # Check status
-    status_30d = assignments_30d.get('status')
-    status_180d = assignments_180d.get('status')
-    
-    # Both stable
-    if status_30d == 'STABLE' and status_180d == 'STABLE':
-        return [0]  # Stable user
-    
-    # One stable, one assigned
-    if status_30d == 'STABLE' and status_180d == 'ASSIGNED':
-        return _extract_personas(assignments_180d)
-    if status_30d == 'ASSIGNED' and status_180d == 'STABLE':
-        return _extract_personas(assignments_30d)
+            return NO_TARGETS  # No persona data
+        
+        if status == STATUS_STABLE:
+            return STABLE_TARGETS
+        return (persona_id,) if persona_id is not None else NO_TARGETS
+    
+    # Both stable, or one stable and one assigned
+    rule = _TARGET_RULE_BY_STATUS.get((status_30d, status_180d))
+    if rule is _USE_STABLE:
+        return STABLE_TARGETS
+    if rule is _USE_180D:
+        return (persona_180d,) if persona_180d is not None else NO_TARGETS
+    if rule is _USE_30D:
+        return (persona_30d,) if persona_30d is not None else NO_TARGETS
     
     # Both assigned - check if same persona
-    persona_30d = assignments_30d.get('primary_persona_id')
-    persona_180d = assignments_180d.get('primary_persona_id')
-    
     if persona_30d == persona_180d:
         # Same persona both windows - target single persona
-        return [persona_30d] if persona_30d is not None else []
-    else:
-        # Different personas - include both, prioritize 30d (recent behavior)
-        personas = []
-        if persona_30d is not None:
-            personas.append(persona_30d)
-        if persona_180d is not None and persona_180d not in personas:
-            personas.append(persona_180d)
-        return personas
-
-
-def _extract_personas(assignment: Dict[str, Any]) -> List[int]:
-    """Extract persona IDs from assignment (primary only for now)."""
-    if assignment.get('status') == 'STABLE':
-        return [0]
-    
-    persona_id = assignment.get('primary_persona_id')
-    if persona_id is not None:
-        return [persona_id]
-    return []
+        return (persona_30d,) if persona_30d is not None else NO_TARGETS
+    
+    # Different personas - include both, prioritize 30d (recent behavior)
+    if persona_30d is None:
+        return (persona_180d,) if persona_180d is not None else NO_TARGETS
+    if persona_180d is None:
+        return (persona_30d,)
+    return (persona_30d, persona_180d)
 
 
 def get_persona_context(
@@ -131,27 +223,79 @@ def get_persona_context(
     """
     Get full persona context for recommendation generation.
     
+    Contexts are cached for CONTEXT_CACHE_TTL_SECONDS; callers must treat
+    the returned dictionary as read-only. Call invalidate_persona_cache()
+    after writing new persona assignments in this process.
+    
     Args:
         user_id: User identifier
         db_path: Path to SQLite database
     
     Returns:
         Context dictionary with:
-            - target_personas: List[int]
-            - assignments_30d: dict
-            - assignments_180d: dict
+            - target_personas: Tuple[int, ...]
+            - assignments_30d: sqlite3.Row
+            - assignments_180d: sqlite3.Row
             - strategy: str (single_persona, cross_window, stable, missing)
             - persona_names: List[str]
     """
-    from backend.personas.metadata import PERSONA_METADATA
+    key = (user_id, db_path)
+    context = _get_cached_context(key)
+    if context is not None:
+        return context
     
     assignments_30d, assignments_180d = load_persona_assignments(user_id, db_path)
+    context = _build_persona_context(assignments_30d, assignments_180d)
+    _store_cached_context(key, context)
+    
+    return context
+
+
+def get_persona_context_bulk(
+    user_ids: Sequence[str],
+    db_path: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get persona contexts for many users with batched assignment loading.
+    
+    Contexts are also stored in the cache, so a following per-user
+    get_persona_context() call for any of these users is a cache hit.
+    
+    Args:
+        user_ids: User identifiers
+        db_path: Path to SQLite database
+    
+    Returns:
+        Dict mapping user_id to its context (see get_persona_context)
+    """
+    contexts = {}
+    to_load = []
+    for user_id in user_ids:
+        context = _get_cached_context((user_id, db_path))
+        if context is not None:
+            contexts[user_id] = context
+        else:
+            to_load.append(user_id)
+    
+    for user_id, (assignments_30d, assignments_180d) in load_persona_assignments_bulk(to_load, db_path).items():
+        context = _build_persona_context(assignments_30d, assignments_180d)
+        _store_cached_context((user_id, db_path), context)
+        contexts[user_id] = context
+    
+    return contexts
+
+
+def _build_persona_context(
+    assignments_30d: Optional[sqlite3.Row],
+    assignments_180d: Optional[sqlite3.Row]
+) -> Dict[str, Any]:
+    """Derive target personas, strategy and names from loaded assignments."""
     target_personas = determine_target_personas(assignments_30d, assignments_180d)
     
     # Determine strategy
     if not target_personas:
         strategy = 'missing'
-    elif target_personas == [0]:
+    elif target_personas == STABLE_TARGETS:
         strategy = 'stable'
     elif len(target_personas) == 1:
         strategy = 'single_persona'
@@ -159,14 +303,10 @@ def get_persona_context(
         strategy = 'cross_window'
     
     # Get persona names
-    persona_names = []
-    for pid in target_personas:
-        if pid == 0:
-            persona_names.append('Stable')
-        elif pid in PERSONA_METADATA:
-            persona_names.append(PERSONA_METADATA[pid]['name'])
-        else:
-            persona_names.append(f'Unknown-{pid}')
+    persona_names = [
+        _PERSONA_NAME_BY_ID.get(pid) or f'Unknown-{pid}'
+        for pid in target_personas
+    ]
     
     return {
         'target_personas': target_personas,
@@ -178,6 +318,44 @@ def get_persona_context(
     }
 
 
+def _get_cached_context(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    """Return a cached context if present and not expired."""
+    with _context_cache_lock:
+        cached = _context_cache.get(key)
+    if cached is None:
+        return None
+    
+    cached_at, context = cached
+    if (datetime.now() - cached_at).total_seconds() < CONTEXT_CACHE_TTL_SECONDS:
+        return context
+    return None
+
+
+def _store_cached_context(key: Tuple[str, str], context: Dict[str, Any]) -> None:
+    """Cache a context, evicting the oldest entry when full."""
+    with _context_cache_lock:
+        if key not in _context_cache and len(_context_cache) >= CONTEXT_CACHE_MAX_SIZE:
+            # Evict the oldest entry (dicts preserve insertion order)
+            _context_cache.pop(next(iter(_context_cache)), None)
+        _context_cache[key] = (datetime.now(), context)
+
+
+def invalidate_persona_cache(user_id: Optional[str] = None) -> None:
+    """
+    Drop cached persona contexts.
+    
+    Args:
+        user_id: User whose entries should be dropped, or None to clear all
+    """
+    with _context_cache_lock:
+        if user_id is None:
+            _context_cache.clear()
+            return
+        
+        for key in [k for k in _context_cache if k[0] == user_id]:
+            del _context_cache[key]
+
+
 def should_include_cross_window_context(context: Dict[str, Any]) -> bool:
     """
     Determine if recommendation should include cross-window context.
@@ -191,25 +369,30 @@ def should_include_cross_window_context(context: Dict[str, Any]) -> bool:
     return context['strategy'] == 'cross_window'
 
 
-def get_persona_weights(context: Dict[str, Any]) -> Dict[int, float]:
+def get_persona_weights(context: Dict[str, Any]) -> Mapping[int, float]:
     """
     Get weights for each persona for content selection.
     
+    The result is a shared read-only mapping; copy it before modifying.
+    
     Args:
         context: Context from get_persona_context()
     
     Returns:
-        Dict mapping persona_id to weight (0.0-1.0)
+        Mapping of persona_id to weight (0.0-1.0)
     """
-    personas = context['target_personas']
-    strategy = context['strategy']
-    
+    return _persona_weights(context['strategy'], tuple(context['target_personas']))
+
+
+@lru_cache(maxsize=256)
+def _persona_weights(strategy: str, personas: Tuple[int, ...]) -> Mapping[int, float]:
+    """Compute (and memoize) persona weights; inputs come from a small finite set."""
     if not personas:
-        return {}
+        return _NO_WEIGHTS
     
     if strategy == 'single_persona' or strategy == 'stable':
         # Full weight to single persona
-        return {personas[0]: 1.0}
+        return MappingProxyType({personas[0]: 1.0})
     
     elif strategy == 'cross_window':
         # 60/40 split: prioritize recent (30d) over long-term (180d)
@@ -218,10 +401,10 @@ def get_persona_weights(context: Dict[str, Any]) -> Dict[int, float]:
             weights[personas[0]] = 0.6  # Primary (30d)
         if len(personas) >= 2:
             weights[personas[1]] = 0.4  # Secondary (180d)
-        return weights
+        return MappingProxyType(weights)
     
     else:
-        return {}
+        return _NO_WEIGHTS
 
 
 def format_persona_summary(context: Dict[str, Any]) -> str:
@@ -259,29 +442,42 @@ def validate_persona_context(context: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Validation result dict with 'valid' and 'issues' keys
     """
+    strategy = context['strategy']
+    target_personas = context['target_personas']
+    has_assignments = bool(context['assignments_30d'] or context['assignments_180d'])
+    persona_names = context['persona_names']
+    
+    # Fast path: complete context, nothing to collect
+    if strategy != 'missing' and target_personas and has_assignments and persona_names:
+        return {
+            'valid': True,
+            'issues': [],
+            'strategy': strategy,
+            'persona_count': len(target_personas)
+        }
+    
     issues = []
     
     # Check strategy
-    if context['strategy'] == 'missing':
+    if strategy == 'missing':
         issues.append("No persona assignments found")
     
     # Check target personas
-    if not context['target_personas']:
+    if not target_personas:
         issues.append("No target personas identified")
     
     # Check assignments
-    if context['strategy'] != 'missing':
-        if not context['assignments_30d'] and not context['assignments_180d']:
-            issues.append("No assignment data available")
+    if strategy != 'missing' and not has_assignments:
+        issues.append("No assignment data available")
     
     # Check persona names
-    if context['target_personas'] and not context['persona_names']:
+    if target_personas and not persona_names:
         issues.append("Persona names not resolved")
     
     return {
         'valid': len(issues) == 0,
         'issues': issues,
-        'strategy': context['strategy'],
-        'persona_count': len(context['target_personas'])
+        'strategy': strategy,
+        'persona_count': len(target_personas)
     }
 
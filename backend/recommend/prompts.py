@@ -6,7 +6,99 @@ and partner offer relevance explanations.
 """
 
 import json
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+
+# System messages are constant, so build them once at import time
+_SYS_RATIONALE = """You are a financial education assistant. Generate clear, empowering rationales for why recommended content is relevant to users.
+
+Guidelines:
+- Use empowering, non-judgmental language
+- Cite specific user data (percentages, amounts, counts)
+- Focus on opportunities and benefits, not problems
+- Keep under 100 words
+- Avoid words like "overspending", "bad", "poor"
+- Use phrases like "we noticed", "you could", "this might help"
+- Never use "you should" - instead say "you might consider"
+"""
+
+_SYS_ACTIONS = """You are a financial education assistant. Generate specific, actionable next steps that users can take.
+
+Guidelines:
+- Make actions SPECIFIC and MEASURABLE (e.g., "Pay $150 toward...", not "Pay more")
+- Cite actual user data in rationales
+- Focus on small, achievable steps
+- Use empowering language
+- Each action should be under 50 words
+- Never use "you should" - say "you might consider", "you could", etc.
+- Return ONLY valid JSON, no other text
+
+Output format:
+[
+  {
+    "text": "Specific action the user can take",
+    "rationale": "Why this action helps, citing specific user data"
+  }
+]
+"""
+
+_SYS_OFFER = """You are a financial education assistant. Explain why financial products might be relevant to users based on their situation.
+
+Guidelines:
+- Keep under 80 words
+- Cite specific user data
+- Focus on how the product addresses their situation
+- Use empowering language
+- Say "might help", "could", never "should"
+- Don't oversell - be realistic about benefits
+"""
+
+
+def _dumps_indented(obj: Any) -> str:
+    """Serialize to 2-space indented JSON, using orjson when available."""
+    if orjson is not None:
+        try:
+            # OPT_SERIALIZE_NUMPY covers numpy scalars from parquet-loaded features
+            return orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2)
+
+
+@lru_cache(maxsize=512)
+def _dumps_metrics(items: tuple) -> str:
+    return _dumps_indented({key: value for key, _, value in items})
+
+
+def format_user_metrics(user_context: Dict[str, Any]) -> str:
+    """
+    Pretty-print user metrics for inclusion in a prompt.
+    
+    The same metrics are embedded in several prompts per recommendation,
+    so the serialized form is cached. Value types are part of the cache
+    key so that e.g. False and 0 render differently.
+    
+    Args:
+        user_context: Dictionary with user-specific metrics
+    
+    Returns:
+        Indented JSON string
+    """
+    try:
+        return _dumps_metrics(tuple(
+            (key, type(value), value) for key, value in user_context.items()
+        ))
+    except TypeError:
+        # Unhashable values (e.g. nested cross-window context)
+        return _dumps_indented(user_context)
 
 
 def build_rationale_prompt(
@@ -27,24 +119,14 @@ def build_rationale_prompt(
     Returns:
         Tuple of (system_message, user_prompt)
     """
-    system_message = """You are a financial education assistant. Generate clear, empowering rationales for why recommended content is relevant to users.
-
-Guidelines:
-- Use empowering, non-judgmental language
-- Cite specific user data (percentages, amounts, counts)
-- Focus on opportunities and benefits, not problems
-- Keep under 100 words
-- Avoid words like "overspending", "bad", "poor"
-- Use phrases like "we noticed", "you could", "this might help"
-- Never use "you should" - instead say "you might consider"
-"""
+    system_message = _SYS_RATIONALE
     
     user_prompt = f"""Generate a rationale for why this content is relevant to the user.
 
 User Persona: {persona_name}
 
 User Metrics:
-{json.dumps(user_context, indent=2)}
+{format_user_metrics(user_context)}
 
 Recommended Content:
 Title: "{content_title}"
@@ -63,7 +145,7 @@ Rationale:"""
 def build_actionable_items_prompt(
     user_context: Dict[str, Any],
     persona_name: str,
-    personas_list: list[int],
+    personas_list: Sequence[int],
     count: int = 2
 ) -> tuple[str, str]:
     """
@@ -78,25 +160,7 @@ def build_actionable_items_prompt(
     Returns:
         Tuple of (system_message, user_prompt)
     """
-    system_message = """You are a financial education assistant. Generate specific, actionable next steps that users can take.
-
-Guidelines:
-- Make actions SPECIFIC and MEASURABLE (e.g., "Pay $150 toward...", not "Pay more")
-- Cite actual user data in rationales
-- Focus on small, achievable steps
-- Use empowering language
-- Each action should be under 50 words
-- Never use "you should" - say "you might consider", "you could", etc.
-- Return ONLY valid JSON, no other text
-
-Output format:
-[
-  {
-    "text": "Specific action the user can take",
-    "rationale": "Why this action helps, citing specific user data"
-  }
-]
-"""
+    system_message = _SYS_ACTIONS
     
     personas_context = ""
     if len(personas_list) > 1:
@@ -105,10 +169,10 @@ Output format:
     user_prompt = f"""Generate {count} specific, actionable next steps for this user.
 
 User Persona: {persona_name}
-Target Personas: {personas_list}{personas_context}
+Target Personas: {list(personas_list)}{personas_context}
 
 User Metrics:
-{json.dumps(user_context, indent=2)}
+{format_user_metrics(user_context)}
 
 Requirements for each action:
 1. Must be specific and measurable (include actual numbers when possible)
@@ -141,16 +205,7 @@ def build_offer_relevance_prompt(
     Returns:
         Tuple of (system_message, user_prompt)
     """
-    system_message = """You are a financial education assistant. Explain why financial products might be relevant to users based on their situation.
-
-Guidelines:
-- Keep under 80 words
-- Cite specific user data
-- Focus on how the product addresses their situation
-- Use empowering language
-- Say "might help", "could", never "should"
-- Don't oversell - be realistic about benefits
-"""
+    system_message = _SYS_OFFER
     
     benefits_text = "\n".join([f"- {b}" for b in offer_benefits])
     
@@ -159,7 +214,7 @@ Guidelines:
 User Persona: {persona_name}
 
 User Metrics:
-{json.dumps(user_context, indent=2)}
+{format_user_metrics(user_context)}
 
 Product:
 Name: {offer_name}
@@ -175,6 +230,46 @@ Explanation:"""
     return system_message, user_prompt
 
 
+# Persona ID -> (persona name, ((feature group, metric, default), ...))
+_PERSONA_METRIC_SPEC = {
+    # High Utilization - focus on credit metrics
+    1: ('High Utilization', (
+        ('credit', 'max_utilization', 0),
+        ('credit', 'avg_utilization', 0),
+        ('credit', 'interest_charges_present', False),
+        ('credit', 'minimum_payment_only', False),
+        ('credit', 'is_overdue', False),
+    )),
+    # Variable Income - focus on income and buffer metrics
+    2: ('Variable Income Budgeter', (
+        ('income', 'median_pay_gap_days', 0),
+        ('income', 'cash_flow_buffer_months', 0),
+        ('income', 'payroll_count', 0),
+        ('income', 'avg_monthly_expenses', 0),
+    )),
+    # Subscription-Heavy - focus on subscription metrics
+    3: ('Subscription-Heavy', (
+        ('subscriptions', 'recurring_merchant_count', 0),
+        ('subscriptions', 'monthly_recurring_spend', 0),
+        ('subscriptions', 'subscription_share', 0),
+    )),
+    # Savings Builder - focus on savings metrics
+    4: ('Savings Builder', (
+        ('savings', 'net_inflow', 0),
+        ('savings', 'growth_rate', 0),
+        ('savings', 'emergency_fund_coverage_months', 0),
+        ('credit', 'max_utilization', 0),
+    )),
+    # Cash Flow Stressed - focus on cash flow metrics
+    5: ('Cash Flow Stressed', (
+        ('cash_flow', 'pct_days_below_100', 0),
+        ('cash_flow', 'balance_volatility', 0),
+        ('cash_flow', 'min_balance', 0),
+        ('cash_flow', 'avg_balance', 0),
+    )),
+}
+
+
 def extract_persona_specific_metrics(
     features: Dict[str, Any],
     persona_id: int
@@ -189,72 +284,44 @@ def extract_persona_specific_metrics(
     Returns:
         Dictionary with persona-specific metrics
     """
-    if persona_id == 1:
-        # High Utilization - focus on credit metrics
-        credit = features.get('credit', {})
-        return {
-            'persona': 'High Utilization',
-            'max_utilization': credit.get('max_utilization', 0),
-            'avg_utilization': credit.get('avg_utilization', 0),
-            'interest_charges_present': credit.get('interest_charges_present', False),
-            'minimum_payment_only': credit.get('minimum_payment_only', False),
-            'is_overdue': credit.get('is_overdue', False)
-        }
-    
-    elif persona_id == 2:
-        # Variable Income - focus on income and buffer metrics
-        income = features.get('income', {})
-        return {
-            'persona': 'Variable Income Budgeter',
-            'median_pay_gap_days': income.get('median_pay_gap_days', 0),
-            'cash_flow_buffer_months': income.get('cash_flow_buffer_months', 0),
-            'payroll_count': income.get('payroll_count', 0),
-            'avg_monthly_expenses': income.get('avg_monthly_expenses', 0)
-        }
+    spec = _PERSONA_METRIC_SPEC.get(persona_id)
+    if spec is None:
+        # Stable or unknown
+        return {'persona': 'Stable'}
     
-    elif persona_id == 3:
-        # Subscription-Heavy - focus on subscription metrics
-        subs = features.get('subscriptions', {})
-        return {
-            'persona': 'Subscription-Heavy',
-            'recurring_merchant_count': subs.get('recurring_merchant_count', 0),
-            'monthly_recurring_spend': subs.get('monthly_recurring_spend', 0),
-            'subscription_share': subs.get('subscription_share', 0)
-        }
+    persona_name, fields = spec
+    metrics = {'persona': persona_name}
+    for group, metric, default in fields:
+        metrics[metric] = features.get(group, {}).get(metric, default)
+    return metrics
+
+
+def extract_all_persona_metrics(features: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+    """
+    Extract prompt metrics for every persona from one features dictionary.
     
-    elif persona_id == 4:
-        # Savings Builder - focus on savings metrics
-        savings = features.get('savings', {})
-        credit = features.get('credit', {})
-        return {
-            'persona': 'Savings Builder',
-            'net_inflow': savings.get('net_inflow', 0),
-            'growth_rate': savings.get('growth_rate', 0),
-            'emergency_fund_coverage_months': savings.get('emergency_fund_coverage_months', 0),
-            'max_utilization': credit.get('max_utilization', 0)
-        }
+    Call once per user (and window) and index the result instead of
+    re-walking the same features for each prompt.
     
-    elif persona_id == 5:
-        # Cash Flow Stressed - focus on cash flow metrics
-        cash_flow = features.get('cash_flow', {})
-        return {
-            'persona': 'Cash Flow Stressed',
-            'pct_days_below_100': cash_flow.get('pct_days_below_100', 0),
-            'balance_volatility': cash_flow.get('balance_volatility', 0),
-            'min_balance': cash_flow.get('min_balance', 0),
-            'avg_balance': cash_flow.get('avg_balance', 0)
-        }
+    Args:
+        features: Full features dictionary for user
     
-    else:
-        # Stable or unknown
-        return {'persona': 'Stable'}
+    Returns:
+        Dictionary mapping persona ID (1-5) to its persona-specific metrics
+    """
+    return {
+        persona_id: extract_persona_specific_metrics(features, persona_id)
+        for persona_id in _PERSONA_METRIC_SPEC
+    }
 
 
 def build_cross_window_context(
     features_30d: Dict[str, Any],
     features_180d: Dict[str, Any],
     persona_30d_id: int,
-    persona_180d_id: int
+    persona_180d_id: int,
+    metrics_30d: Optional[Dict[int, Dict[str, Any]]] = None,
+    metrics_180d: Optional[Dict[int, Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """
     Build combined context when user has different personas across windows.
@@ -264,12 +331,20 @@ def build_cross_window_context(
         features_180d: Features for 180-day window
         persona_30d_id: 30-day persona ID
         persona_180d_id: 180-day persona ID
+        metrics_30d: Optional precomputed extract_all_persona_metrics(features_30d)
+        metrics_180d: Optional precomputed extract_all_persona_metrics(features_180d)
     
     Returns:
         Combined context dictionary with both persona metrics
     """
-    context_30d = extract_persona_specific_metrics(features_30d, persona_30d_id)
-    context_180d = extract_persona_specific_metrics(features_180d, persona_180d_id)
+    if metrics_30d is not None and persona_30d_id in metrics_30d:
+        context_30d = metrics_30d[persona_30d_id]
+    else:
+        context_30d = extract_persona_specific_metrics(features_30d, persona_30d_id)
+    if metrics_180d is not None and persona_180d_id in metrics_180d:
+        context_180d = metrics_180d[persona_180d_id]
+    else:
+        context_180d = extract_persona_specific_metrics(features_180d, persona_180d_id)
     
     return {
         'recent_30d': context_30d,
@@ -5,13 +5,60 @@ Handles SQLite and Parquet storage for recommendations, content catalog,
 partner offers, and generic templates.
 """
 
+import os
 import sqlite3
-import pandas as pd
+from functools import lru_cache
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import json
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from types import MappingProxyType
+from typing import List, Dict, Optional, Any, Tuple, Mapping
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from ..storage.database import apply_performance_pragmas, get_thread_connection, read_connection
+except ImportError:
+    from storage.database import apply_performance_pragmas, get_thread_connection, read_connection
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to compact JSON text, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
+def _json_loads(text: Any) -> Any:
+    """Parse JSON text, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# Typed schema for the analytics export (target_personas as a Parquet LIST)
+RECOMMENDATIONS_PARQUET_SCHEMA = pa.schema([
+    ('user_id', pa.string()),
+    ('recommendation_id', pa.string()),
+    ('generated_at', pa.timestamp('us')),
+    ('window_30d_persona_id', pa.int32()),
+    ('window_180d_persona_id', pa.int32()),
+    ('target_personas', pa.list_(pa.int32())),
+    ('educational_item_count', pa.int32()),
+    ('actionable_item_count', pa.int32()),
+    ('partner_offer_count', pa.int32()),
+    ('generation_latency_seconds', pa.float64()),
+    ('llm_model', pa.string()),
+])
 
 def create_recommendation_tables(db_path: str):
     """
@@ -21,6 +68,12 @@ def create_recommendation_tables(db_path: str):
         db_path: Path to SQLite database
     """
     conn = sqlite3.connect(db_path)
+    
+    # Switch the file to WAL up front; journal_mode persists, so every later
+    # connection from the recommendation write path inherits it
+    if db_path != ':memory:':
+        apply_performance_pragmas(conn)
+    
     cursor = conn.cursor()
     
     # 1. Recommendations table (parent record per user)
@@ -133,11 +186,15 @@ def create_recommendation_tables(db_path: str):
     ''')
     
     # Create indexes for efficient querying
+    # Serves load_recommendation's latest-per-user lookup without a sort
     cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_recommendations_user 
-        ON recommendations(user_id)
+        CREATE INDEX IF NOT EXISTS idx_recommendations_user_time 
+        ON recommendations(user_id, generated_at DESC)
     ''')
     
+    # Superseded by idx_recommendations_user_time (same leading column)
+    cursor.execute('DROP INDEX IF EXISTS idx_recommendations_user')
+    
     cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_rec_items_rec_id 
         ON recommendation_items(recommendation_id)
@@ -169,6 +226,85 @@ def create_recommendation_tables(db_path: str):
     print(f"✓ Created recommendation tables in {db_path}")
 
 
+# recommendation_items columns written for each item type
+_EDUCATIONAL_ITEM_COLUMNS = (
+    'item_id', 'recommendation_id', 'item_type', 'item_order',
+    'content_id', 'content_title', 'content_snippet', 'rationale'
+)
+_ACTIONABLE_ITEM_COLUMNS = (
+    'item_id', 'recommendation_id', 'item_type', 'item_order',
+    'action_text', 'action_rationale', 'data_cited', 'generated_by'
+)
+_OFFER_ITEM_COLUMNS = (
+    'item_id', 'recommendation_id', 'item_type', 'item_order',
+    'offer_id', 'offer_title', 'offer_description',
+    'eligibility_passed', 'eligibility_details', 'why_relevant'
+)
+
+# Hot statements are module constants so each call reuses the prepared
+# statement from the (persistent) connection's statement cache
+_INSERT_RECOMMENDATION_SQL = '''
+    INSERT INTO recommendations (
+        recommendation_id, user_id, window_30d_persona_id, window_180d_persona_id,
+        target_personas, user_snapshot, generated_at, llm_model, generation_latency_seconds,
+        educational_item_count, actionable_item_count, partner_offer_count
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (recommendation_id) DO NOTHING
+    RETURNING recommendation_id
+'''
+
+_SELECT_LATEST_RECOMMENDATION_SQL = '''
+    SELECT * FROM recommendations
+    WHERE user_id = ? AND status != 'DELETED'
+    ORDER BY generated_at DESC
+    LIMIT 1
+'''
+
+_SELECT_RECOMMENDATION_ITEMS_SQL = '''
+    SELECT * FROM recommendation_items
+    WHERE recommendation_id = ?
+    ORDER BY item_order
+'''
+
+_SELECT_GENERIC_TEMPLATE_SQL = '''
+    SELECT * FROM generic_templates
+    WHERE persona_id = ?
+'''
+
+_UPSERT_CONTENT_ITEM_SQL = '''
+    INSERT OR REPLACE INTO content_catalog (
+        content_id, title, content_type, snippet,
+        persona_tags, secondary_tags, topics,
+        estimated_read_time_minutes, difficulty, content_source
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_UPSERT_PARTNER_OFFER_SQL = '''
+    INSERT OR REPLACE INTO partner_offers (
+        offer_id, product_type, product_name, short_description,
+        persona_relevance, eligibility_rules, benefits, disclaimer
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_UPSERT_GENERIC_TEMPLATE_SQL = '''
+    INSERT OR REPLACE INTO generic_templates (
+        template_id, persona_id, persona_name, status, template_content
+    ) VALUES (?, ?, ?, ?, ?)
+'''
+
+
+_ITEM_INSERT_SQL = {
+    columns: f"INSERT INTO recommendation_items ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    for columns in (_EDUCATIONAL_ITEM_COLUMNS, _ACTIONABLE_ITEM_COLUMNS, _OFFER_ITEM_COLUMNS)
+}
+
+
+def _insert_item_rows(cursor: sqlite3.Cursor, columns: tuple, rows: List[tuple]) -> None:
+    """Insert recommendation_items rows (tuples ordered as columns)."""
+    if rows:
+        cursor.executemany(_ITEM_INSERT_SQL[columns], rows)
+
+
 def insert_recommendation(
     db_path: str,
     recommendation_id: str,
@@ -200,24 +336,68 @@ def insert_recommendation(
         llm_model: LLM model used for generation
         generation_latency_seconds: Time taken to generate
     """
-    conn = sqlite3.connect(db_path)
+    # Item IDs are "<recommendation_id>_<type>_<order>"
+    edu_prefix = f"{recommendation_id}_edu_"
+    act_prefix = f"{recommendation_id}_act_"
+    offer_prefix = f"{recommendation_id}_offer_"
+    
+    educational_rows = [
+        (
+            edu_prefix + str(idx),
+            recommendation_id,
+            'educational',
+            idx,
+            item.get('content_id'),
+            item.get('title'),
+            item.get('snippet'),
+            item.get('rationale')
+        )
+        for idx, item in enumerate(educational_items)
+    ]
+    actionable_rows = [
+        (
+            act_prefix + str(idx),
+            recommendation_id,
+            'actionable',
+            idx,
+            item.get('text'),
+            item.get('rationale'),
+            _json_dumps(item.get('data_cited', {})),
+            item.get('generated_by', 'llm')
+        )
+        for idx, item in enumerate(actionable_items)
+    ]
+    offer_rows = [
+        (
+            offer_prefix + str(idx),
+            recommendation_id,
+            'partner_offer',
+            idx,
+            offer.get('offer_id'),
+            offer.get('product_name'),
+            offer.get('description'),
+            offer.get('eligibility_passed'),
+            _json_dumps(offer.get('eligibility_details', {})),
+            offer.get('why_relevant')
+        )
+        for idx, offer in enumerate(partner_offers)
+    ]
+    
+    conn = get_thread_connection(db_path)
     cursor = conn.cursor()
     
     try:
+        # Parent record and all items are written in one transaction
+        conn.execute("BEGIN IMMEDIATE")
+        
         # Insert parent recommendation record
-        cursor.execute('''
-            INSERT INTO recommendations (
-                recommendation_id, user_id, window_30d_persona_id, window_180d_persona_id,
-                target_personas, user_snapshot, generated_at, llm_model, generation_latency_seconds,
-                educational_item_count, actionable_item_count, partner_offer_count
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        cursor.execute(_INSERT_RECOMMENDATION_SQL, (
             recommendation_id,
             user_id,
             window_30d_persona_id,
             window_180d_persona_id,
-            json.dumps(target_personas),
-            json.dumps(user_snapshot),
+            _json_dumps(target_personas),
+            _json_dumps(user_snapshot),
             datetime.now().isoformat(),
             llm_model,
             generation_latency_seconds,
@@ -226,77 +406,47 @@ def insert_recommendation(
             len(partner_offers)
         ))
         
-        # Insert educational items
-        for idx, item in enumerate(educational_items):
-            item_id = f"{recommendation_id}_edu_{idx}"
-            cursor.execute('''
-                INSERT INTO recommendation_items (
-                    item_id, recommendation_id, item_type, item_order,
-                    content_id, content_title, content_snippet, rationale
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                item_id,
-                recommendation_id,
-                'educational',
-                idx,
-                item.get('content_id'),
-                item.get('title'),
-                item.get('snippet'),
-                item.get('rationale')
-            ))
-        
-        # Insert actionable items
-        for idx, item in enumerate(actionable_items):
-            item_id = f"{recommendation_id}_act_{idx}"
-            cursor.execute('''
-                INSERT INTO recommendation_items (
-                    item_id, recommendation_id, item_type, item_order,
-                    action_text, action_rationale, data_cited, generated_by
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                item_id,
-                recommendation_id,
-                'actionable',
-                idx,
-                item.get('text'),
-                item.get('rationale'),
-                json.dumps(item.get('data_cited', {})),
-                item.get('generated_by', 'llm')
-            ))
+        # No row returned means the recommendation already exists
+        if cursor.fetchone() is None:
+            print(f"Warning: Recommendation {recommendation_id} already exists, skipping")
+            conn.rollback()
+            return
         
-        # Insert partner offers
-        for idx, offer in enumerate(partner_offers):
-            item_id = f"{recommendation_id}_offer_{idx}"
-            cursor.execute('''
-                INSERT INTO recommendation_items (
-                    item_id, recommendation_id, item_type, item_order,
-                    offer_id, offer_title, offer_description,
-                    eligibility_passed, eligibility_details, why_relevant
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                item_id,
-                recommendation_id,
-                'partner_offer',
-                idx,
-                offer.get('offer_id'),
-                offer.get('product_name'),
-                offer.get('description'),
-                offer.get('eligibility_passed'),
-                json.dumps(offer.get('eligibility_details', {})),
-                offer.get('why_relevant')
-            ))
+        _insert_item_rows(cursor, _EDUCATIONAL_ITEM_COLUMNS, educational_rows)
+        _insert_item_rows(cursor, _ACTIONABLE_ITEM_COLUMNS, actionable_rows)
+        _insert_item_rows(cursor, _OFFER_ITEM_COLUMNS, offer_rows)
         
         conn.commit()
         
-    except sqlite3.IntegrityError as e:
-        print(f"Warning: Recommendation {recommendation_id} already exists, skipping")
-        conn.rollback()
     except Exception as e:
         print(f"Error inserting recommendation: {e}")
         conn.rollback()
         raise
-    finally:
-        conn.close()
+
+
+# item_type -> (recommendation key, row -> API item dict)
+_ITEM_BUCKETS = {
+    'educational': ('educational_content', lambda row: {
+        'content_id': row['content_id'],
+        'title': row['content_title'],
+        'snippet': row['content_snippet'],
+        'rationale': row['rationale']
+    }),
+    'actionable': ('actionable_items', lambda row: {
+        'text': row['action_text'],
+        'rationale': row['action_rationale'],
+        'data_cited': _json_loads(row['data_cited']) if row['data_cited'] else {},
+        'generated_by': row['generated_by']
+    }),
+    'partner_offer': ('partner_offers', lambda row: {
+        'offer_id': row['offer_id'],
+        'product_name': row['offer_title'],
+        'description': row['offer_description'],
+        'eligibility_passed': bool(row['eligibility_passed']),
+        'eligibility_details': _json_loads(row['eligibility_details']) if row['eligibility_details'] else {},
+        'why_relevant': row['why_relevant']
+    }),
+}
 
 
 def load_recommendation(db_path: str, user_id: str) -> Optional[Dict[str, Any]]:
@@ -310,157 +460,160 @@ def load_recommendation(db_path: str, user_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary containing recommendation data, or None if not found
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    try:
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        
         # Load parent recommendation (exclude DELETED)
-        cursor.execute('''
-            SELECT * FROM recommendations
-            WHERE user_id = ? AND status != 'DELETED'
-            ORDER BY generated_at DESC
-            LIMIT 1
-        ''', (user_id,))
+        cursor.execute(_SELECT_LATEST_RECOMMENDATION_SQL, (user_id,))
         
         rec_row = cursor.fetchone()
         if not rec_row:
             return None
         
-        recommendation = dict(rec_row)
-        recommendation['target_personas'] = json.loads(recommendation['target_personas'])
-        
         # Load recommendation items
-        cursor.execute('''
-            SELECT * FROM recommendation_items
-            WHERE recommendation_id = ?
-            ORDER BY item_order
-        ''', (recommendation['recommendation_id'],))
-        
-        items = [dict(row) for row in cursor.fetchall()]
-        
-        # Organize items by type
-        recommendation['educational_content'] = []
-        recommendation['actionable_items'] = []
-        recommendation['partner_offers'] = []
-        
-        for item in items:
-            if item['item_type'] == 'educational':
-                recommendation['educational_content'].append({
-                    'content_id': item['content_id'],
-                    'title': item['content_title'],
-                    'snippet': item['content_snippet'],
-                    'rationale': item['rationale']
-                })
-            elif item['item_type'] == 'actionable':
-                recommendation['actionable_items'].append({
-                    'text': item['action_text'],
-                    'rationale': item['action_rationale'],
-                    'data_cited': json.loads(item['data_cited']) if item['data_cited'] else {},
-                    'generated_by': item['generated_by']
-                })
-            elif item['item_type'] == 'partner_offer':
-                recommendation['partner_offers'].append({
-                    'offer_id': item['offer_id'],
-                    'product_name': item['offer_title'],
-                    'description': item['offer_description'],
-                    'eligibility_passed': bool(item['eligibility_passed']),
-                    'eligibility_details': json.loads(item['eligibility_details']) if item['eligibility_details'] else {},
-                    'why_relevant': item['why_relevant']
-                })
-        
-        return recommendation
-        
-    finally:
-        conn.close()
+        cursor.execute(_SELECT_RECOMMENDATION_ITEMS_SQL, (rec_row['recommendation_id'],))
+        item_rows = cursor.fetchall()
+    
+    recommendation = dict(rec_row)
+    recommendation['target_personas'] = _json_loads(recommendation['target_personas'])
+    
+    # Organize items by type
+    buckets = {item_type: [] for item_type in _ITEM_BUCKETS}
+    for row in item_rows:
+        bucket = buckets.get(row['item_type'])
+        if bucket is not None:
+            bucket.append(_ITEM_BUCKETS[row['item_type']][1](row))
+    
+    for item_type, (key, _) in _ITEM_BUCKETS.items():
+        recommendation[key] = buckets[item_type]
+    
+    return recommendation
 
 
-def load_content_catalog(db_path: str) -> List[Dict[str, Any]]:
+def _db_file_id(db_path: str) -> Optional[int]:
     """
-    Load all educational content from catalog.
-    
-    Args:
-        db_path: Path to SQLite database
-    
-    Returns:
-        List of content items
+    Identity (inode) of a database file, so cached catalog data is dropped
+    when the file is replaced by a regeneration run. Catalog writes in this
+    module clear the caches directly (see clear_catalog_caches).
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT * FROM content_catalog')
-    rows = cursor.fetchall()
+    try:
+        return os.stat(db_path).st_ino
+    except OSError:
+        return None
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert decoded JSON to read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=32)
+def _load_content_catalog_cached(db_path: str, file_id: Optional[int]) -> Tuple[Mapping[str, Any], ...]:
+    """Decode the content catalog once per database file."""
+    with read_connection(db_path) as conn:
+        rows = conn.execute('SELECT * FROM content_catalog').fetchall()
     
     catalog = []
     for row in rows:
         item = dict(row)
-        item['persona_tags'] = json.loads(item['persona_tags']) if item['persona_tags'] else []
-        item['secondary_tags'] = json.loads(item['secondary_tags']) if item['secondary_tags'] else []
-        item['topics'] = json.loads(item['topics']) if item['topics'] else []
-        catalog.append(item)
+        item['persona_tags'] = _json_loads(item['persona_tags']) if item['persona_tags'] else []
+        item['secondary_tags'] = _json_loads(item['secondary_tags']) if item['secondary_tags'] else []
+        item['topics'] = _json_loads(item['topics']) if item['topics'] else []
+        catalog.append(_freeze(item))
     
-    conn.close()
-    return catalog
+    return tuple(catalog)
+
+
+@lru_cache(maxsize=32)
+def _load_partner_offers_cached(db_path: str, file_id: Optional[int]) -> Tuple[Mapping[str, Any], ...]:
+    """Decode the partner offers once per database file."""
+    with read_connection(db_path) as conn:
+        rows = conn.execute('SELECT * FROM partner_offers').fetchall()
+    
+    offers = []
+    for row in rows:
+        offer = dict(row)
+        offer['persona_relevance'] = _json_loads(offer['persona_relevance']) if offer['persona_relevance'] else []
+        offer['eligibility_rules'] = _json_loads(offer['eligibility_rules']) if offer['eligibility_rules'] else {}
+        offer['benefits'] = _json_loads(offer['benefits']) if offer['benefits'] else []
+        offers.append(_freeze(offer))
+    
+    return tuple(offers)
+
+
+@lru_cache(maxsize=64)
+def _load_generic_template_cached(db_path: str, persona_id: int, file_id: Optional[int]) -> Optional[Mapping[str, Any]]:
+    """Decode a generic template once per database file."""
+    with read_connection(db_path) as conn:
+        row = conn.execute(_SELECT_GENERIC_TEMPLATE_SQL, (persona_id,)).fetchone()
+    
+    if row:
+        template = dict(row)
+        template['template_content'] = _json_loads(template['template_content'])
+        return _freeze(template)
+    return None
+
+
+def clear_catalog_caches() -> None:
+    """Drop cached content catalog, partner offers and generic templates."""
+    _load_content_catalog_cached.cache_clear()
+    _load_partner_offers_cached.cache_clear()
+    _load_generic_template_cached.cache_clear()
 
 
-def load_partner_offers(db_path: str) -> List[Dict[str, Any]]:
+def load_content_catalog(db_path: str) -> Tuple[Mapping[str, Any], ...]:
     """
-    Load all partner offers from catalog.
+    Load all educational content from catalog.
+    
+    Results are cached until the catalog is reloaded or the database file
+    is replaced. Items are shared read-only mappings (list fields become
+    tuples); copy an item with dict(item) before modifying it.
     
     Args:
         db_path: Path to SQLite database
     
     Returns:
-        List of partner offers
+        Tuple of content items
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    return _load_content_catalog_cached(db_path, _db_file_id(db_path))
+
+
+def load_partner_offers(db_path: str) -> Tuple[Mapping[str, Any], ...]:
+    """
+    Load all partner offers from catalog.
     
-    cursor.execute('SELECT * FROM partner_offers')
-    rows = cursor.fetchall()
+    Results are cached until the catalog is reloaded or the database file
+    is replaced. Offers are shared read-only mappings; copy an offer with
+    dict(offer) before modifying it.
     
-    offers = []
-    for row in rows:
-        offer = dict(row)
-        offer['persona_relevance'] = json.loads(offer['persona_relevance']) if offer['persona_relevance'] else []
-        offer['eligibility_rules'] = json.loads(offer['eligibility_rules']) if offer['eligibility_rules'] else {}
-        offer['benefits'] = json.loads(offer['benefits']) if offer['benefits'] else []
-        offers.append(offer)
+    Args:
+        db_path: Path to SQLite database
     
-    conn.close()
-    return offers
+    Returns:
+        Tuple of partner offers
+    """
+    return _load_partner_offers_cached(db_path, _db_file_id(db_path))
 
 
-def load_generic_template(db_path: str, persona_id: int) -> Optional[Dict[str, Any]]:
+def load_generic_template(db_path: str, persona_id: int) -> Optional[Mapping[str, Any]]:
     """
     Load generic template for a persona.
     
+    Results are cached until the templates are reloaded or the database
+    file is replaced, and returned as a read-only mapping.
+    
     Args:
         db_path: Path to SQLite database
         persona_id: Persona identifier (1-5, or 0 for stable)
     
     Returns:
-        Template dictionary or None
+        Template mapping or None
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT * FROM generic_templates
-        WHERE persona_id = ?
-    ''', (persona_id,))
-    
-    row = cursor.fetchone()
-    conn.close()
-    
-    if row:
-        template = dict(row)
-        template['template_content'] = json.loads(template['template_content'])
-        return template
-    return None
+    return _load_generic_template_cached(db_path, persona_id, _db_file_id(db_path))
 
 
 def export_recommendations_to_parquet(db_path: str, output_path: str):
@@ -471,35 +624,48 @@ def export_recommendations_to_parquet(db_path: str, output_path: str):
         db_path: Path to SQLite database
         output_path: Path to output Parquet file
     """
-    conn = sqlite3.connect(db_path)
-    
     # Load all recommendations (exclude DELETED)
-    df = pd.read_sql_query('''
-        SELECT 
-            user_id,
-            recommendation_id,
-            generated_at,
-            window_30d_persona_id,
-            window_180d_persona_id,
-            target_personas AS target_personas_json,
-            educational_item_count,
-            actionable_item_count,
-            partner_offer_count,
-            generation_latency_seconds,
-            llm_model
-        FROM recommendations
-        WHERE status != 'DELETED'
-        ORDER BY generated_at
-    ''', conn)
-    
-    conn.close()
+    with read_connection(db_path) as conn:
+        rows = conn.execute('''
+            SELECT 
+                user_id,
+                recommendation_id,
+                generated_at,
+                window_30d_persona_id,
+                window_180d_persona_id,
+                target_personas,
+                educational_item_count,
+                actionable_item_count,
+                partner_offer_count,
+                generation_latency_seconds,
+                llm_model
+            FROM recommendations
+            WHERE status != 'DELETED'
+            ORDER BY generated_at
+        ''').fetchall()
+    
+    # Build the Arrow columns straight from the rows (no pandas round-trip)
+    columns = dict(zip(RECOMMENDATIONS_PARQUET_SCHEMA.names, zip(*rows))) if rows else {}
+    arrays = []
+    for field in RECOMMENDATIONS_PARQUET_SCHEMA:
+        values = columns.get(field.name, ())
+        if field.name == 'target_personas':
+            # Decode JSON so Parquet stores a typed list column
+            values = [_json_loads(value) if value else [] for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        elif field.name == 'generated_at':
+            arrays.append(pc.cast(pa.array(values, type=pa.string()), field.type))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    
+    table = pa.Table.from_arrays(arrays, schema=RECOMMENDATIONS_PARQUET_SCHEMA)
     
     # Ensure output directory exists
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     
     # Write to Parquet
-    df.to_parquet(output_path, index=False)
-    print(f"✓ Exported {len(df)} recommendations to {output_path}")
+    pq.write_table(table, output_path, compression='zstd', use_dictionary=True, row_group_size=64_000)
+    print(f"✓ Exported {table.num_rows} recommendations to {output_path}")
 
 
 def insert_content_catalog_item(db_path: str, content_item: Dict[str, Any]):
@@ -510,30 +676,23 @@ def insert_content_catalog_item(db_path: str, content_item: Dict[str, Any]):
         db_path: Path to SQLite database
         content_item: Content item dictionary
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT OR REPLACE INTO content_catalog (
-            content_id, title, content_type, snippet,
-            persona_tags, secondary_tags, topics,
-            estimated_read_time_minutes, difficulty, content_source
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        content_item['content_id'],
-        content_item['title'],
-        content_item['content_type'],
-        content_item.get('snippet', ''),
-        json.dumps(content_item.get('persona_tags', [])),
-        json.dumps(content_item.get('secondary_tags', [])),
-        json.dumps(content_item.get('topics', [])),
-        content_item.get('estimated_read_time_minutes', 5),
-        content_item.get('difficulty', 'beginner'),
-        content_item.get('content_source', 'internal')
-    ))
+    conn = get_thread_connection(db_path)
+    
+    with conn:
+        conn.execute(_UPSERT_CONTENT_ITEM_SQL, (
+            content_item['content_id'],
+            content_item['title'],
+            content_item['content_type'],
+            content_item.get('snippet', ''),
+            _json_dumps(content_item.get('persona_tags', [])),
+            _json_dumps(content_item.get('secondary_tags', [])),
+            _json_dumps(content_item.get('topics', [])),
+            content_item.get('estimated_read_time_minutes', 5),
+            content_item.get('difficulty', 'beginner'),
+            content_item.get('content_source', 'internal')
+        ))
     
-    conn.commit()
-    conn.close()
+    clear_catalog_caches()
 
 
 def insert_partner_offer(db_path: str, offer: Dict[str, Any]):
@@ -544,27 +703,21 @@ def insert_partner_offer(db_path: str, offer: Dict[str, Any]):
         db_path: Path to SQLite database
         offer: Partner offer dictionary
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT OR REPLACE INTO partner_offers (
-            offer_id, product_type, product_name, short_description,
-            persona_relevance, eligibility_rules, benefits, disclaimer
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        offer['offer_id'],
-        offer['product_type'],
-        offer['product_name'],
-        offer['short_description'],
-        json.dumps(offer.get('persona_relevance', [])),
-        json.dumps(offer.get('eligibility_rules', {})),
-        json.dumps(offer.get('benefits', [])),
-        offer.get('disclaimer', 'This is educational content, not financial advice.')
-    ))
+    conn = get_thread_connection(db_path)
+    
+    with conn:
+        conn.execute(_UPSERT_PARTNER_OFFER_SQL, (
+            offer['offer_id'],
+            offer['product_type'],
+            offer['product_name'],
+            offer['short_description'],
+            _json_dumps(offer.get('persona_relevance', [])),
+            _json_dumps(offer.get('eligibility_rules', {})),
+            _json_dumps(offer.get('benefits', [])),
+            offer.get('disclaimer', 'This is educational content, not financial advice.')
+        ))
     
-    conn.commit()
-    conn.close()
+    clear_catalog_caches()
 
 
 def insert_generic_template(db_path: str, template: Dict[str, Any]):
@@ -575,21 +728,15 @@ def insert_generic_template(db_path: str, template: Dict[str, Any]):
         db_path: Path to SQLite database
         template: Template dictionary
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT OR REPLACE INTO generic_templates (
-            template_id, persona_id, persona_name, status, template_content
-        ) VALUES (?, ?, ?, ?, ?)
-    ''', (
-        template['template_id'],
-        template['persona_id'],
-        template['persona_name'],
-        template.get('status', 'PRE_APPROVED'),
-        json.dumps(template['template_content'])
-    ))
+    conn = get_thread_connection(db_path)
+    
+    with conn:
+        conn.execute(_UPSERT_GENERIC_TEMPLATE_SQL, (
+            template['template_id'],
+            template['persona_id'],
+            template['persona_name'],
+            template.get('status', 'PRE_APPROVED'),
+            _json_dumps(template['template_content'])
+        ))
     
-    conn.commit()
-    conn.close()
-
+    clear_catalog_caches()
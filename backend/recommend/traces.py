@@ -4,21 +4,168 @@ Decision Trace Generation
 Generate explanatory traces for why recommendations were made
 """
 
-import sqlite3
+import hashlib
 import json
-from typing import Dict, Any, List, Optional
+import sqlite3
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 import uuid
 import logging
-import sys
-import os
+import atexit
+import itertools
+import queue
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
 
-# Add backend to path to import personas module
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from personas.metadata import get_persona_name
+try:
+    from ..storage.database import get_thread_connection, read_connection
+    from ..personas.metadata import PERSONA_METADATA
+except ImportError:
+    from storage.database import get_thread_connection, read_connection
+    from personas.metadata import PERSONA_METADATA
 
 logger = logging.getLogger(__name__)
 
+# Persona ID -> display name, built once from the static metadata
+_PERSONA_NAMES = {persona_id: info['name'] for persona_id, info in PERSONA_METADATA.items()}
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to compact JSON text, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
+def _json_loads(text: Any) -> Any:
+    """Parse JSON text, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# Hot statements are module constants so each call reuses the prepared
+# statement from the (persistent) connection's statement cache
+_INSERT_TRACE_SQL = """
+    INSERT INTO decision_traces (
+        trace_id,
+        user_id,
+        recommendation_id,
+        trace_type,
+        trace_content,
+        created_at,
+        content_hash
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, trace_type, content_hash)
+    DO UPDATE SET created_at = excluded.created_at
+"""
+
+# Rewriting an identical trace keeps its original row (and trace_id) but
+# moves it to the new created_at, so it becomes the latest trace again.
+# RETURNING yields the stored trace_id for both new and existing rows.
+_INSERT_TRACE_RETURNING_ID_SQL = _INSERT_TRACE_SQL + "    RETURNING trace_id\n"
+
+# Served by idx_persona_user_window_time (user_id, window_days, computed_at DESC),
+# see ensure_persona_assignments_indexes in backend/storage/migrations.py
+_SELECT_LATEST_ASSIGNMENTS_SQL = """
+    SELECT * FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY window_days ORDER BY computed_at DESC
+        ) AS rn
+        FROM persona_assignments
+        WHERE user_id = ? AND window_days IN (30, 180)
+    )
+    WHERE rn = 1
+    ORDER BY window_days
+"""
+
+# Background trace writer: generate_and_store_traces(background=True) queues
+# (db_path, rows) requests here and a daemon thread writes them with executemany
+WRITER_BATCH_ROWS = 128
+_WRITE_Q: "queue.Queue" = queue.Queue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+# Traces stored in one batch share a created_at; the time-ordered trace_id
+# breaks those ties so newest-first reads stay deterministic
+_SELECT_USER_TRACES_SQL = """
+    SELECT * FROM decision_traces
+    WHERE user_id = ?
+    ORDER BY created_at DESC, trace_id DESC
+"""
+
+# Newest persona_assignment trace per window, filtered in SQL so unrelated
+# traces are never fetched or parsed (uses idx_traces_user_window_recent)
+_SELECT_LATEST_PERSONA_TRACES_SQL = """
+    SELECT window_days, trace_content FROM (
+        SELECT
+            json_extract(trace_content, '$.window_days') AS window_days,
+            trace_content,
+            ROW_NUMBER() OVER (
+                PARTITION BY json_extract(trace_content, '$.window_days')
+                ORDER BY created_at DESC, trace_id DESC
+            ) AS rn
+        FROM decision_traces
+        WHERE user_id = ? AND trace_type = 'persona_assignment'
+            AND json_extract(trace_content, '$.window_days') IN (30, 180)
+    )
+    WHERE rn = 1
+"""
+
+_SELECT_RECOMMENDATION_TRACES_SQL = """
+    SELECT * FROM decision_traces
+    WHERE user_id = ? AND recommendation_id = ?
+    ORDER BY created_at DESC, trace_id DESC
+"""
+
+_SELECT_USER_TRACES_OF_TYPE_SQL = """
+    SELECT * FROM decision_traces
+    WHERE user_id = ? AND trace_type = ?
+    ORDER BY created_at DESC, trace_id DESC
+"""
+
+_SELECT_RECOMMENDATION_TRACES_OF_TYPE_SQL = """
+    SELECT * FROM decision_traces
+    WHERE user_id = ? AND recommendation_id = ? AND trace_type = ?
+    ORDER BY created_at DESC, trace_id DESC
+"""
+
+
+# Criterion -> human-readable threshold, built once at import
+_THRESHOLD_MAP = {
+    # Persona 1: High Utilization
+    'max_utilization': 'Utilization ≥50%',
+    'interest_charges': 'Interest charges present',
+    'minimum_payment_only': 'Minimum payment only',
+    'is_overdue': 'Overdue payment',
+    
+    # Persona 2: Variable Income
+    'median_pay_gap_days': 'Pay gap >45 days',
+    'cash_flow_buffer_months': 'Cash flow buffer <1 month',
+    
+    # Persona 3: Subscription-Heavy
+    'recurring_merchant_count': 'Recurring merchants ≥3',
+    'monthly_recurring_spend': 'Monthly recurring spend ≥$50',
+    'subscription_share': 'Subscription share ≥10%',
+    
+    # Persona 4: Savings Builder
+    'growth_rate': 'Savings growth ≥2%',
+    'net_inflow': 'Net savings inflow ≥$200/month',
+    'net_inflow_monthly': 'Net savings inflow ≥$200/month',
+    'max_utilization_ok': 'All cards <30% utilization',
+    
+    # Persona 5: Cash Flow Stressed
+    'pct_days_below_100': 'Days below $100 ≥30%',
+    'balance_volatility': 'Balance volatility >1.0',
+}
+
 
 def _format_persona_list(persona_ids: List[int]) -> str:
     """
@@ -33,15 +180,7 @@ def _format_persona_list(persona_ids: List[int]) -> str:
     if not persona_ids:
         return "None"
     
-    names = []
-    for pid in persona_ids:
-        name = get_persona_name(pid)
-        if name:
-            names.append(name)
-        else:
-            names.append(f"Unknown ({pid})")
-    
-    return ", ".join(names)
+    return ", ".join(_PERSONA_NAMES.get(pid) or f"Unknown ({pid})" for pid in persona_ids)
 
 
 def get_threshold_for_criterion(criterion: str, criteria_values: dict = None) -> str:
@@ -55,34 +194,49 @@ def get_threshold_for_criterion(criterion: str, criteria_values: dict = None) ->
     Returns:
         Human-readable threshold description
     """
-    threshold_map = {
-        # Persona 1: High Utilization
-        'max_utilization': 'Utilization ≥50%',
-        'interest_charges': 'Interest charges present',
-        'minimum_payment_only': 'Minimum payment only',
-        'is_overdue': 'Overdue payment',
-        
-        # Persona 2: Variable Income
-        'median_pay_gap_days': 'Pay gap >45 days',
-        'cash_flow_buffer_months': 'Cash flow buffer <1 month',
-        
-        # Persona 3: Subscription-Heavy
-        'recurring_merchant_count': 'Recurring merchants ≥3',
-        'monthly_recurring_spend': 'Monthly recurring spend ≥$50',
-        'subscription_share': 'Subscription share ≥10%',
-        
-        # Persona 4: Savings Builder
-        'growth_rate': 'Savings growth ≥2%',
-        'net_inflow': 'Net savings inflow ≥$200/month',
-        'net_inflow_monthly': 'Net savings inflow ≥$200/month',
-        'max_utilization_ok': 'All cards <30% utilization',
-        
-        # Persona 5: Cash Flow Stressed
-        'pct_days_below_100': 'Days below $100 ≥30%',
-        'balance_volatility': 'Balance volatility >1.0',
-    }
-    
-    return threshold_map.get(criterion, criterion.replace('_', ' ').title())
+    return _THRESHOLD_MAP.get(criterion) or criterion.replace('_', ' ').title()
+
+
+def _format_actual_value(value: Any) -> str:
+    """Default display format for a cited feature value"""
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    return str(value)
+
+
+def _format_ratio_as_percent(value: Any) -> str:
+    """Show ratios between 0 and 1 as percentages"""
+    if isinstance(value, float) and 0 < value < 1:
+        return f"{value*100:.1f}%"
+    return _format_actual_value(value)
+
+
+def _format_dollars(value: Any) -> str:
+    """Show float amounts as dollars"""
+    if isinstance(value, float):
+        return f"${value:.2f}"
+    return _format_actual_value(value)
+
+
+def _format_service_count(value: Any) -> str:
+    """Show integer merchant counts as a number of services"""
+    if isinstance(value, int):
+        return f"{int(value)} services"
+    return _format_actual_value(value)
+
+
+# Criterion -> formatter for its actual value, resolved once at import;
+# criteria not listed use _format_actual_value
+_ACTUAL_VALUE_FORMATTERS = {
+    'growth_rate': _format_ratio_as_percent,
+    'subscription_share': _format_ratio_as_percent,
+    'max_utilization': _format_ratio_as_percent,
+    'monthly_recurring_spend': _format_dollars,
+    'net_inflow_monthly': _format_dollars,
+    'recurring_merchant_count': _format_service_count,
+}
 
 
 def generate_persona_trace(
@@ -118,7 +272,7 @@ def generate_persona_trace(
     # Parse assignment trace if available
     if 'assignment_trace' in persona_assignment and persona_assignment['assignment_trace']:
         try:
-            assignment_trace = json.loads(persona_assignment['assignment_trace'])
+            assignment_trace = _json_loads(persona_assignment['assignment_trace'])
             
             # New structure: parse evaluations to extract criteria_met
             evaluations = assignment_trace.get('evaluations', {})
@@ -161,20 +315,8 @@ def generate_persona_trace(
                 
                 # Format actual value nicely
                 if actual_value is not None:
-                    if isinstance(actual_value, float):
-                        # Check if it's a percentage (between 0 and 1)
-                        if 0 < actual_value < 1 and criterion in ['growth_rate', 'subscription_share', 'max_utilization']:
-                            actual_str = f"{actual_value*100:.1f}%"
-                        elif criterion in ['monthly_recurring_spend', 'net_inflow_monthly']:
-                            actual_str = f"${actual_value:.2f}"
-                        else:
-                            actual_str = f"{actual_value:.1f}"
-                    elif isinstance(actual_value, (int, float)) and criterion == 'recurring_merchant_count':
-                        actual_str = f"{int(actual_value)} services"
-                    elif isinstance(actual_value, bool):
-                        actual_str = "Yes" if actual_value else "No"
-                    else:
-                        actual_str = str(actual_value)
+                    formatter = _ACTUAL_VALUE_FORMATTERS.get(criterion, _format_actual_value)
+                    actual_str = formatter(actual_value)
                 else:
                     actual_str = "Met"
                 
@@ -197,6 +339,18 @@ def generate_persona_trace(
     return trace
 
 
+def _parse_eligibility_details(details: Any) -> Dict[str, Any]:
+    """Return an offer's eligibility details as a dict (decoding stored JSON)"""
+    if not details:
+        return {}
+    if isinstance(details, str):
+        try:
+            return _json_loads(details)
+        except json.JSONDecodeError:
+            return {}
+    return details
+
+
 def generate_content_selection_trace(
     recommendation: Dict[str, Any],
     educational_items: List[Dict[str, Any]],
@@ -223,39 +377,64 @@ def generate_content_selection_trace(
     
     # Educational item selection reasons
     target_personas = recommendation.get('target_personas', [])
-    persona_names = _format_persona_list(target_personas)
+    selected_reason = f"Primary relevance to persona(s): {_format_persona_list(target_personas)}"
     
-    for item in educational_items:
-        trace['educational_items'].append({
+    trace['educational_items'] = [
+        {
             'content_id': item.get('content_id'),
             'title': item.get('title'),
-            'selected_reason': f"Primary relevance to persona(s): {persona_names}",
+            'selected_reason': selected_reason,
             'persona_tags': item.get('persona_tags', [])
-        })
+        }
+        for item in educational_items
+    ]
     
     # Partner offer selection reasons
-    for offer in partner_offers:
-        eligibility_details = {}
-        if offer.get('eligibility_details'):
-            try:
-                eligibility_details = json.loads(offer['eligibility_details']) if isinstance(offer['eligibility_details'], str) else offer['eligibility_details']
-            except json.JSONDecodeError:
-                pass
-        
-        trace['partner_offers'].append({
+    trace['partner_offers'] = [
+        {
             'offer_id': offer.get('offer_id'),
             'title': offer.get('offer_title'),
             'selected_reason': "Eligible based on credit score and utilization checks",
             'eligibility_passed': offer.get('eligibility_passed', False),
-            'eligibility_details': eligibility_details
-        })
+            'eligibility_details': _parse_eligibility_details(offer.get('eligibility_details'))
+        }
+        for offer in partner_offers
+    ]
     
     return trace
 
 
+# Trace IDs sort in creation order (microsecond clock, then a per-process
+# tag and sequence) so inserts append to the right edge of the primary key
+# index instead of landing at random pages like uuid4 keys
+_TRACE_PROCESS_TAG = uuid.uuid4().hex[:4]
+_trace_seq = itertools.count()
+
+
+def _next_trace_id() -> str:
+    """Return a new, time-ordered trace ID"""
+    seq = next(_trace_seq) & 0xffff
+    return f"trace_{time.time_ns() // 1000:013x}{_TRACE_PROCESS_TAG}{seq:04x}"
+
+
+def _build_trace_row(trace: Dict[str, Any], created_at: str) -> tuple:
+    """Build a decision_traces row (ordered as _INSERT_TRACE_SQL) for a trace"""
+    payload = _json_dumps(trace)
+    return (
+        _next_trace_id(),
+        trace['user_id'],
+        trace.get('recommendation_id'),
+        trace['trace_type'],
+        payload,
+        created_at,
+        hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    )
+
+
 def store_trace(
     trace: Dict[str, Any],
-    db_path: str
+    db_path: str,
+    conn: Optional[sqlite3.Connection] = None
 ) -> str:
     """
     Store a decision trace in the database
@@ -263,49 +442,186 @@ def store_trace(
     Args:
         trace: Trace dictionary
         db_path: Path to SQLite database
+        conn: Optional caller-owned connection (see store_traces)
         
     Returns:
         Trace ID
     """
-    trace_id = f"trace_{uuid.uuid4().hex[:12]}"
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    return store_traces([trace], db_path, conn=conn)[0]
+
+
+def store_traces(
+    traces: List[Dict[str, Any]],
+    db_path: str,
+    conn: Optional[sqlite3.Connection] = None
+) -> List[str]:
+    """
+    Store several decision traces in a single transaction
     
-    try:
-        cursor.execute("""
-            INSERT INTO decision_traces (
-                trace_id,
-                user_id,
-                recommendation_id,
-                trace_type,
-                trace_content,
-                created_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            trace_id,
-            trace['user_id'],
-            trace.get('recommendation_id'),
-            trace['trace_type'],
-            json.dumps(trace),
-            datetime.now().isoformat()
-        ))
+    Args:
+        traces: List of trace dictionaries
+        db_path: Path to SQLite database
+        conn: Optional caller-owned connection. The rows join the caller's
+            open transaction and are not committed here.
         
-        conn.commit()
-        logger.debug(f"Stored trace {trace_id} for user {trace['user_id']}")
+    Returns:
+        List of trace IDs, in the same order as traces. A trace identical to
+        one already stored is not written again; the stored trace is moved to
+        the new timestamp and its existing ID is returned.
+    """
+    # One timestamp for the whole batch; the traces are written together
+    created_at = datetime.now().isoformat()
+    rows = [_build_trace_row(trace, created_at) for trace in traces]
+    
+    if conn is None:
+        conn = get_thread_connection(db_path)
+        with conn:
+            trace_ids = _insert_trace_rows(conn, rows)
+    else:
+        trace_ids = _insert_trace_rows(conn, rows)
+    
+    for trace_id, row in zip(trace_ids, rows):
+        logger.debug(f"Stored trace {trace_id} for user {row[1]}")
+    
+    return trace_ids
+
+
+def _insert_trace_rows(conn: sqlite3.Connection, rows: List[tuple]) -> List[str]:
+    """Insert trace rows, refreshing duplicates, and return the stored IDs"""
+    return [
+        conn.execute(_INSERT_TRACE_RETURNING_ID_SQL, row).fetchone()[0]
+        for row in rows
+    ]
+
+
+def _write_rows_individually(conn: sqlite3.Connection, rows: List[tuple]) -> int:
+    """Write rows one transaction each, logging and skipping rejected rows"""
+    written = 0
+    for row in rows:
+        try:
+            with conn:
+                conn.execute(_INSERT_TRACE_SQL, row)
+            written += 1
+        except sqlite3.IntegrityError as e:
+            logger.error(f"Background writer dropped trace {row[0]} for user {row[1]}: {e}")
+    return written
+
+
+def _write_pending(pending: List[tuple]) -> None:
+    """Write queued (db_path, rows) requests, one transaction per request"""
+    for db_path, rows in pending:
+        try:
+            conn = get_thread_connection(db_path)
+            try:
+                with conn:
+                    conn.executemany(_INSERT_TRACE_SQL, rows)
+                written = len(rows)
+            except sqlite3.IntegrityError:
+                # One bad row (e.g. a deleted user) must not cost the rest
+                written = _write_rows_individually(conn, rows)
+            logger.debug(f"Background writer stored {written} of {len(rows)} traces")
+        except Exception as e:
+            logger.error(f"Background trace write failed ({len(rows)} traces): {e}")
+
+
+def _writer_loop() -> None:
+    """Drain the write queue, collecting up to WRITER_BATCH_ROWS rows per pass"""
+    while True:
+        pending = [_WRITE_Q.get()]
+        row_count = len(pending[0][1])
+        while row_count < WRITER_BATCH_ROWS:
+            try:
+                item = _WRITE_Q.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(item)
+            row_count += len(item[1])
         
-        return trace_id
+        try:
+            _write_pending(pending)
+        finally:
+            for _ in pending:
+                _WRITE_Q.task_done()
+
+
+def _ensure_writer() -> None:
+    """Start the background writer thread on first use"""
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(
+                target=_writer_loop, name="trace-writer", daemon=True
+            )
+            _writer_thread.start()
+
+
+def enqueue_traces(
+    traces: List[Dict[str, Any]],
+    db_path: str
+) -> List[str]:
+    """
+    Queue decision traces for the background writer
+    
+    Trace IDs are assigned up front and returned immediately; the rows are
+    written shortly after. Call flush_traces() (or pass flush=True to the
+    readers) before reading them back.
+    A trace that duplicates a stored one only refreshes the stored row's
+    timestamp, so its returned ID is never written.
+    
+    Args:
+        traces: List of trace dictionaries
+        db_path: Path to SQLite database
         
-    finally:
-        conn.close()
+    Returns:
+        List of trace IDs, in the same order as traces
+    """
+    created_at = datetime.now().isoformat()
+    rows = [_build_trace_row(trace, created_at) for trace in traces]
+    
+    _ensure_writer()
+    _WRITE_Q.put((db_path, rows))
+    
+    return [row[0] for row in rows]
 
 
-def generate_and_store_traces(
+def flush_traces() -> None:
+    """Block until every queued trace has been written"""
+    if _writer_thread is not None:
+        _WRITE_Q.join()
+
+
+# Don't lose queued traces when a script exits right after generating
+atexit.register(flush_traces)
+
+
+def _build_recommendation_traces(
     user_id: str,
+    assignment_rows: List[sqlite3.Row],
     recommendation: Dict[str, Any],
     educational_items: List[Dict[str, Any]],
     partner_offers: List[Dict[str, Any]],
     db_path: str
+) -> List[Dict[str, Any]]:
+    """Build the persona assignment traces, then the content selection trace"""
+    traces = [
+        generate_persona_trace(user_id, row['window_days'], dict(row), db_path)
+        for row in assignment_rows
+    ]
+    
+    content_trace = generate_content_selection_trace(recommendation, educational_items, partner_offers)
+    content_trace['user_id'] = user_id
+    traces.append(content_trace)
+    
+    return traces
+
+
+def generate_and_store_traces(
+    user_id: str,
+    recommendation: Dict[str, Any],
+    educational_items: List[Dict[str, Any]],
+    partner_offers: List[Dict[str, Any]],
+    db_path: str,
+    background: bool = False
 ) -> List[str]:
     """
     Generate and store all traces for a recommendation
@@ -318,51 +634,111 @@ def generate_and_store_traces(
         educational_items: List of educational content items
         partner_offers: List of partner offers
         db_path: Path to SQLite database
+        background: Queue the traces for the background writer instead of
+            writing them before returning
         
     Returns:
         List of trace IDs
     """
-    trace_ids = []
+    if background:
+        # Latest persona assignment per window (30d and 180d) in one query
+        with read_connection(db_path) as conn:
+            rows = conn.execute(_SELECT_LATEST_ASSIGNMENTS_SQL, (user_id,)).fetchall()
+        trace_ids = enqueue_traces(
+            _build_recommendation_traces(user_id, rows, recommendation, educational_items, partner_offers, db_path),
+            db_path
+        )
+    else:
+        # Read the assignments and write their traces in one transaction, so
+        # the traces match the assignments as of the commit
+        conn = get_thread_connection(db_path)
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(_SELECT_LATEST_ASSIGNMENTS_SQL, (user_id,)).fetchall()
+            trace_ids = store_traces(
+                _build_recommendation_traces(user_id, rows, recommendation, educational_items, partner_offers, db_path),
+                db_path,
+                conn=conn
+            )
+    
+    logger.info(f"Generated {len(trace_ids)} traces for user {user_id}")
+    return trace_ids
+
+
+def _select_traces(
+    conn: sqlite3.Connection,
+    user_id: str,
+    recommendation_id: Optional[str],
+    trace_type: Optional[str] = None
+) -> sqlite3.Cursor:
+    """
+    Execute the trace query for a user, optionally narrowed by recommendation/type
     
-    # Get persona assignments for trace generation
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    The returned cursor yields plain dicts rather than sqlite3.Row objects.
+    """
+    if recommendation_id and trace_type:
+        cursor = conn.execute(_SELECT_RECOMMENDATION_TRACES_OF_TYPE_SQL, (user_id, recommendation_id, trace_type))
+    elif recommendation_id:
+        cursor = conn.execute(_SELECT_RECOMMENDATION_TRACES_SQL, (user_id, recommendation_id))
+    elif trace_type:
+        cursor = conn.execute(_SELECT_USER_TRACES_OF_TYPE_SQL, (user_id, trace_type))
+    else:
+        cursor = conn.execute(_SELECT_USER_TRACES_SQL, (user_id,))
     
+    # Column names resolved once per query; only this cursor is affected,
+    # the pooled connection keeps its sqlite3.Row factory
+    names = [column[0] for column in cursor.description]
+    cursor.row_factory = lambda _cursor, row: dict(zip(names, row))
+    return cursor
+
+
+def _trace_from_row(trace_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse trace_content of a decision_traces row dict (in place)"""
+    # Parse trace_content JSON
     try:
-        # Generate persona assignment traces (30d and 180d)
-        for window_days in [30, 180]:
-            cursor.execute("""
-                SELECT * FROM persona_assignments
-                WHERE user_id = ? AND window_days = ?
-                ORDER BY computed_at DESC
-                LIMIT 1
-            """, (user_id, window_days))
-            
-            row = cursor.fetchone()
-            if row:
-                persona_assignment = dict(row)
-                persona_trace = generate_persona_trace(user_id, window_days, persona_assignment, db_path)
-                trace_id = store_trace(persona_trace, db_path)
-                trace_ids.append(trace_id)
-        
-        # Generate content selection trace
-        content_trace = generate_content_selection_trace(recommendation, educational_items, partner_offers)
-        content_trace['user_id'] = user_id
-        trace_id = store_trace(content_trace, db_path)
-        trace_ids.append(trace_id)
-        
-        logger.info(f"Generated {len(trace_ids)} traces for user {user_id}")
-        return trace_ids
+        trace_dict['trace_content'] = _json_loads(trace_dict['trace_content'])
+    except json.JSONDecodeError:
+        logger.warning(f"Could not parse trace_content for trace {trace_dict['trace_id']}")
+    return trace_dict
+
+
+def iter_traces(
+    user_id: str,
+    db_path: str,
+    recommendation_id: Optional[str] = None,
+    trace_type: Optional[str] = None,
+    flush: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over a user's decision traces, newest first
+    
+    Rows are parsed one at a time as the caller consumes them, so callers
+    that stop early don't pay to fetch and decode the rest.
+    
+    Args:
+        user_id: User identifier
+        db_path: Path to SQLite database
+        recommendation_id: Optional filter by recommendation
+        trace_type: Optional filter by trace type (e.g. 'persona_assignment')
+        flush: Wait for queued background writes first (see flush_traces)
         
-    finally:
-        conn.close()
+    Yields:
+        Trace dictionaries
+    """
+    if flush:
+        flush_traces()
+    
+    with read_connection(db_path) as conn:
+        for row in _select_traces(conn, user_id, recommendation_id, trace_type):
+            yield _trace_from_row(row)
 
 
 def get_traces(
     user_id: str,
     db_path: str,
-    recommendation_id: Optional[str] = None
+    recommendation_id: Optional[str] = None,
+    trace_type: Optional[str] = None,
+    flush: bool = False
 ) -> List[Dict[str, Any]]:
     """
     Get all decision traces for a user
@@ -371,49 +747,27 @@ def get_traces(
         user_id: User identifier
         db_path: Path to SQLite database
         recommendation_id: Optional filter by recommendation
+        trace_type: Optional filter by trace type (e.g. 'persona_assignment')
+        flush: Wait for queued background writes first (see flush_traces)
         
     Returns:
         List of trace dictionaries
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    if flush:
+        flush_traces()
     
-    try:
-        if recommendation_id:
-            cursor.execute("""
-                SELECT * FROM decision_traces
-                WHERE user_id = ? AND recommendation_id = ?
-                ORDER BY created_at DESC
-            """, (user_id, recommendation_id))
-        else:
-            cursor.execute("""
-                SELECT * FROM decision_traces
-                WHERE user_id = ?
-                ORDER BY created_at DESC
-            """, (user_id,))
-        
-        rows = cursor.fetchall()
-        
-        traces = []
-        for row in rows:
-            trace_dict = dict(row)
-            # Parse trace_content JSON
-            try:
-                trace_dict['trace_content'] = json.loads(trace_dict['trace_content'])
-            except json.JSONDecodeError:
-                logger.warning(f"Could not parse trace_content for trace {trace_dict['trace_id']}")
-            
-            traces.append(trace_dict)
-        
-        logger.debug(f"Retrieved {len(traces)} traces for user {user_id}")
-        return traces
-        
-    finally:
-        conn.close()
+    # Fetch everything first so the read connection goes back to the pool
+    # before any JSON is parsed
+    with read_connection(db_path) as conn:
+        rows = _select_traces(conn, user_id, recommendation_id, trace_type).fetchall()
+    
+    traces = [_trace_from_row(row) for row in rows]
+    
+    logger.debug(f"Retrieved {len(traces)} traces for user {user_id}")
+    return traces
 
 
-def get_latest_persona_traces(user_id: str, db_path: str) -> Dict[str, Any]:
+def get_latest_persona_traces(user_id: str, db_path: str, flush: bool = False) -> Dict[str, Any]:
     """
     Get the latest persona assignment traces (30d and 180d)
     
@@ -422,27 +776,21 @@ def get_latest_persona_traces(user_id: str, db_path: str) -> Dict[str, Any]:
     Args:
         user_id: User identifier
         db_path: Path to SQLite database
+        flush: Wait for queued background writes first (see flush_traces)
         
     Returns:
         Dictionary with 30d and 180d persona traces
     """
-    traces = get_traces(user_id, db_path)
+    if flush:
+        flush_traces()
     
-    persona_traces_30d = None
-    persona_traces_180d = None
+    with read_connection(db_path) as conn:
+        rows = conn.execute(_SELECT_LATEST_PERSONA_TRACES_SQL, (user_id,)).fetchall()
     
-    for trace in traces:
-        if trace['trace_type'] == 'persona_assignment':
-            trace_content = trace['trace_content']
-            window_days = trace_content.get('window_days')
-            
-            if window_days == 30 and persona_traces_30d is None:
-                persona_traces_30d = trace_content
-            elif window_days == 180 and persona_traces_180d is None:
-                persona_traces_180d = trace_content
+    latest = {row['window_days']: _json_loads(row['trace_content']) for row in rows}
     
     return {
-        'window_30d': persona_traces_30d,
-        'window_180d': persona_traces_180d
+        'window_30d': latest.get(30),
+        'window_180d': latest.get(180)
     }
 
@@ -5,11 +5,33 @@ Handles SQLite database setup and connection management
 
 import sqlite3
 import os
+import atexit
+import queue
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from contextlib import contextmanager
 
 
+# Per-thread persistent connections, keyed by database path
+_thread_local = threading.local()
+_persistent_connections = []
+_persistent_connections_lock = threading.Lock()
+
+# Bounded pools of read-only connections, keyed by database path
+READ_POOL_SIZE = 4
+_read_pools: Dict[str, Tuple[int, queue.Queue]] = {}
+_read_pools_lock = threading.Lock()
+
+# Memory-map up to this much of the database file so reads are served from
+# the OS page cache without read() syscalls
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+# Page size for newly created database files (ignored once tables exist)
+PAGE_SIZE_BYTES = 8192
+
+
 def get_db_path(db_name: str = "spendsense.db") -> str:
     """
     Get the database file path
@@ -43,15 +65,183 @@ def get_db_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
     if db_path is None:
         db_path = get_db_path()
     
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, cached_statements=256)  # default timeout doubles as a 5s busy timeout
     conn.row_factory = sqlite3.Row  # Enable column access by name
     
     # Enable foreign key constraints
     conn.execute("PRAGMA foreign_keys = ON")
     
+    # WAL + synchronous=NORMAL so commits don't block readers
+    apply_performance_pragmas(conn)
+    
+    return conn
+
+
+def apply_performance_pragmas(conn: sqlite3.Connection) -> None:
+    """
+    Tune a connection for concurrent reads alongside a single writer
+    
+    WAL lets readers proceed while a write is in progress, and
+    synchronous=NORMAL is durable under WAL while avoiding an fsync per
+    commit. The journal mode is persistent in the database file; the
+    other settings apply to this connection only.
+    
+    page_size is set first: it only takes effect on a fresh file, and
+    cannot change once the database is in WAL mode.
+    
+    Args:
+        conn: SQLite connection to configure
+    """
+    conn.execute(f"PRAGMA page_size = {PAGE_SIZE_BYTES}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -8000")  # ~8 MB page cache
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+
+
+def get_thread_connection(db_path: str) -> sqlite3.Connection:
+    """
+    Get a persistent connection owned by the calling thread
+    
+    The connection stays open between calls, so SQLite's per-connection
+    statement cache lets repeated queries skip re-preparing their SQL,
+    and it is opened in WAL mode (see apply_performance_pragmas).
+    Do not close the returned connection; it is closed at interpreter exit.
+    If the database file is replaced (e.g. by a data regeneration run),
+    a fresh connection is opened.
+    
+    Args:
+        db_path: Path to database file
+        
+    Returns:
+        SQLite connection object with sqlite3.Row row factory
+    """
+    connections = getattr(_thread_local, 'connections', None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+    
+    try:
+        inode = os.stat(db_path).st_ino
+    except OSError:
+        inode = None
+    
+    cached = connections.get(db_path)
+    if cached is not None:
+        conn, cached_inode = cached
+        if cached_inode == inode:
+            return conn
+        conn.close()
+    
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    apply_performance_pragmas(conn)
+    
+    connections[db_path] = (conn, inode)
+    with _persistent_connections_lock:
+        _persistent_connections.append(conn)
+    
     return conn
 
 
+@atexit.register
+def _close_persistent_connections() -> None:
+    """Close all connections handed out by get_thread_connection()"""
+    with _persistent_connections_lock:
+        for conn in _persistent_connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _persistent_connections.clear()
+
+
+def _open_read_connection(db_path: str) -> sqlite3.Connection:
+    """Open a read-only connection (mode=ro) to an existing database file"""
+    uri = Path(db_path).absolute().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA cache_size = -8000")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+    with _persistent_connections_lock:
+        _persistent_connections.append(conn)
+    return conn
+
+
+def _close_read_connection(conn: sqlite3.Connection) -> None:
+    """Close a pooled read connection and stop tracking it for exit cleanup"""
+    conn.close()
+    with _persistent_connections_lock:
+        try:
+            _persistent_connections.remove(conn)
+        except ValueError:
+            pass
+
+
+def _get_read_pool(db_path: str) -> queue.Queue:
+    """Return the current read pool for db_path, rebuilding it if the file was replaced"""
+    inode = os.stat(db_path).st_ino
+    
+    with _read_pools_lock:
+        cached = _read_pools.get(db_path)
+        if cached is not None and cached[0] == inode:
+            return cached[1]
+        
+        if cached is not None:
+            # Close the replaced pool's idle connections
+            while True:
+                try:
+                    _close_read_connection(cached[1].get_nowait())
+                except queue.Empty:
+                    break
+        
+        pool = queue.Queue(maxsize=READ_POOL_SIZE)
+        for _ in range(READ_POOL_SIZE):
+            pool.put(_open_read_connection(db_path))
+        _read_pools[db_path] = (inode, pool)
+        return pool
+
+
+@contextmanager
+def read_connection(db_path: str):
+    """
+    Borrow a read-only connection from a bounded per-database pool
+    
+    Under WAL, pooled readers run concurrently with each other and with the
+    writer on get_thread_connection(). Blocks while all READ_POOL_SIZE
+    connections are in use. The pool is rebuilt if the database file is
+    replaced; the old pool's connections are closed as they go idle.
+    
+    Usage:
+        with read_connection(db_path) as conn:
+            rows = conn.execute("SELECT ...").fetchall()
+    
+    Args:
+        db_path: Path to database file
+        
+    Yields:
+        Read-only SQLite connection with sqlite3.Row row factory
+    """
+    while True:
+        pool = _get_read_pool(db_path)
+        conn = pool.get()
+        if conn is not None:
+            break
+        # None marks a replaced pool; borrow from the current one instead
+    
+    try:
+        yield conn
+    finally:
+        with _read_pools_lock:
+            current = _read_pools.get(db_path)
+            if current is not None and current[1] is pool:
+                pool.put(conn)
+            else:
+                _close_read_connection(conn)
+                pool.put(None)  # wake a borrower still waiting on the old pool
+
+
 @contextmanager
 def db_session(db_path: Optional[str] = None):
     """
@@ -79,6 +269,30 @@ def db_session(db_path: Optional[str] = None):
         conn.close()
 
 
+@lru_cache(maxsize=1)
+def _load_table_creators():
+    """
+    Resolve the per-epic table creators once
+    
+    They are imported lazily (those modules import this one), trying the
+    package-relative path first and the top-level one as a fallback.
+    
+    Returns:
+        (create_persona_assignments_table, create_recommendation_tables,
+        create_decision_traces_table)
+    """
+    try:
+        from ..personas.storage import create_persona_assignments_table
+        from ..recommend.storage import create_recommendation_tables
+        from .migrations import create_decision_traces_table
+    except ImportError:
+        from personas.storage import create_persona_assignments_table
+        from recommend.storage import create_recommendation_tables
+        from storage.migrations import create_decision_traces_table
+    
+    return create_persona_assignments_table, create_recommendation_tables, create_decision_traces_table
+
+
 def initialize_database(db_path: Optional[str] = None, reset: bool = False) -> str:
     """
     Initialize the database with all tables
@@ -104,25 +318,19 @@ def initialize_database(db_path: Optional[str] = None, reset: bool = False) -> s
         # Create core tables (users, accounts, transactions, liabilities)
         create_tables(conn)
         
+        (
+            create_persona_assignments_table,
+            create_recommendation_tables,
+            create_decision_traces_table
+        ) = _load_table_creators()
+        
         # Create Epic 3 tables (persona assignments)
-        try:
-            from ..personas.storage import create_persona_assignments_table
-        except ImportError:
-            from personas.storage import create_persona_assignments_table
         create_persona_assignments_table(db_path)
         
         # Create Epic 4 tables (recommendations, content, offers)
-        try:
-            from ..recommend.storage import create_recommendation_tables
-        except ImportError:
-            from recommend.storage import create_recommendation_tables
         create_recommendation_tables(db_path)
         
         # Create Epic 5 tables (decision traces)
-        try:
-            from .migrations import create_decision_traces_table
-        except ImportError:
-            from storage.migrations import create_decision_traces_table
         create_decision_traces_table(conn)
         
         conn.commit()
@@ -8,6 +8,94 @@ This script adds ON DELETE CASCADE to recommendation_items and decision_traces.
 import sqlite3
 import sys
 from pathlib import Path
+from typing import List, Optional
+
+
+# Target schemas (with ON DELETE CASCADE); {name} is the table to create
+_RECOMMENDATION_ITEMS_DDL = """
+    CREATE TABLE {name} (
+        item_id TEXT PRIMARY KEY,
+        recommendation_id TEXT NOT NULL,
+        item_type TEXT NOT NULL,
+        item_order INTEGER,
+        
+        -- Educational content
+        content_id TEXT,
+        content_title TEXT,
+        content_snippet TEXT,
+        rationale TEXT,
+        
+        -- Actionable items
+        action_text TEXT,
+        action_rationale TEXT,
+        data_cited TEXT,
+        generated_by TEXT,
+        
+        -- Partner offers
+        offer_id TEXT,
+        offer_title TEXT,
+        offer_description TEXT,
+        eligibility_passed BOOLEAN,
+        eligibility_details TEXT,
+        why_relevant TEXT,
+        
+        FOREIGN KEY (recommendation_id) REFERENCES recommendations(recommendation_id)
+            ON DELETE CASCADE
+    )
+"""
+
+_DECISION_TRACES_DDL = """
+    CREATE TABLE {name} (
+        trace_id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        recommendation_id TEXT,
+        trace_type TEXT NOT NULL,
+        trace_content TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        content_hash TEXT,
+        FOREIGN KEY (user_id) REFERENCES users(user_id),
+        FOREIGN KEY (recommendation_id) REFERENCES recommendations(recommendation_id)
+            ON DELETE CASCADE
+    )
+"""
+
+
+def _rebuild_table(
+    cursor: sqlite3.Cursor,
+    table: str,
+    ddl: str,
+    columns: Optional[List[str]] = None
+) -> None:
+    """
+    Recreate a table from ddl, keeping its rows
+    
+    Empty tables are simply dropped and recreated; otherwise rows are
+    copied through a temporary <table>_new.
+    
+    Args:
+        cursor: Cursor inside the migration transaction
+        table: Table to rebuild
+        ddl: CREATE TABLE statement with a {name} placeholder
+        columns: Columns to copy (all columns if None)
+    """
+    cursor.execute(f"SELECT EXISTS(SELECT 1 FROM {table})")
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(ddl.format(name=table))
+        return
+    
+    cursor.execute(ddl.format(name=f"{table}_new"))
+    
+    # Copy data
+    if columns is None:
+        cursor.execute(f"INSERT INTO {table}_new SELECT * FROM {table}")
+    else:
+        column_list = ", ".join(columns)
+        cursor.execute(f"INSERT INTO {table}_new ({column_list}) SELECT {column_list} FROM {table}")
+    
+    # Drop old table and rename
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
 
 
 def fix_cascade_delete(db_path: str):
@@ -25,52 +113,18 @@ def fix_cascade_delete(db_path: str):
     # Enable foreign keys
     cursor.execute("PRAGMA foreign_keys = ON")
     
+    # Large page cache for the table copies (this connection only)
+    cursor.execute("PRAGMA cache_size = -200000")  # ~200 MB
+    
     try:
+        # One explicit transaction for both rebuilds: the implicit one would
+        # only start at the first INSERT, leaving the CREATE TABLEs outside it
+        cursor.execute("BEGIN IMMEDIATE")
+        
         # 1. Backup and recreate recommendation_items with CASCADE
         print("1. Fixing recommendation_items table...")
         
-        # Create temporary table with CASCADE
-        cursor.execute("""
-            CREATE TABLE recommendation_items_new (
-                item_id TEXT PRIMARY KEY,
-                recommendation_id TEXT NOT NULL,
-                item_type TEXT NOT NULL,
-                item_order INTEGER,
-                
-                -- Educational content
-                content_id TEXT,
-                content_title TEXT,
-                content_snippet TEXT,
-                rationale TEXT,
-                
-                -- Actionable items
-                action_text TEXT,
-                action_rationale TEXT,
-                data_cited TEXT,
-                generated_by TEXT,
-                
-                -- Partner offers
-                offer_id TEXT,
-                offer_title TEXT,
-                offer_description TEXT,
-                eligibility_passed BOOLEAN,
-                eligibility_details TEXT,
-                why_relevant TEXT,
-                
-                FOREIGN KEY (recommendation_id) REFERENCES recommendations(recommendation_id)
-                    ON DELETE CASCADE
-            )
-        """)
-        
-        # Copy data
-        cursor.execute("""
-            INSERT INTO recommendation_items_new 
-            SELECT * FROM recommendation_items
-        """)
-        
-        # Drop old table and rename
-        cursor.execute("DROP TABLE recommendation_items")
-        cursor.execute("ALTER TABLE recommendation_items_new RENAME TO recommendation_items")
+        _rebuild_table(cursor, 'recommendation_items', _RECOMMENDATION_ITEMS_DDL)
         
         # Recreate indexes
         cursor.execute("""
@@ -83,39 +137,39 @@ def fix_cascade_delete(db_path: str):
         # 2. Backup and recreate decision_traces with CASCADE
         print("2. Fixing decision_traces table...")
         
-        cursor.execute("""
-            CREATE TABLE decision_traces_new (
-                trace_id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                recommendation_id TEXT,
-                trace_type TEXT NOT NULL,
-                trace_content TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(user_id),
-                FOREIGN KEY (recommendation_id) REFERENCES recommendations(recommendation_id)
-                    ON DELETE CASCADE
+        # content_hash only exists once traces are deduplicated
+        cursor.execute("PRAGMA table_info(decision_traces)")
+        existing = {row[1] for row in cursor.fetchall()}
+        columns = [
+            col for col in (
+                'trace_id', 'user_id', 'recommendation_id', 'trace_type',
+                'trace_content', 'created_at', 'content_hash'
             )
-        """)
+            if col in existing
+        ]
+        _rebuild_table(cursor, 'decision_traces', _DECISION_TRACES_DDL, columns)
         
-        # Copy data
+        # Recreate indexes
         cursor.execute("""
-            INSERT INTO decision_traces_new
-            SELECT * FROM decision_traces
+            CREATE INDEX idx_traces_user_recent 
+            ON decision_traces(user_id, created_at DESC, trace_id DESC)
         """)
-        
-        # Drop old and rename
-        cursor.execute("DROP TABLE decision_traces")
-        cursor.execute("ALTER TABLE decision_traces_new RENAME TO decision_traces")
-        
-        # Recreate indexes
         cursor.execute("""
-            CREATE INDEX idx_traces_user 
-            ON decision_traces(user_id)
+            CREATE INDEX idx_traces_user_rec_recent 
+            ON decision_traces(user_id, recommendation_id, created_at DESC, trace_id DESC)
+        """)
+        cursor.execute("""
+            CREATE INDEX idx_traces_user_window_recent 
+            ON decision_traces(user_id, trace_type, json_extract(trace_content, '$.window_days'), created_at DESC, trace_id DESC)
         """)
         cursor.execute("""
             CREATE INDEX idx_traces_recommendation 
             ON decision_traces(recommendation_id)
         """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX idx_traces_content_hash 
+            ON decision_traces(user_id, trace_type, content_hash)
+        """)
         
         print("   ✓ Fixed decision_traces")
         
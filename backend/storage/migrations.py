@@ -54,6 +54,13 @@ def migrate_add_recommendation_status(conn: sqlite3.Connection) -> None:
         else:
             print("- 'reviewer_notes' column already exists")
         
+        # Serves the operator review queue (status = ? ORDER BY generated_at
+        # DESC) without a scan or sort, and status counts from the index alone
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_recommendations_status_time
+            ON recommendations(status, generated_at DESC)
+        """)
+        
         conn.commit()
         print("\n✓ Migration complete: Recommendation status fields added")
         
@@ -80,17 +87,46 @@ def create_decision_traces_table(conn: sqlite3.Connection) -> None:
             trace_type TEXT NOT NULL,
             trace_content TEXT NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            content_hash TEXT,
             FOREIGN KEY (user_id) REFERENCES users(user_id),
             FOREIGN KEY (recommendation_id) REFERENCES recommendations(recommendation_id)
         )
     """)
     
-    # Create indexes for efficient queries
+    # Tables created before trace deduplication lack content_hash
+    cursor.execute("PRAGMA table_info(decision_traces)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if 'content_hash' not in columns:
+        cursor.execute("ALTER TABLE decision_traces ADD COLUMN content_hash TEXT")
+    
+    # Identical traces are stored once (rows without a hash never conflict)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_traces_content_hash 
+        ON decision_traces(user_id, trace_type, content_hash)
+    """)
+    
+    # Create indexes for efficient queries; the (created_at DESC, trace_id DESC)
+    # suffix lets get_traces return rows in order without a temp B-tree sort
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_traces_user_recent 
+        ON decision_traces(user_id, created_at DESC, trace_id DESC)
+    """)
+    
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_traces_user 
-        ON decision_traces(user_id)
+        CREATE INDEX IF NOT EXISTS idx_traces_user_rec_recent 
+        ON decision_traces(user_id, recommendation_id, created_at DESC, trace_id DESC)
     """)
     
+    # Serves get_latest_persona_traces: newest persona trace per window
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_traces_user_window_recent 
+        ON decision_traces(user_id, trace_type, json_extract(trace_content, '$.window_days'), created_at DESC, trace_id DESC)
+    """)
+    
+    # Superseded by the *_recent indexes above (same leading columns)
+    for name in ('idx_traces_user', 'idx_traces_user_created', 'idx_traces_user_rec', 'idx_traces_user_window'):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_traces_recommendation 
         ON decision_traces(recommendation_id)
@@ -100,6 +136,40 @@ def create_decision_traces_table(conn: sqlite3.Connection) -> None:
     print("✓ Created decision_traces table with indexes")
 
 
+def ensure_persona_assignments_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Ensure persona_assignments has its latest-per-window index
+    
+    Databases created before the index was added to
+    create_persona_assignments_table only get it from this migration. The
+    latest-assignment queries in traces.py and guardrails/metrics.py seek
+    on it instead of filtering and sorting.
+    
+    Args:
+        conn: SQLite database connection
+    """
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'persona_assignments'
+    """)
+    if cursor.fetchone() is None:
+        print("- persona_assignments table not found, skipping index migration")
+        return
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_persona_user_window_time 
+        ON persona_assignments(user_id, window_days, computed_at DESC)
+    """)
+    
+    # Superseded by idx_persona_user_window_time (same leading columns)
+    cursor.execute("DROP INDEX IF EXISTS idx_persona_user_window")
+    
+    conn.commit()
+    print("✓ Ensured persona_assignments indexes")
+
+
 def run_all_migrations(db_path: Optional[str] = None) -> None:
     """
     Run all pending migrations
@@ -121,6 +191,7 @@ def run_all_migrations(db_path: Optional[str] = None) -> None:
         # Epic 5 migrations
         migrate_add_recommendation_status(conn)
         create_decision_traces_table(conn)
+        ensure_persona_assignments_indexes(conn)
         
         print("\n✓ All migrations completed successfully")
         
@@ -19,12 +19,99 @@ Epic 5 tables (created in backend/storage/migrations.py):
 """
 
 import sqlite3
-from typing import Optional
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Iterable, Optional, Sequence
+
+# Conservative bound on bound parameters per statement (SQLite's historical
+# SQLITE_MAX_VARIABLE_NUMBER default)
+SQLITE_MAX_VARIABLES = 999
+
+
+# Parameterized INSERTs for the core tables, shared by the data generators so
+# each statement is prepared once and reused from the connection's cache
+INSERT_USER_SQL = """
+    INSERT INTO users (user_id, name, created_at, consent_status, consent_updated_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+INSERT_ACCOUNT_SQL = """
+    INSERT INTO accounts (
+        account_id, user_id, account_type, account_subtype,
+        balance_available, balance_current, balance_limit,
+        iso_currency_code, holder_category
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+TRANSACTION_COLUMNS = (
+    "transaction_id", "account_id", "user_id", "date", "amount",
+    "merchant_name", "payment_channel", "category_primary", "category_detailed", "pending"
+)
+
+INSERT_TRANSACTION_SQL = """
+    INSERT INTO transactions (
+        transaction_id, account_id, user_id, date, amount,
+        merchant_name, payment_channel, category_primary, category_detailed, pending
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_LIABILITY_SQL = """
+    INSERT INTO liabilities (
+        liability_id, account_id, user_id, liability_type,
+        apr_percentage, apr_type, minimum_payment_amount, last_payment_amount,
+        is_overdue, next_payment_due_date, last_statement_balance
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+# Secondary indexes on the core tables, as (name, CREATE INDEX statement).
+# Kept apart from the table DDL so bulk loads can build them once afterwards.
+CORE_INDEXES = [
+    # Covers per-user date-range scans that only need the amount
+    ("idx_transactions_user_date_amount", """
+        CREATE INDEX IF NOT EXISTS idx_transactions_user_date_amount 
+        ON transactions(user_id, date, amount)
+    """),
+    ("idx_transactions_account", """
+        CREATE INDEX IF NOT EXISTS idx_transactions_account 
+        ON transactions(account_id)
+    """),
+    ("idx_accounts_user", """
+        CREATE INDEX IF NOT EXISTS idx_accounts_user 
+        ON accounts(user_id)
+    """),
+    ("idx_accounts_type", """
+        CREATE INDEX IF NOT EXISTS idx_accounts_type 
+        ON accounts(account_type)
+    """),
+    ("idx_liabilities_type", """
+        CREATE INDEX IF NOT EXISTS idx_liabilities_type 
+        ON liabilities(liability_type)
+    """),
+    ("idx_liabilities_account", """
+        CREATE INDEX IF NOT EXISTS idx_liabilities_account 
+        ON liabilities(account_id)
+    """),
+]
+
+# Indexes replaced by a wider one above; dropped from existing databases
+SUPERSEDED_INDEXES = ["idx_transactions_user_date"]
 
 
 def create_tables(conn: sqlite3.Connection) -> None:
     """
-    Create all database tables if they don't exist
+    Create all database tables and their indexes if they don't exist
+    
+    Args:
+        conn: SQLite database connection
+    """
+    create_base_tables(conn)
+    create_indexes(conn)
+
+
+def create_base_tables(conn: sqlite3.Connection) -> None:
+    """
+    Create the core tables if they don't exist, without secondary indexes
     
     Args:
         conn: SQLite database connection
@@ -76,17 +163,6 @@ def create_tables(conn: sqlite3.Connection) -> None:
         )
     """)
     
-    # Create index on transactions for efficient queries
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_transactions_user_date 
-        ON transactions(user_id, date)
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_transactions_account 
-        ON transactions(account_id)
-    """)
-    
     # Liabilities table - credit cards, loans, mortgages
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS liabilities (
@@ -110,6 +186,96 @@ def create_tables(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+def create_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Create the secondary indexes on the core tables if they don't exist
+    
+    Args:
+        conn: SQLite database connection
+    """
+    cursor = conn.cursor()
+    
+    for _, ddl in CORE_INDEXES:
+        cursor.execute(ddl)
+    
+    for name in SUPERSEDED_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    
+    conn.commit()
+
+
+def drop_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Drop the secondary indexes on the core tables (before a bulk load)
+    
+    Args:
+        conn: SQLite database connection
+    """
+    cursor = conn.cursor()
+    
+    for name, _ in CORE_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    
+    conn.commit()
+
+
+@lru_cache(maxsize=256)
+def _multi_row_insert_sql(table: str, cols: tuple, row_count: int) -> str:
+    """Build an INSERT with row_count VALUES groups for the given columns"""
+    group = "(" + ",".join(["?"] * len(cols)) + ")"
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES " + ",".join([group] * row_count)
+
+
+def bulk_insert(
+    conn: sqlite3.Connection,
+    table: str,
+    cols: Sequence[str],
+    rows: Iterable[Sequence],
+    chunk: int = 500
+) -> int:
+    """
+    Insert rows using multi-row VALUES statements
+    
+    Rows are sent in chunks of up to `chunk` rows per statement, capped so a
+    statement never binds more than SQLITE_MAX_VARIABLES parameters. Does not
+    commit; the caller owns the transaction.
+    
+    Args:
+        conn: SQLite database connection
+        table: Target table name
+        cols: Column names, in the same order as each row's values
+        rows: Row tuples to insert
+        chunk: Maximum rows per INSERT statement
+        
+    Returns:
+        Number of rows inserted
+    """
+    cols = tuple(cols)
+    chunk = max(1, min(chunk, SQLITE_MAX_VARIABLES // len(cols)))
+    
+    inserted = 0
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, chunk))
+        if not batch:
+            break
+        conn.execute(
+            _multi_row_insert_sql(table, cols, len(batch)),
+            list(chain.from_iterable(batch))
+        )
+        inserted += len(batch)
+    
+    return inserted
+
+
+CORE_TABLES = ['users', 'accounts', 'transactions', 'liabilities']
+
+_TABLE_COUNTS_SQL = " UNION ALL ".join(
+    f"SELECT '{table}', COUNT(*) FROM {table}"
+    for table in CORE_TABLES
+)
+
+
 def get_table_counts(conn: sqlite3.Connection) -> dict:
     """
     Get row counts for all tables
@@ -121,13 +287,60 @@ def get_table_counts(conn: sqlite3.Connection) -> dict:
         Dictionary with table names and row counts
     """
     cursor = conn.cursor()
-    counts = {}
+    cursor.execute(_TABLE_COUNTS_SQL)
+    
+    return dict(cursor.fetchall())
+
+
+def dump_sql(
+    conn: sqlite3.Connection,
+    tables: Sequence[str] = tuple(CORE_TABLES),
+    chunk: int = 500
+) -> str:
+    """
+    Dump table contents as a single SQL script of multi-row INSERTs
+    
+    The script is wrapped in BEGIN/COMMIT and contains data only, so it can be
+    replayed with load_sql_dump into a database whose tables already exist.
+    Values are rendered with SQLite's quote(), so they round-trip exactly.
+    
+    Args:
+        conn: SQLite database connection
+        tables: Tables to dump, in insertion (foreign key) order
+        chunk: Maximum rows per INSERT statement
+        
+    Returns:
+        SQL script text
+    """
+    cursor = conn.cursor()
+    statements = ["BEGIN;"]
     
-    for table in ['users', 'accounts', 'transactions', 'liabilities']:
-        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-        counts[table] = cursor.fetchone()[0]
+    for table in tables:
+        cursor.execute(f"PRAGMA table_info({table})")
+        cols = [row[1] for row in cursor.fetchall()]
+        quoted = " || ',' || ".join(f"quote({col})" for col in cols)
+        
+        cursor.execute(f"SELECT '(' || {quoted} || ')' FROM {table} ORDER BY rowid")
+        prefix = f"INSERT INTO {table} ({', '.join(cols)}) VALUES\n"
+        while True:
+            values = [row[0] for row in cursor.fetchmany(chunk)]
+            if not values:
+                break
+            statements.append(prefix + ",\n".join(values) + ";")
     
-    return counts
+    statements.append("COMMIT;")
+    return "\n".join(statements) + "\n"
+
+
+def load_sql_dump(conn: sqlite3.Connection, script: str) -> None:
+    """
+    Replay a script produced by dump_sql in one executescript call
+    
+    Args:
+        conn: SQLite database connection (tables must already exist)
+        script: SQL script text
+    """
+    conn.executescript(script)
 
 
 def drop_all_tables(conn: sqlite3.Connection) -> None:
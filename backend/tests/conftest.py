@@ -0,0 +1,151 @@
+"""
+Shared pytest fixtures for SpendSense tests
+"""
+
+import contextlib
+import io
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+
+# Make backend modules importable as top-level packages (features, storage,
+# personas, ...) once for every test module
+BACKEND_DIR = Path(__file__).parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def query_log():
+    """
+    Record the SQL statements executed on a connection
+    
+    Yields a function that installs a trace callback on the given connection
+    and returns the (live) list of executed statements. Tests use it to assert
+    that a code path issues a bounded number of queries rather than one per
+    row (N+1). Callbacks are removed again on teardown.
+    """
+    traced: List[sqlite3.Connection] = []
+    
+    def attach(conn: sqlite3.Connection) -> List[str]:
+        statements: List[str] = []
+        conn.set_trace_callback(statements.append)
+        traced.append(conn)
+        return statements
+    
+    yield attach
+    
+    for conn in traced:
+        try:
+            conn.set_trace_callback(None)
+        except sqlite3.ProgrammingError:
+            pass  # Connection already closed by the test
+
+
+_SQL_KEYWORDS = {"WHERE", "JOIN", "LEFT", "INNER", "ON", "GROUP", "ORDER", "LIMIT", "USING", "UNION"}
+
+
+def _scan_targets(sql: str, tables) -> set:
+    """Names a statement may use for the given tables in a query plan (table or alias)"""
+    names = set(tables)
+    for table in tables:
+        pattern = rf"\b(?:FROM|JOIN)\s+{table}\s+(?:AS\s+)?(\w+)"
+        for alias in re.findall(pattern, sql, flags=re.IGNORECASE):
+            if alias.upper() not in _SQL_KEYWORDS:
+                names.add(alias)
+    return names
+
+
+@pytest.fixture
+def full_scan_guard():
+    """
+    Fail the test if a watched connection full-scans large tables
+    
+    Opt-in: call the yielded function with a connection (and optionally the
+    tables to watch, default transactions). Every SELECT executed on it is
+    recorded, and on teardown each one is run through EXPLAIN QUERY PLAN; a
+    plain ``SCAN <table>`` step (one not served by an index) fails the test.
+    The connection must still be open at teardown.
+    """
+    watched = []
+    
+    def watch(conn: sqlite3.Connection, tables=("transactions",)) -> None:
+        statements: List[str] = []
+        conn.set_trace_callback(statements.append)
+        watched.append((conn, tuple(tables), statements))
+    
+    yield watch
+    
+    offenders = []
+    for conn, tables, statements in watched:
+        conn.set_trace_callback(None)
+        for sql in statements:
+            if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+                continue
+            names = _scan_targets(sql, tables)
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+                detail = row[3]
+                match = re.match(r"SCAN (?:TABLE )?(\w+)", detail)
+                if match and match.group(1) in names and "INDEX" not in detail:
+                    offenders.append(f"{detail}: {' '.join(sql.split())}")
+    
+    if offenders:
+        pytest.fail("Full table scans:\n" + "\n".join(offenders))
+
+
+_TEMPLATE_DBS: Dict[Tuple[int, int], Path] = {}
+
+
+def _template_db(directory: Path, user_count: int, seed: int) -> Path:
+    """
+    Build (once per session) a template database for the given dataset
+    
+    The template is an initialized database, populated by
+    generate_synthetic_data when user_count > 0, and switched out of WAL so
+    it is a single self-contained file that can be copied.
+    """
+    key = (user_count, seed)
+    if key not in _TEMPLATE_DBS:
+        from backend.storage.database import initialize_database, get_db_connection
+        
+        db_path = directory / f"seed{seed}_u{user_count}.db"
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database(str(db_path))
+            conn = get_db_connection(str(db_path))
+            try:
+                if user_count:
+                    from backend.core.data_gen.generator import generate_synthetic_data
+                    generate_synthetic_data(
+                        user_count=user_count,
+                        consent_ratio=0.9,
+                        date_range_months=7,
+                        conn=conn,
+                        seed=seed
+                    )
+                conn.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                conn.close()
+        _TEMPLATE_DBS[key] = db_path
+    
+    return _TEMPLATE_DBS[key]
+
+
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory):
+    """
+    Return the path of a memoized template database for (user_count, seed)
+    
+    Tests copy the template instead of initializing (or generating) a fresh
+    database each time.
+    """
+    directory = tmp_path_factory.mktemp("db_templates")
+    
+    def get(user_count: int = 0, seed: int = 42) -> Path:
+        return _template_db(directory, user_count, seed)
+    
+    return get
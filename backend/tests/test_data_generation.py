@@ -4,22 +4,31 @@ Tests for synthetic data generation (Epic 1)
 
 import pytest
 import sqlite3
-import tempfile
-import os
+import hashlib
+import shutil
 from datetime import date, timedelta
-
-import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from storage.database import initialize_database, get_db_connection
-from storage.schemas import create_tables, get_table_counts, drop_all_tables
+from storage.database import get_db_connection
+from storage.schemas import (
+    create_tables,
+    create_base_tables,
+    create_indexes,
+    get_table_counts,
+    drop_all_tables,
+    bulk_insert,
+    dump_sql,
+    load_sql_dump,
+    CORE_INDEXES
+)
 from core.data_gen.archetypes import (
     ARCHETYPES,
     get_archetype_distribution,
     get_archetype_by_name
 )
 from core.data_gen.generator import generate_users, generate_synthetic_data
+from core.data_gen.accounts import generate_user_accounts
+from core.data_gen.transactions import generate_user_transactions
 from core.data_gen.validation import (
     validate_consent_distribution,
     validate_data_quality,
@@ -28,20 +37,75 @@ from core.data_gen.validation import (
 
 
 @pytest.fixture
-def test_db():
-    """Create a temporary test database"""
-    # Create temporary file
-    fd, db_path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
+def test_db(template_db, tmp_path):
+    """Create a test database by copying the initialized template"""
+    db_path = tmp_path / "test.db"
+    shutil.copyfile(template_db(), db_path)
+    
+    return str(db_path)
+
+
+def _dataset_cache_key(user_count: int, seed: int) -> str:
+    """Key a cached dataset on generator source, parameters and today's date"""
+    backend_dir = Path(__file__).parent.parent
+    sources = sorted((backend_dir / "core" / "data_gen").glob("*.py"))
+    sources.append(backend_dir / "storage" / "schemas.py")
+    
+    digest = hashlib.sha256(f"{user_count}:{seed}:{date.today()}".encode())
+    for source in sources:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@pytest.fixture(scope="session")
+def shared_dataset_conn(request):
+    """
+    The 75-user seed=42 dataset, in memory, built once per session
+    
+    The generated rows are cached as a SQL dump in pytest's cache directory,
+    so later runs replay the script instead of regenerating. The cache is
+    invalidated whenever the generator or schema source changes (or the day
+    rolls over, since generation is anchored on today's date).
+    """
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    create_base_tables(conn)
+    
+    cache = getattr(request.config, "cache", None)
+    dump_path = None
+    if cache is not None:
+        dump_path = cache.mkdir("spendsense") / f"seed42_u75_{_dataset_cache_key(75, 42)}.sql"
+    
+    if dump_path is not None and dump_path.exists():
+        load_sql_dump(conn, dump_path.read_text())
+        create_indexes(conn)
+    else:
+        generate_synthetic_data(
+            user_count=75,
+            consent_ratio=0.9,
+            date_range_months=7,
+            conn=conn,
+            seed=42
+        )
+        if dump_path is not None:
+            for stale in dump_path.parent.glob("seed42_u75_*.sql"):
+                stale.unlink()
+            dump_path.write_text(dump_sql(conn))
+    
+    yield conn
     
-    # Initialize database
-    initialize_database(db_path, reset=True)
+    conn.close()
+
+
+@pytest.fixture
+def dataset_conn(shared_dataset_conn):
+    """Shared generated dataset; anything a test writes is rolled back afterwards"""
+    shared_dataset_conn.execute("SAVEPOINT test_case")
     
-    yield db_path
+    yield shared_dataset_conn
     
-    # Cleanup
-    if os.path.exists(db_path):
-        os.unlink(db_path)
+    shared_dataset_conn.execute("ROLLBACK TO test_case")
+    shared_dataset_conn.execute("RELEASE test_case")
 
 
 def test_schema_creation(test_db):
@@ -65,6 +129,29 @@ def test_schema_creation(test_db):
     conn.close()
 
 
+def test_bulk_insert_chunks_rows():
+    """Test multi-row inserts split into chunks and keep column order"""
+    conn = sqlite3.connect(":memory:")
+    create_tables(conn)
+    
+    rows = [(f"user_{i}", f"User {i}", "2024-01-01", i % 2 == 0, None) for i in range(1234)]
+    inserted = bulk_insert(
+        conn,
+        "users",
+        ("user_id", "name", "created_at", "consent_status", "consent_updated_at"),
+        rows
+    )
+    
+    assert inserted == 1234
+    assert get_table_counts(conn)["users"] == 1234
+    
+    cursor = conn.cursor()
+    cursor.execute("SELECT name, consent_status FROM users WHERE user_id = 'user_1233'")
+    assert cursor.fetchone() == ("User 1233", 0)
+    
+    conn.close()
+
+
 def test_archetype_distribution():
     """Test archetype distribution calculation"""
     distribution = get_archetype_distribution(75)
@@ -143,27 +230,43 @@ def test_consent_distribution_validation(test_db):
     conn.close()
 
 
-def test_data_quality_validation(test_db):
+def test_data_quality_validation(dataset_conn):
     """Test data quality validation checks"""
-    conn = get_db_connection(test_db)
-    
-    # Generate complete dataset
-    report = generate_synthetic_data(
-        user_count=20,
-        consent_ratio=0.9,
-        date_range_months=7,
-        conn=conn,
-        seed=42
-    )
-    
-    # Run validation
-    validation = validate_data_quality(conn)
+    validation = validate_data_quality(dataset_conn)
     
     # All checks should pass
     assert validation["all_checks_passed"] == True
     assert validation["checks"]["users_have_accounts"]["passed"] == True
     assert validation["checks"]["accounts_have_users"]["passed"] == True
     assert validation["checks"]["transactions_have_dates"]["passed"] == True
+
+
+def test_transaction_generation_loads_accounts_once_per_user(test_db, query_log):
+    """Test that transaction generation doesn't issue one account query per account type"""
+    conn = get_db_connection(test_db)
+    
+    archetype_dist = {"savings_builder": 3, "high_utilizer": 3}
+    users = generate_users(6, 1.0, archetype_dist, conn)
+    for user_id, user_data in users.items():
+        user_data["account_ids"] = generate_user_accounts(user_id, user_data["archetype"], conn)
+    
+    statements = query_log(conn)
+    end_date = date.today()
+    for user_id, user_data in users.items():
+        generate_user_transactions(
+            user_id,
+            user_data["archetype"],
+            user_data["account_ids"],
+            end_date - timedelta(days=60),
+            end_date,
+            conn
+        )
+    
+    account_lookups = [
+        sql for sql in statements
+        if "FROM accounts" in sql and "WHERE user_id" in sql
+    ]
+    assert len(account_lookups) == len(users)
     
     conn.close()
 
@@ -203,48 +306,73 @@ def test_end_to_end_generation(test_db):
     assert counts["users"] == 25
     assert counts["transactions"] > 100  # Should have many transactions
     
+    # Indexes dropped for the bulk load are rebuilt afterwards
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    index_names = {row[0] for row in cursor.fetchall()}
+    assert {name for name, _ in CORE_INDEXES} <= index_names
+    
     conn.close()
 
 
-def test_archetype_specific_validation(test_db):
-    """Test archetype-specific validation checks"""
+def test_failed_generation_restores_indexes(test_db, monkeypatch):
+    """Indexes dropped for the bulk load are rebuilt even if generation fails"""
+    import core.data_gen.generator as generator_module
+    
+    def fail(*args, **kwargs):
+        raise RuntimeError("liability generation failed")
+    
+    monkeypatch.setattr(generator_module, "generate_user_liabilities", fail)
     conn = get_db_connection(test_db)
     
-    # Generate dataset with enough users for all archetypes
-    report = generate_synthetic_data(
-        user_count=75,
-        consent_ratio=0.9,
-        date_range_months=7,
-        conn=conn,
-        seed=42
-    )
+    with pytest.raises(RuntimeError):
+        generate_synthetic_data(user_count=5, consent_ratio=0.9, date_range_months=1, conn=conn, seed=42)
+    
+    index_names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {name for name, _ in CORE_INDEXES} <= index_names
     
-    # Run archetype validation
-    validation = validate_archetype_specific(conn)
+    conn.close()
+
+
+def test_archetype_specific_validation(dataset_conn):
+    """Test archetype-specific validation checks"""
+    validation = validate_archetype_specific(dataset_conn)
     
     # Check that key persona patterns exist
     assert validation["validations"]["high_utilization_users"]["count"] >= 5
+    assert validation["validations"]["subscription_heavy_users"]["count"] >= 5
     assert validation["validations"]["savings_account_users"]["count"] >= 10
     assert validation["validations"]["payroll_users"]["count"] >= 50
+
+
+def test_validation_queries_avoid_full_scans(dataset_conn, full_scan_guard):
+    """Test that validators read transactions and liabilities through indexes"""
+    full_scan_guard(dataset_conn, tables=("transactions", "liabilities"))
     
-    conn.close()
+    validate_data_quality(dataset_conn)
+    validate_archetype_specific(dataset_conn)
 
 
-def test_transaction_date_range(test_db):
-    """Test that transactions span the correct date range"""
-    conn = get_db_connection(test_db)
+def test_sql_dump_round_trip(dataset_conn):
+    """Test that a dumped dataset replays into identical tables"""
+    script = dump_sql(dataset_conn)
     
-    # Generate dataset
-    report = generate_synthetic_data(
-        user_count=15,
-        consent_ratio=0.9,
-        date_range_months=7,
-        conn=conn,
-        seed=42
-    )
+    restored = sqlite3.connect(":memory:")
+    create_base_tables(restored)
+    load_sql_dump(restored, script)
     
-    # Check transaction date range
-    cursor = conn.cursor()
+    assert get_table_counts(restored) == get_table_counts(dataset_conn)
+    for table in ("users", "accounts", "transactions", "liabilities"):
+        original = [tuple(row) for row in dataset_conn.execute(f"SELECT * FROM {table} ORDER BY rowid")]
+        replayed = restored.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+        assert replayed == original
+    
+    restored.close()
+
+
+def test_transaction_date_range(dataset_conn):
+    """Test that transactions span the correct date range"""
+    cursor = dataset_conn.cursor()
     cursor.execute("SELECT MIN(date), MAX(date) FROM transactions")
     min_date_str, max_date_str = cursor.fetchone()
     
@@ -256,25 +384,11 @@ def test_transaction_date_range(test_db):
     
     # Should be approximately 7 months (210 days)
     assert 180 <= date_range_days <= 240  # Allow some variance
-    
-    conn.close()
 
 
-def test_credit_accounts_have_liabilities(test_db):
+def test_credit_accounts_have_liabilities(dataset_conn):
     """Test that all credit accounts have corresponding liabilities"""
-    conn = get_db_connection(test_db)
-    
-    # Generate dataset
-    report = generate_synthetic_data(
-        user_count=20,
-        consent_ratio=0.9,
-        date_range_months=7,
-        conn=conn,
-        seed=42
-    )
-    
-    # Check credit accounts vs liabilities
-    cursor = conn.cursor()
+    cursor = dataset_conn.cursor()
     cursor.execute("""
         SELECT COUNT(*) FROM accounts WHERE account_type = 'credit'
     """)
@@ -287,8 +401,6 @@ def test_credit_accounts_have_liabilities(test_db):
     
     # All credit accounts should have liabilities
     assert credit_count == liability_count
-    
-    conn.close()
 
 
 if __name__ == "__main__":
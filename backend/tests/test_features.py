@@ -7,11 +7,8 @@ import pytest
 from datetime import date, timedelta
 import pandas as pd
 from pathlib import Path
-import sys
 
-# Add backend to path
 backend_path = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_path))
 
 from features.subscriptions import detect_subscription_cadence, compute_subscription_features
 from features.savings import compute_savings_features
@@ -25,59 +22,39 @@ from features.compute import compute_all_features
 class TestSubscriptionDetection:
     """Test subscription detection with cadence analysis"""
     
-    def test_monthly_cadence_detection(self):
-        """Test detection of monthly recurring transactions"""
+    @pytest.mark.parametrize('offsets, is_sub, cadence', [
+        pytest.param([0, 30, 61, 91], True, 'monthly', id='monthly'),
+        pytest.param([0, 7, 14, 21], True, 'weekly', id='weekly'),
+        pytest.param([0, 5, 25, 90], False, 'none', id='irregular'),
+        # Fewer than 3 transactions are never detected (cadence not checked)
+        pytest.param([0, 30], False, None, id='insufficient'),
+    ])
+    def test_cadence_detection(self, offsets, is_sub, cadence):
+        """Test cadence detection for recurring and irregular transaction dates"""
         base_date = date(2025, 1, 1)
-        dates = [
-            base_date,
-            base_date + timedelta(days=30),
-            base_date + timedelta(days=61),
-            base_date + timedelta(days=91)
-        ]
-        
-        is_subscription, cadence = detect_subscription_cadence(dates, tolerance_days=2)
-        
-        assert is_subscription is True
-        assert cadence == 'monthly'
-    
-    def test_weekly_cadence_detection(self):
-        """Test detection of weekly recurring transactions"""
-        base_date = date(2025, 1, 1)
-        dates = [
-            base_date,
-            base_date + timedelta(days=7),
-            base_date + timedelta(days=14),
-            base_date + timedelta(days=21)
-        ]
+        dates = [base_date + timedelta(days=d) for d in offsets]
         
-        is_subscription, cadence = detect_subscription_cadence(dates, tolerance_days=2)
+        is_subscription, detected_cadence = detect_subscription_cadence(dates, tolerance_days=2)
         
-        assert is_subscription is True
-        assert cadence == 'weekly'
+        assert is_subscription is is_sub
+        if cadence is not None:
+            assert detected_cadence == cadence
     
-    def test_irregular_pattern_not_detected(self):
-        """Test that irregular patterns are not detected as subscriptions"""
-        base_date = date(2025, 1, 1)
-        dates = [
-            base_date,
-            base_date + timedelta(days=5),
-            base_date + timedelta(days=25),
-            base_date + timedelta(days=90)
+    def test_null_merchant_names_are_skipped(self):
+        """Test outflows without a merchant count toward spend but never recur"""
+        as_of = date(2025, 4, 1)
+        rows = [
+            {'user_id': 'u1', 'date': as_of - timedelta(days=d), 'amount': 15.0, 'merchant_name': 'Netflix'}
+            for d in (1, 31, 61)
+        ] + [
+            {'user_id': 'u1', 'date': as_of - timedelta(days=d), 'amount': 15.0, 'merchant_name': None}
+            for d in (2, 32, 62)
         ]
         
-        is_subscription, cadence = detect_subscription_cadence(dates, tolerance_days=2)
-        
-        assert is_subscription is False
-        assert cadence == 'none'
-    
-    def test_insufficient_transactions(self):
-        """Test that < 3 transactions are not detected"""
-        base_date = date(2025, 1, 1)
-        dates = [base_date, base_date + timedelta(days=30)]
-        
-        is_subscription, cadence = detect_subscription_cadence(dates, tolerance_days=2)
+        result = compute_subscription_features(pd.DataFrame(rows), 'u1', as_of)
         
-        assert is_subscription is False
+        assert result['recurring_merchant_count'] == 1
+        assert result['subscription_share'] == pytest.approx(0.5)
 
 
 class TestSavingsMetrics:
@@ -143,22 +120,26 @@ class TestSavingsMetrics:
         assert result['growth_rate'] == 0.0
 
 
+@pytest.fixture(scope='module')
+def cc_account_5000():
+    """Read-only single credit card account with a $5,000 limit"""
+    return pd.DataFrame([
+        {
+            'user_id': 'user1',
+            'account_id': 'cc1',
+            'account_type': 'credit',
+            'account_subtype': 'credit_card',
+            'balance_current': 2500.0,
+            'balance_limit': 5000.0
+        }
+    ])
+
+
 class TestCreditUtilization:
     """Test credit utilization threshold detection"""
     
-    def test_high_utilization_detection(self):
+    def test_high_utilization_detection(self, cc_account_5000):
         """Test detection of ≥50% utilization"""
-        accounts_df = pd.DataFrame([
-            {
-                'user_id': 'user1',
-                'account_id': 'cc1',
-                'account_type': 'credit',
-                'account_subtype': 'credit_card',
-                'balance_current': 2500.0,
-                'balance_limit': 5000.0
-            }
-        ])
-        
         liabilities_df = pd.DataFrame([
             {
                 'user_id': 'user1',
@@ -169,12 +150,10 @@ class TestCreditUtilization:
             }
         ])
         
-        transactions_df = pd.DataFrame()
-        
         result = compute_credit_features(
-            accounts_df,
+            cc_account_5000,
             liabilities_df,
-            transactions_df,
+            pd.DataFrame(),
             'user1',
             date(2025, 11, 4),
             30
@@ -183,22 +162,11 @@ class TestCreditUtilization:
         assert result['max_utilization'] == 0.5
         assert result['has_high_utilization'] is True
     
-    def test_utilization_thresholds(self):
+    def test_utilization_thresholds(self, cc_account_5000):
         """Test 30%, 50%, 80% utilization flags"""
         # 80% utilization
-        accounts_df = pd.DataFrame([
-            {
-                'user_id': 'user1',
-                'account_id': 'cc1',
-                'account_type': 'credit',
-                'account_subtype': 'credit_card',
-                'balance_current': 4000.0,
-                'balance_limit': 5000.0
-            }
-        ])
-        
         result = compute_credit_features(
-            accounts_df,
+            cc_account_5000.assign(balance_current=4000.0),
             pd.DataFrame(),
             pd.DataFrame(),
             'user1',
@@ -278,7 +246,28 @@ class TestCashFlowReconstruction:
         
         # Final balance should be 700
         assert daily_balances[-1] == 700.0
-    
+
+    def test_same_day_transactions_and_other_accounts(self):
+        """Test that same-day transactions are netted and other accounts ignored"""
+        transactions_df = pd.DataFrame([
+            {'account_id': 'chk1', 'date': date(2025, 10, 1), 'amount': 50.0},
+            {'account_id': 'chk1', 'date': date(2025, 10, 2), 'amount': 100.0},
+            {'account_id': 'chk1', 'date': date(2025, 10, 2), 'amount': -40.0},
+            {'account_id': 'sav1', 'date': date(2025, 10, 3), 'amount': 999.0},
+            {'account_id': 'chk1', 'date': date(2025, 10, 4), 'amount': -10.0}
+        ])
+
+        daily_balances = reconstruct_daily_balances(
+            transactions_df,
+            'chk1',
+            date(2025, 10, 1),
+            date(2025, 10, 5),
+            550.0
+        )
+
+        # Oct 1 is outside the window; Oct 3 and Oct 5 carry the prior balance
+        assert daily_balances == [560.0, 560.0, 550.0, 550.0]
+
     def test_low_balance_frequency(self):
         """Test detection of frequent low balances"""
         # Create checking account with low balance
@@ -348,37 +337,82 @@ class TestParquetStorage:
         # Cleanup
         output_path.unlink()
 
+    def test_parquet_filtered_read(self, tmp_path):
+        """Test sorted writes and column selection and filters applied while reading"""
+        test_df = pd.DataFrame([
+            {'user_id': 'user2', 'window_days': 30, 'test_value': 3.0},
+            {'user_id': 'user1', 'window_days': 30, 'test_value': 1.0},
+            {'user_id': 'user1', 'window_days': 180, 'test_value': 2.0}
+        ])
+        save_features_to_parquet(test_df, 'test_features', str(tmp_path))
+
+        # Rows are written sorted by user, keeping each user's window order
+        all_rows = load_features_from_parquet('test_features', str(tmp_path))
+        assert all_rows['test_value'].tolist() == [1.0, 2.0, 3.0]
+
+        loaded_df = load_features_from_parquet(
+            'test_features',
+            str(tmp_path),
+            columns=['user_id', 'test_value'],
+            filters=[('user_id', '==', 'user1'), ('window_days', '==', 180)]
+        )
+
+        assert list(loaded_df.columns) == ['user_id', 'test_value']
+        assert loaded_df['test_value'].tolist() == [2.0]
+
+
+FEATURE_TYPES = ['subscriptions', 'savings', 'credit', 'income', 'cash_flow']
+
+
+@pytest.fixture(scope="session")
+def features_summary():
+    """Summary of compute_all_features over the Epic 1 database, computed once per session"""
+    return compute_all_features(
+        db_path="data/spendsense.db",
+        output_dir="data/features",
+        as_of_date=date(2025, 11, 4),
+        windows=[30, 180]
+    )
+
 
 class TestEndToEndComputation:
     """Test end-to-end feature computation"""
     
-    def test_full_feature_computation(self):
+    def test_full_feature_computation(self, features_summary):
         """Test computing all features for all users"""
         # This uses the actual database from Epic 1
-        summary = compute_all_features(
-            db_path="data/spendsense.db",
-            output_dir="data/features",
-            as_of_date=date(2025, 11, 4),
-            windows=[30, 180]
-        )
+        summary = features_summary
         
         # Verify summary
         assert summary['user_count'] == 75
         assert summary['windows'] == [30, 180]
         
         # Verify features were created (75 users × 2 windows = 150 rows each)
-        assert summary['features_computed']['subscriptions'] == 150
-        assert summary['features_computed']['savings'] == 150
-        assert summary['features_computed']['credit'] == 150
-        assert summary['features_computed']['income'] == 150
-        assert summary['features_computed']['cash_flow'] == 150
-        
-        # Verify Parquet files exist
-        assert Path('data/features/subscriptions.parquet').exists()
-        assert Path('data/features/savings.parquet').exists()
-        assert Path('data/features/credit.parquet').exists()
-        assert Path('data/features/income.parquet').exists()
-        assert Path('data/features/cash_flow.parquet').exists()
+        for feature_type in FEATURE_TYPES:
+            assert summary['features_computed'][feature_type] == 150
+        
+        # Verify the Parquet files hold the computed rows
+        for feature_type in FEATURE_TYPES:
+            assert len(load_features_from_parquet(feature_type, 'data/features')) == 150
+
+    def test_parallel_matches_serial(self, template_db, tmp_path):
+        """Test worker processes produce the same features as the serial loop"""
+        db_path = str(template_db(user_count=16, seed=7))
+        
+        for max_workers in (1, 2):
+            compute_all_features(
+                db_path=db_path,
+                output_dir=str(tmp_path / f"workers_{max_workers}"),
+                as_of_date=date.today(),  # generated data ends today
+                windows=[30, 180],
+                max_workers=max_workers
+            )
+        
+        for feature_type in FEATURE_TYPES:
+            pd.testing.assert_frame_equal(
+                load_features_from_parquet(feature_type, str(tmp_path / "workers_1")),
+                load_features_from_parquet(feature_type, str(tmp_path / "workers_2"))
+            )
 
 
 if __name__ == '__main__':
@@ -8,34 +8,64 @@ import pytest
 import sqlite3
 import tempfile
 import os
+import shutil
 from pathlib import Path
 
-from backend.storage.database import get_db_connection, initialize_database
+from backend.storage.database import (
+    get_db_connection, initialize_database, get_thread_connection, read_connection, _read_pools
+)
 from backend.storage.schemas import create_tables
 from backend.guardrails.consent import (
-    check_consent, get_consented_users, get_consent_status, 
+    check_consent, check_consent_cached, get_consented_users, get_consent_status, 
     update_consent, ConsentError
 )
 from backend.guardrails.metrics import (
     compute_operator_metrics, get_user_metrics, get_user_list_with_status
 )
 from backend.recommend.approval import (
-    approve_recommendation, flag_recommendation,
+    approve_recommendation, approve_recommendations, flag_recommendation,
     get_recommendations_by_status, get_user_recommendations
 )
 from backend.recommend.traces import (
     generate_persona_trace, generate_content_selection_trace,
-    store_trace, get_traces
+    store_trace, store_traces, get_traces, get_latest_persona_traces, generate_and_store_traces, enqueue_traces, flush_traces,
+    _SELECT_USER_TRACES_SQL, _SELECT_RECOMMENDATION_TRACES_SQL
+)
+from backend.recommend.storage import (
+    create_recommendation_tables, insert_recommendation, load_content_catalog
 )
-from backend.recommend.storage import create_recommendation_tables
 from backend.personas.storage import create_persona_assignments_table
 
 
-@pytest.fixture
-def test_db():
-    """Create a temporary test database"""
-    fd, db_path = tempfile.mkstemp(suffix='.db')
-    os.close(fd)
+# Keep per-test database copies on tmpfs when available so commits never
+# wait on disk I/O (the code under test opens databases by file path)
+TEST_DB_DIR = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+
+# Test users (2 consented, 1 not consented)
+SEED_USERS = [
+    ('user_001', 'Alice Test', 1),
+    ('user_002', 'Bob Test', 1),
+    ('user_003', 'Charlie Test', 0),
+]
+
+SEED_PERSONA_ASSIGNMENTS = [
+    ('pa_001', 'user_001', 30, '2025-01-01', 1, 'High Utilization', 'ASSIGNED'),
+    ('pa_002', 'user_001', 180, '2025-01-01', 1, 'High Utilization', 'ASSIGNED'),
+    ('pa_003', 'user_002', 30, '2025-01-01', 4, 'Savings Builder', 'ASSIGNED'),
+]
+
+# Test recommendations with status field
+SEED_RECOMMENDATIONS = [
+    ('rec_001', 'user_001', 1, 'PENDING_REVIEW', '2025-01-01'),
+    ('rec_002', 'user_001', 1, 'APPROVED', '2025-01-02'),
+    ('rec_003', 'user_002', 4, 'PENDING_REVIEW', '2025-01-03'),
+]
+
+
+@pytest.fixture(scope="session")
+def seeded_template_db(tmp_path_factory):
+    """Build the schema, migrations and seed rows once per session"""
+    db_path = str(tmp_path_factory.mktemp("guardrails") / "template.db")
     
     # Initialize database with all tables
     conn = sqlite3.connect(db_path)
@@ -50,48 +80,74 @@ def test_db():
     
     conn.close()
     
-    # Add test data
+    # Add test data in a single transaction
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Insert test users (2 consented, 1 not consented)
-    cursor.execute("""
-        INSERT INTO users (user_id, name, consent_status)
-        VALUES 
-            ('user_001', 'Alice Test', 1),
-            ('user_002', 'Bob Test', 1),
-            ('user_003', 'Charlie Test', 0)
-    """)
-    
-    # Insert test persona assignments
-    cursor.execute("""
-        INSERT INTO persona_assignments (
-            assignment_id, user_id, window_days, as_of_date,
-            primary_persona_id, primary_persona_name, status
-        ) VALUES 
-            ('pa_001', 'user_001', 30, '2025-01-01', 1, 'High Utilization', 'ASSIGNED'),
-            ('pa_002', 'user_001', 180, '2025-01-01', 1, 'High Utilization', 'ASSIGNED'),
-            ('pa_003', 'user_002', 30, '2025-01-01', 4, 'Savings Builder', 'ASSIGNED')
-    """)
-    
-    # Insert test recommendations with status field
-    cursor.execute("""
-        INSERT INTO recommendations (
-            recommendation_id, user_id, window_30d_persona_id, 
-            status, generated_at
-        ) VALUES 
-            ('rec_001', 'user_001', 1, 'PENDING_REVIEW', '2025-01-01'),
-            ('rec_002', 'user_001', 1, 'APPROVED', '2025-01-02'),
-            ('rec_003', 'user_002', 4, 'PENDING_REVIEW', '2025-01-03')
-    """)
-    
-    conn.commit()
+    with conn:
+        conn.executemany(
+            "INSERT INTO users (user_id, name, consent_status) VALUES (?, ?, ?)",
+            SEED_USERS
+        )
+        conn.executemany("""
+            INSERT INTO persona_assignments (
+                assignment_id, user_id, window_days, as_of_date,
+                primary_persona_id, primary_persona_name, status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, SEED_PERSONA_ASSIGNMENTS)
+        conn.executemany("""
+            INSERT INTO recommendations (
+                recommendation_id, user_id, window_30d_persona_id,
+                status, generated_at
+            ) VALUES (?, ?, ?, ?, ?)
+        """, SEED_RECOMMENDATIONS)
     conn.close()
     
+    return db_path
+
+
+@pytest.fixture
+def test_db(seeded_template_db):
+    """Create a temporary test database by copying the seeded template"""
+    fd, db_path = tempfile.mkstemp(suffix='.db', dir=TEST_DB_DIR)
+    os.close(fd)
+    shutil.copyfile(seeded_template_db, db_path)
+    
     yield db_path
     
-    # Cleanup
-    os.unlink(db_path)
+    # Cleanup (including WAL sidecars left by connections still open)
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+# ==================== Connection Pool Tests ====================
+
+def test_thread_connection_for_in_memory_database():
+    """Names that are not files (e.g. ':memory:') should still get a reusable connection"""
+    conn = get_thread_connection(':memory:')
+    
+    assert conn.execute("SELECT 1").fetchone()[0] == 1
+    assert get_thread_connection(':memory:') is conn
+
+
+def test_read_pool_closes_connections_of_replaced_file(test_db):
+    """Replacing the database file should close the old pool's connections"""
+    replacement = test_db + '.new'
+    
+    with read_connection(test_db) as held:
+        old_idle = list(_read_pools[test_db][1].queue)
+        shutil.copyfile(test_db, replacement)
+        os.replace(replacement, test_db)
+        
+        with read_connection(test_db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == len(SEED_USERS)
+        
+        for idle in old_idle:
+            with pytest.raises(sqlite3.ProgrammingError):
+                idle.execute("SELECT 1")
+    
+    # Returned to a replaced pool: closed rather than reused
+    with pytest.raises(sqlite3.ProgrammingError):
+        held.execute("SELECT 1")
 
 
 # ==================== Consent Tests ====================
@@ -109,6 +165,16 @@ def test_check_consent_failure(test_db):
     assert 'has not consented' in str(exc_info.value)
 
 
+def test_check_consent_cached_invalidated_on_update(test_db):
+    """Test that cached consent is dropped when consent is revoked"""
+    assert check_consent_cached('user_001', test_db) is True
+    
+    update_consent('user_001', False, test_db)
+    
+    with pytest.raises(ConsentError):
+        check_consent_cached('user_001', test_db)
+
+
 def test_get_consented_users(test_db):
     """Test that only consented users are returned"""
     users = get_consented_users(test_db)
@@ -199,6 +265,25 @@ def test_approve_recommendation(test_db):
     assert result['reviewed_at'] is not None
 
 
+def test_approve_recommendations_batch(test_db):
+    """Test approving several recommendations in one call"""
+    results = approve_recommendations(['rec_003', 'rec_001'], test_db, reviewer_notes='Batch')
+    
+    assert [r['recommendation_id'] for r in results] == ['rec_003', 'rec_001']
+    assert all(r['status'] == 'APPROVED' and r['reviewer_notes'] == 'Batch' for r in results)
+    assert get_recommendations_by_status('PENDING_REVIEW', test_db) == []
+
+
+def test_approve_recommendations_missing_id_updates_nothing(test_db):
+    """Test that a batch with an unknown id fails without approving the rest"""
+    with pytest.raises(ValueError) as exc_info:
+        approve_recommendations(['rec_001', 'rec_999'], test_db)
+    assert 'rec_999' in str(exc_info.value)
+    
+    pending = get_recommendations_by_status('PENDING_REVIEW', test_db)
+    assert {r['recommendation_id'] for r in pending} == {'rec_001', 'rec_003'}
+
+
 def test_flag_recommendation(test_db):
     """Test flagging a recommendation"""
     result = flag_recommendation('rec_003', test_db, reviewer_notes='Problematic content')
@@ -224,6 +309,55 @@ def test_get_recommendations_by_status(test_db):
     assert len(approved) == 1
 
 
+def test_status_queue_query_uses_index(test_db):
+    """Test the by-status review queue is an index search with no sort step"""
+    conn = sqlite3.connect(test_db)
+    plan = [row[3] for row in conn.execute("""
+        EXPLAIN QUERY PLAN
+        SELECT * FROM recommendations
+        WHERE status = ? AND status != 'DELETED'
+        ORDER BY generated_at DESC
+    """, ('PENDING_REVIEW',))]
+    conn.close()
+    
+    assert any('idx_recommendations_status_time' in step for step in plan)
+    assert not any('TEMP B-TREE' in step for step in plan)
+
+
+def test_load_content_catalog_returns_shared_read_only_items(test_db):
+    """Cached catalog items are shared between calls and cannot be mutated"""
+    conn = sqlite3.connect(test_db)
+    with conn:
+        conn.execute("""
+            INSERT INTO content_catalog (content_id, title, persona_tags, secondary_tags, topics)
+            VALUES ('content_001', 'Budgeting 101', '[1]', '[]', '["budgeting"]')
+        """)
+    conn.close()
+    
+    catalog = load_content_catalog(test_db)
+    with pytest.raises(TypeError):
+        catalog[0]['title'] = 'Changed'
+    assert catalog[0]['persona_tags'] == (1,)
+    
+    # Writes to other tables (e.g. recommendations) must not evict the cache
+    insert_recommendation(
+        test_db, 'rec_cache_001', 'user_001', 1, None, [1], {},
+        [], [], [], 'test-model', 0.1
+    )
+    assert load_content_catalog(test_db) is catalog
+
+
+def test_insert_recommendation_rejects_unknown_user(test_db):
+    """A failed insert is reported to the caller rather than skipped"""
+    with pytest.raises(sqlite3.IntegrityError):
+        insert_recommendation(
+            test_db, 'rec_orphan', 'no_such_user', 1, None, [1], {},
+            [], [], [], 'test-model', 0.1
+        )
+    
+    assert get_user_recommendations('no_such_user', test_db) == []
+
+
 def test_get_user_recommendations(test_db):
     """Test getting all recommendations for a user"""
     recs = get_user_recommendations('user_001', test_db)
@@ -305,6 +439,168 @@ def test_store_and_retrieve_traces(test_db):
     assert len(traces) >= 1
 
 
+def test_generate_and_store_traces(test_db):
+    """Test persona and content traces are generated and stored together"""
+    recommendation = {'recommendation_id': 'rec_001', 'target_personas': [1]}
+    
+    trace_ids = generate_and_store_traces('user_001', recommendation, [], [], test_db)
+    
+    stored = {t['trace_id']: t for t in get_traces('user_001', test_db)}
+    assert set(trace_ids) <= set(stored)
+    assert stored[trace_ids[-1]]['trace_type'] == 'content_selection'
+    assert any(stored[tid]['trace_type'] == 'persona_assignment' for tid in trace_ids[:-1])
+
+
+def test_get_traces_filters_by_type(test_db):
+    """Test trace_type filtering is applied"""
+    store_trace({'user_id': 'user_002', 'trace_type': 'persona_assignment', 'window_days': 30}, test_db)
+    store_trace({'user_id': 'user_002', 'trace_type': 'content_selection'}, test_db)
+    
+    traces = get_traces('user_002', test_db, trace_type='content_selection')
+    assert [t['trace_type'] for t in traces] == ['content_selection']
+
+
+def test_store_trace_skips_duplicate_content(test_db):
+    """Test an identical trace is stored once and keeps its original ID"""
+    trace = {'user_id': 'user_001', 'trace_type': 'persona_assignment', 'window_days': 30}
+    
+    first_id = store_trace(trace, test_db)
+    second_id = store_trace(dict(trace), test_db)
+    changed_id = store_trace({**trace, 'window_days': 180}, test_db)
+    
+    assert second_id == first_id
+    assert changed_id != first_id
+    assert len(get_traces('user_001', test_db)) == 2
+
+
+def test_store_traces_joins_caller_transaction(test_db):
+    """Test traces stored on a caller connection follow its transaction"""
+    trace = {'user_id': 'user_003', 'recommendation_id': None, 'trace_type': 'persona_assignment'}
+    
+    conn = sqlite3.connect(test_db)
+    store_trace(trace, test_db, conn=conn)
+    conn.rollback()
+    assert get_traces('user_003', test_db) == []
+    
+    store_trace(trace, test_db, conn=conn)
+    conn.commit()
+    conn.close()
+    assert len(get_traces('user_003', test_db)) == 1
+
+
+def test_get_latest_persona_traces(test_db):
+    """Test latest persona trace is returned per window"""
+    def persona_trace(window_days, persona_id):
+        return {
+            'user_id': 'user_001',
+            'trace_type': 'persona_assignment',
+            'window_days': window_days,
+            'primary_persona_id': persona_id
+        }
+    
+    store_trace(persona_trace(30, 1), test_db)
+    store_trace({'user_id': 'user_001', 'trace_type': 'content_selection'}, test_db)
+    store_trace(persona_trace(30, 2), test_db)
+    store_trace(persona_trace(180, 3), test_db)
+    
+    latest = get_latest_persona_traces('user_001', test_db)
+    assert latest['window_30d']['primary_persona_id'] == 2
+    assert latest['window_180d']['primary_persona_id'] == 3
+
+
+def test_latest_persona_trace_after_returning_to_earlier_persona(test_db):
+    """Test a persona A -> B -> A sequence reports A as latest"""
+    def persona_trace(persona_id):
+        return {
+            'user_id': 'user_001',
+            'trace_type': 'persona_assignment',
+            'window_days': 30,
+            'primary_persona_id': persona_id
+        }
+    
+    first_id = store_trace(persona_trace(1), test_db)
+    store_trace(persona_trace(2), test_db)
+    third_id = store_trace(persona_trace(1), test_db)
+    
+    assert third_id == first_id
+    latest = get_latest_persona_traces('user_001', test_db)
+    assert latest['window_30d']['primary_persona_id'] == 1
+
+
+def test_traces_in_one_batch_read_newest_first(test_db):
+    """Test traces sharing a batch created_at come back in reverse insertion order"""
+    traces = [
+        {'user_id': 'user_001', 'trace_type': 'persona_assignment', 'window_days': 30, 'primary_persona_id': persona_id}
+        for persona_id in (1, 2, 3)
+    ]
+    store_traces(traces, test_db)
+    
+    stored = get_traces('user_001', test_db)
+    assert [t['trace_content']['primary_persona_id'] for t in stored] == [3, 2, 1]
+    
+    latest = get_latest_persona_traces('user_001', test_db)
+    assert latest['window_30d']['primary_persona_id'] == 3
+
+
+def test_trace_queries_use_index_order(test_db):
+    """Test get_traces queries read index order instead of sorting"""
+    conn = sqlite3.connect(test_db)
+    plans = [
+        conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        for sql, params in (
+            (_SELECT_USER_TRACES_SQL, ('user_001',)),
+            (_SELECT_RECOMMENDATION_TRACES_SQL, ('user_001', 'rec_001'))
+        )
+    ]
+    conn.close()
+    
+    for plan in plans:
+        details = ' '.join(row[-1] for row in plan)
+        assert 'USING INDEX idx_traces_user' in details
+        assert 'TEMP B-TREE' not in details
+
+
+def test_enqueue_traces_written_by_background_writer(test_db):
+    """Test queued traces are written once flushed"""
+    traces = [
+        {'user_id': 'user_002', 'recommendation_id': 'rec_002', 'trace_type': 'persona_assignment'},
+        {'user_id': 'user_002', 'recommendation_id': 'rec_002', 'trace_type': 'content_selection'}
+    ]
+    
+    trace_ids = enqueue_traces(traces, test_db)
+    assert len(trace_ids) == 2
+    
+    stored = get_traces('user_002', test_db, recommendation_id='rec_002', flush=True)
+    assert {t['trace_id'] for t in stored} == set(trace_ids)
+
+
+def test_trace_reads_do_not_wait_for_background_writes(test_db, monkeypatch):
+    """Test readers only flush the shared write queue when asked to"""
+    import backend.recommend.traces as traces_module
+    
+    def fail():
+        raise AssertionError("read waited on queued trace writes")
+    
+    monkeypatch.setattr(traces_module, 'flush_traces', fail)
+    
+    assert get_traces('user_002', test_db) == []
+    assert get_latest_persona_traces('user_002', test_db) == {'window_30d': None, 'window_180d': None}
+
+
+def test_background_writer_drops_only_rejected_rows(test_db):
+    """Test a row failing a foreign key does not discard other queued traces"""
+    good_ids = enqueue_traces([
+        {'user_id': 'no_such_user', 'trace_type': 'content_selection'},
+        {'user_id': 'user_002', 'trace_type': 'persona_assignment', 'window_days': 30}
+    ], test_db)[1:]
+    good_ids += enqueue_traces([{'user_id': 'user_002', 'trace_type': 'content_selection'}], test_db)
+    
+    flush_traces()
+    
+    assert {t['trace_id'] for t in get_traces('user_002', test_db)} == set(good_ids)
+    assert get_traces('no_such_user', test_db) == []
+
+
 # ==================== Integration Tests ====================
 
 def test_end_to_end_approval_workflow(test_db):
@@ -342,6 +638,19 @@ def test_metrics_cache(test_db):
     assert metrics3 is not None
 
 
+def test_metrics_cache_invalidated_by_write(test_db):
+    """Test that cached metrics are reused until the database changes"""
+    metrics1 = compute_operator_metrics(test_db)
+    assert compute_operator_metrics(test_db) is metrics1
+    
+    approve_recommendation('rec_001', test_db)
+    
+    metrics2 = compute_operator_metrics(test_db)
+    assert metrics2 is not metrics1
+    assert metrics2['pending_count'] == metrics1['pending_count'] - 1
+    assert metrics2['approved_count'] == metrics1['approved_count'] + 1
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
 
@@ -5,11 +5,6 @@ Tests persona evaluation logic, prioritization, and assignment workflow.
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from personas.evaluators import (
     evaluate_persona_1,
@@ -22,6 +17,11 @@ from personas.evaluators import (
 from personas.prioritize import sort_matched_personas, select_primary_and_secondary
 from personas.assign import assign_personas_for_user
 from personas.metadata import PERSONA_METADATA
+from personas.storage import create_persona_assignments_table
+from recommend.persona_handler import (
+    load_persona_assignments, load_persona_assignments_bulk,
+    get_persona_context, get_persona_context_bulk, invalidate_persona_cache
+)
 
 
 class TestPersona1Evaluator:
@@ -517,6 +517,94 @@ class TestAssignmentWorkflow:
         assert 'result' in trace
 
 
+class TestCrossWindowPersonaContext:
+    """Test loading persona context across 30d and 180d windows"""
+    
+    @pytest.fixture
+    def persona_db(self, tmp_path):
+        import sqlite3
+        db_path = str(tmp_path / 'personas.db')
+        create_persona_assignments_table(db_path)
+        
+        conn = sqlite3.connect(db_path)
+        conn.executemany('''
+            INSERT INTO persona_assignments (
+                assignment_id, user_id, window_days, as_of_date,
+                primary_persona_id, status, computed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            ('a1', 'user_a', 30, '2025-01-01', 3, 'ASSIGNED', '2025-01-01 00:00:00'),
+            ('a2', 'user_a', 30, '2025-02-01', 1, 'ASSIGNED', '2025-02-01 00:00:00'),
+            ('a3', 'user_a', 180, '2025-02-01', 4, 'ASSIGNED', '2025-02-01 00:00:00'),
+            ('b1', 'user_b', 30, '2025-02-01', None, 'STABLE', '2025-02-01 00:00:00'),
+        ])
+        conn.commit()
+        conn.close()
+        return db_path
+    
+    def test_loads_latest_assignment_per_window(self, persona_db):
+        """Most recent assignment should be returned for each window"""
+        assignments_30d, assignments_180d = load_persona_assignments('user_a', persona_db)
+        
+        assert assignments_30d['primary_persona_id'] == 1
+        assert assignments_180d['primary_persona_id'] == 4
+    
+    def test_cross_window_context(self, persona_db):
+        """Different personas across windows should target both, 30d first"""
+        context = get_persona_context('user_a', persona_db)
+        
+        assert context['strategy'] == 'cross_window'
+        assert list(context['target_personas']) == [1, 4]
+        assert context['persona_names'] == ['High Utilization', 'Savings Builder']
+    
+    def test_missing_window(self, persona_db):
+        """A user with a single STABLE window should be treated as stable"""
+        assignments_30d, assignments_180d = load_persona_assignments('user_b', persona_db)
+        assert assignments_180d is None
+        
+        context = get_persona_context('user_b', persona_db)
+        assert context['strategy'] == 'stable'
+    
+    def test_bulk_load_matches_single_user_load(self, persona_db):
+        """Bulk loading should return the same assignments as per-user loads"""
+        bulk = load_persona_assignments_bulk(['user_a', 'user_b', 'user_missing'], persona_db)
+        
+        for user_id in ['user_a', 'user_b']:
+            for bulk_row, row in zip(bulk[user_id], load_persona_assignments(user_id, persona_db)):
+                if row is None:
+                    assert bulk_row is None
+                else:
+                    assert bulk_row['status'] == row['status']
+                    assert bulk_row['primary_persona_id'] == row['primary_persona_id']
+        assert bulk['user_missing'] == (None, None)
+        
+        contexts = get_persona_context_bulk(['user_a', 'user_missing'], persona_db)
+        assert contexts['user_a']['strategy'] == 'cross_window'
+        assert contexts['user_missing']['strategy'] == 'missing'
+    
+    def test_context_cache_invalidation(self, persona_db):
+        """Cached context should be reused until invalidated"""
+        import sqlite3
+        first = get_persona_context('user_b', persona_db)
+        
+        conn = sqlite3.connect(persona_db)
+        conn.execute('''
+            INSERT INTO persona_assignments (
+                assignment_id, user_id, window_days, as_of_date,
+                primary_persona_id, status, computed_at
+            ) VALUES ('b2', 'user_b', 180, '2025-02-01', 5, 'ASSIGNED', '2025-02-01 00:00:00')
+        ''')
+        conn.commit()
+        conn.close()
+        
+        assert get_persona_context('user_b', persona_db) is first
+        
+        invalidate_persona_cache('user_b')
+        refreshed = get_persona_context('user_b', persona_db)
+        assert refreshed['strategy'] == 'single_persona'
+        assert list(refreshed['target_personas']) == [5]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
 
@@ -3,6 +3,7 @@ Feature computation CLI script
 Computes all behavioral signals and saves to Parquet files
 """
 
+import os
 import sys
 import json
 from pathlib import Path
@@ -36,6 +37,7 @@ def main():
     output_dir = feature_config.get('output_dir', 'data/features')
     windows = feature_config.get('windows', [30, 180])
     as_of_date_str = feature_config.get('as_of_date')
+    max_workers = feature_config.get('max_workers') or os.cpu_count() or 1
     
     # Parse as_of_date
     as_of_date = None
@@ -49,7 +51,8 @@ def main():
         db_path=db_path,
         output_dir=output_dir,
         as_of_date=as_of_date,
-        windows=windows
+        windows=windows,
+        max_workers=max_workers
     )
     
     # Save summary report